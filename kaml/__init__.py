@@ -0,0 +1,29 @@
+__version__ = '0.1.0'
+
+def get_parser(lexer_class = None, cache = None):
+	""" A new Parser. The lexer and LR tables are built once per process and
+	shared, so this is cheap after the first call. With a ParseCache, sources
+	that were parsed before are loaded from it instead.
+	"""
+	from kaml.lexer import Lexer
+	from kaml.parser import Parser
+	
+	return Parser(lexer_class = lexer_class or Lexer, cache = cache)
+
+def scan(source, lexer_class = None):
+	""" The outline of a template as Events, without parsing it, see kaml.outline.scan """
+	from kaml.outline import scan
+	
+	return scan(source, lexer_class)
+
+def astdiff(a, b):
+	""" Where the trees `a` and `b` differ, as Differences, see kaml.treediff.astdiff """
+	from kaml.treediff import astdiff
+	
+	return astdiff(a, b)
+
+def resolve(tree):
+	""" `tree`, with the names in it resolved to frame slots, see kaml.resolver.resolve """
+	from kaml.resolver import resolve
+	
+	return resolve(tree)
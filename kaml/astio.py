@@ -0,0 +1,337 @@
+from __future__ import unicode_literals
+from array import array
+from importlib import import_module
+from mmap import mmap
+import json, struct, sys
+
+from kaml.astnodes import ASTNode, Node
+
+__all__ = ['dump', 'dumps', 'load']
+
+# A dump is the header, then:
+#   the node classes, JSON: [module, name, slots] for each
+#   the offsets of the strings in the string bytes, uint32s, one more than there are strings
+#   the floats, float64s
+#   the records, int32s
+#   the string bytes, each string once, unicode ones in UTF-8
+# A node's record is the index of its class and a reference for each of the
+# slots that the class had when it was written. A list, tuple or dict's is
+# LIST, TUPLE or DICT, its length, and a reference for each item, a key and
+# a value for dicts. Children come before their parents, the root is last.
+MAGIC = b'KAST'
+VERSION = 1
+# Magic, version, root, then the size of each section in turn
+HEADER = struct.Struct(str('<4sIiIIIII'))
+
+LIST, TUPLE, DICT = -1, -2, -3
+
+# A reference is an int32, what it's to in its low bits, and the rest an
+# index, or the value of a small int
+TAG_BITS = 3
+TAG_MASK = (1 << TAG_BITS) - 1
+RECORD, STRING, INT, CONSTANT, FLOAT, LONG, TYPE, BYTES = range(8)
+INT_MIN, INT_MAX = -1 << (31 - TAG_BITS), (1 << (31 - TAG_BITS)) - 1
+
+# For a slot that isn't set
+_absent = object()
+CONSTANTS = (None, True, False, _absent)
+
+# Classes that can be values, like a node's ret_type, besides nodes
+_BUILTINS = dict((cls.__name__, cls) for cls in (int, long, float, str, unicode, bool, list, tuple, dict, type(None)))
+
+_SWAP = sys.byteorder != 'little'
+
+def _layout(cls):
+	""" The slots that a dump has for nodes of `cls`, in order """
+	if cls is Node:
+		return ('node_type', 'children', 'leaf')
+	return tuple(slot for slot, descriptor in cls._slot_descriptors)
+
+def dumps(tree):
+	""" `tree`, in the format that load reads, as bytes.
+	
+	Nodes, lists and dicts that are in the tree more than once, as in an
+	interned tree, are written once. Lazy bodies are parsed first. Values
+	other than nodes, lists, tuples, dicts, strings, numbers, bools, None
+	and the classes of nodes and of those values raise a TypeError.
+	"""
+	classes = []
+	class_ids = {}
+	strings = []
+	string_ids = {}
+	floats = array(str('d'))
+	cells = array(str('i'))
+	# The reference of each part written, by id, with the part, so that its
+	# id isn't reused while this runs
+	done = {}
+	
+	def class_id(cls):
+		index = class_ids.get(cls)
+		if index is None:
+			index = class_ids[cls] = len(classes)
+			classes.append(cls)
+		return index
+	
+	def string(value, tag):
+		key = (type(value), value)
+		index = string_ids.get(key)
+		if index is None:
+			index = string_ids[key] = len(strings)
+			strings.append(value.encode('utf-8') if tag != BYTES else value)
+		return index << TAG_BITS | tag
+	
+	def reference(value):
+		kind = type(value)
+		if kind is unicode:
+			return string(value, STRING)
+		if kind is int or kind is long:
+			if INT_MIN <= value <= INT_MAX:
+				return value << TAG_BITS | INT
+			return string(unicode(value), LONG)
+		if value is None or kind is bool or value is _absent:
+			return CONSTANTS.index(value) << TAG_BITS | CONSTANT
+		if kind is str:
+			return string(value, BYTES)
+		if kind is float:
+			floats.append(value)
+			return (len(floats) - 1) << TAG_BITS | FLOAT
+		if kind is type and _BUILTINS.get(value.__name__) is value or isinstance(value, type) and _is_node_class(value):
+			return class_id(value) << TAG_BITS | TYPE
+		raise TypeError('Can\'t dump {!r}, of {}'.format(value, kind))
+	
+	records = 0
+	stack = [(tree, None)]
+	pop, push = stack.pop, stack.append
+	while stack:
+		value, parts = pop()
+		if parts is None:
+			if id(value) in done:
+				continue
+			kind = type(value)
+			if kind is Node or isinstance(value, ASTNode):
+				# A lazy body is parsed by getting its suite, before its _body
+				parts = [getattr(value, slot, _absent) for slot in _layout(kind)]
+			elif kind is list or kind is tuple:
+				parts = value
+			elif kind is dict:
+				parts = [part for item in value.items() for part in item]
+			else:
+				done[id(value)] = (value, reference(value))
+				continue
+			push((value, parts))
+			for part in reversed(parts):
+				if id(part) not in done:
+					push((part, None))
+			continue
+		
+		# The parts are done
+		kind = type(value)
+		if kind is list:
+			cells.extend((LIST, len(parts)))
+		elif kind is tuple:
+			cells.extend((TUPLE, len(parts)))
+		elif kind is dict:
+			cells.extend((DICT, len(value)))
+		else:
+			cells.append(class_id(kind))
+		cells.extend([done[id(part)][1] for part in parts])
+		done[id(value)] = (value, records << TAG_BITS | RECORD)
+		records += 1
+	
+	offsets = array(str('I'), [0])
+	for data in strings:
+		offsets.append(offsets[-1] + len(data))
+	header = json.dumps([[cls.__module__, cls.__name__, _layout(cls) if _is_node_class(cls) else None]
+		for cls in classes], separators = (',', ':')).encode('utf-8')
+	if _SWAP:
+		for section in (offsets, floats, cells):
+			section.byteswap()
+	
+	sections = [header, offsets.tostring(), floats.tostring(), cells.tostring(), b''.join(strings)]
+	return HEADER.pack(MAGIC, VERSION, done[id(tree)][1], *[len(section) for section in sections]) + b''.join(sections)
+
+def dump(tree, fp):
+	""" Write `tree` to the binary file `fp`, see dumps """
+	fp.write(dumps(tree))
+
+def load(buf):
+	""" The tree in `buf`, from dumps: bytes, an mmap, a memoryview, or a
+	binary file to read them from.
+	
+	The records and numbers are read in one go. Strings are decoded from
+	`buf` the first time a record has them, and the one string is shared by
+	all the nodes that have it. A tree written by a version of kaml whose
+	nodes had other slots raises a ValueError.
+	"""
+	if not isinstance(buf, (bytes, bytearray, memoryview, mmap)):
+		buf = buf.read()
+	if len(buf) < HEADER.size:
+		raise ValueError('Not a kaml AST dump')
+	magic, version, root, header_size, offsets_size, floats_size, cells_size, strings_size = HEADER.unpack(_bytes(buf, 0, HEADER.size))
+	if magic != MAGIC:
+		raise ValueError('Not a kaml AST dump')
+	if version != VERSION:
+		raise ValueError('kaml AST dump version {}, this kaml reads {}'.format(version, VERSION))
+	
+	pos = HEADER.size
+	sections = []
+	for size in (header_size, offsets_size, floats_size, cells_size):
+		sections.append(_bytes(buf, pos, pos + size))
+		pos += size
+	if pos + strings_size != len(buf):
+		raise ValueError('kaml AST dump is {} bytes, not {}'.format(len(buf), pos + strings_size))
+	header, offsets, floats, cells = sections
+	offsets, floats, cells = _array('I', offsets), _array('d', floats), _array('i', cells)
+	
+	classes = []
+	# For each class: the class and the setters of its slots, and how many
+	# references its records have
+	builders = []
+	sizes = []
+	for module, name, layout in json.loads(header.decode('utf-8')):
+		cls = _find_class(module, name)
+		classes.append(cls)
+		if layout is None:
+			builders.append((cls, None))
+			sizes.append(None)
+			continue
+		if _is_node_class(cls) and list(_layout(cls)) == layout:
+			if cls is Node:
+				builders.append((cls, None))
+			else:
+				descriptors = dict(cls._slot_descriptors)
+				builders.append((cls, [descriptors[slot].__set__ for slot in layout]))
+			sizes.append(len(layout))
+			continue
+		raise ValueError('{}.{} has changed since the dump was written'.format(module, name))
+	
+	# Decoded as they're needed
+	strings = [None] * (len(offsets) - 1)
+	
+	def string(index):
+		value = strings[index]
+		if value is None:
+			value = strings[index] = _bytes(buf, pos + offsets[index], pos + offsets[index + 1]).decode('utf-8')
+		return value
+	
+	def value(ref):
+		tag, index = ref & TAG_MASK, ref >> TAG_BITS
+		if tag == RECORD:
+			return records[index]
+		if tag == STRING:
+			return string(index)
+		if tag == INT:
+			return index
+		if tag == CONSTANT:
+			return CONSTANTS[index]
+		if tag == FLOAT:
+			return floats[index]
+		if tag == TYPE:
+			return classes[index]
+		if tag == LONG:
+			return long(string(index))
+		return _bytes(buf, pos + offsets[index], pos + offsets[index + 1])
+	
+	# Each value that isn't a record or a small int, by its reference, found once
+	values = _Values(value)
+	absent = CONSTANTS.index(_absent) << TAG_BITS | CONSTANT
+	
+	def resolved(refs):
+		return [records[ref >> TAG_BITS] if not ref & TAG_MASK else ref >> TAG_BITS if ref & TAG_MASK == INT else values[ref]
+			for ref in refs]
+	
+	# The records, each made as it's come to. Tuples are made whole, as
+	# they can't be changed; nodes, lists and dicts are filled in after, a
+	# slot of all the nodes of a class at a time.
+	records = []
+	add = records.append
+	new = object.__new__
+	nodes = [([], []) for builder in builders]
+	lists = []
+	dicts = []
+	i, end = 0, len(cells)
+	while i < end:
+		head = cells[i]
+		if head >= 0:
+			node = new(builders[head][0])
+			add(node)
+			positions, made = nodes[head]
+			positions.append(i + 1)
+			made.append(node)
+			i += 1 + sizes[head]
+			continue
+		
+		count = cells[i + 1]
+		i += 2
+		if head == TUPLE:
+			add(tuple(resolved(cells[i:i + count])))
+		elif head == LIST:
+			items = []
+			add(items)
+			lists.append((items, i, count))
+		else:
+			items = {}
+			add(items)
+			count *= 2
+			dicts.append((items, i, count))
+		i += count
+	
+	for items, i, count in lists:
+		items[:] = resolved(cells[i:i + count])
+	
+	for (cls, setters), (positions, made) in zip(builders, nodes):
+		for offset, setter in enumerate(setters or ()):
+			refs = [cells[i + offset] for i in positions]
+			if absent in refs:
+				for node, ref, part in zip(made, refs, resolved(refs)):
+					if ref != absent:
+						setter(node, part)
+			else:
+				map(setter, made, resolved(refs))
+		if cls is Node:
+			for node, node_type, children, leaf in zip(made, *[resolved([cells[i + offset] for i in positions]) for offset in range(3)]):
+				node.node_type, node.children, node.leaf = node_type, children, leaf
+	
+	# Then the dicts, once their keys and values are all made
+	for items, i, count in dicts:
+		parts = resolved(cells[i:i + count])
+		items.update(zip(parts[::2], parts[1::2]))
+	return value(root)
+
+class _Values(dict):
+	""" Calls `find` for the keys it doesn't have yet, and keeps what it returns """
+	
+	def __init__(self, find):
+		self.find = find
+	
+	def __missing__(self, key):
+		value = self[key] = self.find(key)
+		return value
+
+def _is_node_class(cls):
+	return cls is Node or issubclass(cls, ASTNode)
+
+def _find_class(module, name):
+	if module == '__builtin__' and name in _BUILTINS:
+		return _BUILTINS[name]
+	try:
+		cls = getattr(import_module(module), name)
+	except (ImportError, AttributeError):
+		raise ValueError('No class {}.{}, for a kaml AST dump'.format(module, name))
+	if not isinstance(cls, type) or not _is_node_class(cls):
+		raise ValueError('{}.{} isn\'t a kind of node'.format(module, name))
+	return cls
+
+def _bytes(buf, start, end):
+	""" Bytes `start` to `end` of `buf` """
+	data = buf[start:end]
+	if isinstance(data, memoryview):
+		return data.tobytes()
+	return bytes(data)
+
+def _array(typecode, data):
+	values = array(str(typecode))
+	values.fromstring(data)
+	if _SWAP:
+		values.byteswap()
+	return values
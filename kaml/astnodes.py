@@ -4,7 +4,7 @@ from pprint import pformat
 __all__ = [
 	'Node', 'BinaryOp', 'TranslationUnit', 'EmptyNode',
 	
-	'FuncDef', 'FuncDecl', 'VariableDecl', 'Suite',
+	'FuncDef', 'FuncDecl', 'VariableDecl', 'Suite', 'LazySuite',
 	
 	'ParamSeq', 'KWArgDecl', 'HashDecl', 'DotDecl',
 	
@@ -12,7 +12,7 @@ __all__ = [
 	
 	'NumberLiteral', 'StringLiteral', 'BoolLiteral',
 	
-	'GetItem', 'GetAttr', 'FuncCall', 'Assign',
+	'GetItem', 'GetAttr', 'FuncCall', 'TagCall', 'Assign', 'Identifier',
 	
 	'ASTException',
 	
@@ -25,6 +25,10 @@ class ASTException(Exception):
 		super(ASTException, self).__init__(*args, **kwargs)
 
 class Scope(object):
+	""" Names and what they're bound to, in nested levels. A name set at an
+	inner level hides the same name of the levels around it until that
+	level is popped.
+	"""
 	def __init__(self):
 		self.names = {}
 		self.levels = deque()
@@ -42,7 +46,15 @@ class Scope(object):
 				if len(references) == 1:
 					del self.names[name]
 				else:
-					self.names[name] = references[0:]
+					references.pop()
+	
+	def declare(self, key, value):
+		""" Bind `key` at the innermost level, over what it's bound to outside """
+		self.levels[-1].append(key)
+		self.names.setdefault(key, []).append(value)
+	
+	def __contains__(self, key):
+		return key in self.names
 				
 	def __getitem__(self, key):
 		if key not in self.names:
@@ -70,8 +82,40 @@ class Node(object):
 	def __repr__(self):
 		return '{}{}'.format(self.node_type, self.children)
 
+	def __eq__(self, other):
+		return _equal(self, other)
+	
+	def __ne__(self, other):
+		return not _equal(self, other)
+
+class _NodeType(type):
+	""" Gives every ASTNode class `__slots__`, so that no node has a __dict__,
+	and `_fields`, the slots that the constructor sets and __eq__ compares.
+	
+	Those are the slots that the class declares, or its base's fields when it
+	declares none. A class with slots that aren't fields sets `_fields` too.
+	"""
+	
+	def __new__(mcs, name, bases, namespace):
+		namespace.setdefault('__slots__', ())
+		if '_fields' not in namespace:
+			namespace['_fields'] = namespace['__slots__'] or getattr(bases[0], '_fields', ())
+		cls = super(_NodeType, mcs).__new__(mcs, name, bases, namespace)
+		
+		# Each slot's descriptor, by name, for __getstate__: a subclass can
+		# have a property over one, like LazySuite.suite. Not _hash, string
+		# hashes can be different in the process that unpickles it.
+		cls._slot_descriptors = tuple((slot, base.__dict__[slot]) for base in reversed(cls.__mro__)
+			for slot in base.__dict__.get('__slots__', ()) if slot != '_hash')
+		return cls
+
 class ASTNode(object):
-	scope = Scope()
+	__metaclass__ = _NodeType
+	# Offsets of the start and end of the node in the source, set by the
+	# parser. Not compared by __eq__, the same code anywhere is the same tree.
+	# _hash is the structural hash of the nodes that kaml.interning shares.
+	__slots__ = ('start', 'end', 'ret_type', '_hash')
+	_fields = ()
 	
 	def _get_tokens(self, *args, **kwargs):
 		if len(args) == 1:
@@ -81,45 +125,183 @@ class ASTNode(object):
 		return None
 	
 	def debug_print(self):
-		return pformat({ self.__class__.__name__ :   { k : getattr(self, k) for k in self.__slots__} }, width = 30)
-	
-	def __init__(self, *args, **kwargs):
-		self.ret_type = None
-		tokens = deque(args)
-		
-		if tokens is None:
-			for slot in self.__slots__:
-				setattr(self, slot, None)
-		else:
-			
-			for slot in self.__slots__:
-				setattr(self, slot, tokens.popleft())
-		
-		self.__repr__ = self.__str__
+		return pformat({ self.__class__.__name__ :   { k : getattr(self, k) for k in self._fields} }, width = 30)
+	
+	def __init__(self, *args):
+		self.ret_type = self.start = self.end = None
+		fields = self._fields
+		if len(args) < len(fields):
+			raise TypeError('{} takes {} arguments, {} given'.format(self.__class__.__name__, len(fields), len(args)))
+		for slot, value in zip(fields, args):
+			setattr(self, slot, value)
 		
 	def __str__(self):
-		return pformat({ self.__class__.__name__ :   self.__slots__ }, width = 30)
+		return pformat({ self.__class__.__name__ :   self._fields }, width = 30)
 
 	__repr__ = __str__
 	
 	def __ne__(self, other):
 		return not (self == other)
 	
+	def accepts(self, visitor):
+		""" What `visitor`, a kaml.visitor.NodeVisitor, returns for this tree """
+		return visitor.visit(self)
+	
+	def __getstate__(self):
+		slots = {}
+		for slot, descriptor in self._slot_descriptors:
+			try:
+				slots[slot] = descriptor.__get__(self)
+			except AttributeError:
+				pass
+		return None, slots
+	
+	def __setstate__(self, state):
+		# Older pickles have a __dict__ as well
+		state, slots = state
+		if state:
+			slots = dict(slots, **{k : v for k, v in state.items() if k != '__repr__'})
+		descriptors = dict(self._slot_descriptors)
+		for slot, value in slots.items():
+			descriptors[slot].__set__(self, value)
+	
 	def debug__eq__(self, other):
-		ret = True
-		for k in self.__slots__:
-			if getattr(self, k) != getattr(other, k):
-				print ("attr {} of {} != {}".format(k, self.debug_print(), other.debug_print()))
-				ret = False
-		return ret
+		""" __eq__, printing each difference, see kaml.astdiff """
+		from kaml.treediff import astdiff
+		differences = astdiff(self, other)
+		for difference in differences:
+			print(difference)
+		return not differences
 	
 	def __eq__(self, other):
-		if not isinstance(other, self.__class__) or self.__slots__ != other.__slots__:
+		return self is other or not _hashes_differ(self, other) and _equal(self, other)
+	
+	def __hash__(self):
+		# The structural hash of the shared nodes that Interner has frozen,
+		# that don't change. The others can, and are hashed by identity.
+		try:
+			return self._hash
+		except AttributeError:
+			return object.__hash__(self)
+
+# Leaf values, that are compared as they are
+_VALUES = frozenset([str, unicode, int, long, float, bool, type(None)])
+
+def _equal(a, b):
+	""" Whether the trees `a` and `b` are the same, comparing a pair of their
+	parts at a time, so that deep trees don't hit the recursion limit. Stops
+	at the first difference. kaml.treediff.astdiff follows the same rules.
+	"""
+	values = _VALUES
+	stack = [(a, b)]
+	pop, push = stack.pop, stack.append
+	while stack:
+		a, b = pop()
+		if a is b:
+			continue
+		
+		if type(a) in values:
+			if a != b:
+				return False
+			continue
+		elif isinstance(a, AcceptsList):
+			# Any two lists of the same things
+			if not isinstance(b, AcceptsList):
+				return False
+			a, b = getattr(a, a._fields[0]), getattr(b, b._fields[0])
+		elif isinstance(a, ASTNode):
+			fields = a._fields
+			if not isinstance(b, a.__class__) or fields != b._fields:
+				return False
+			a, b = [getattr(a, field) for field in fields], [getattr(b, field) for field in fields]
+		elif isinstance(a, Node):
+			if not isinstance(b, Node) or a.node_type != b.node_type or a.leaf != b.leaf:
+				return False
+			push((a.children, b.children))
+			continue
+		elif isinstance(b, (ASTNode, Node)):
+			return False
+		elif isinstance(a, (list, tuple)):
+			if type(a) is not type(b):
+				return False
+		elif isinstance(a, dict):
+			if type(a) is not type(b) or len(a) != len(b) or any(k not in b for k in a):
+				return False
+			a, b = list(a.values()), [b[k] for k in a]
+		else:
+			if a != b:
+				return False
+			continue
+		
+		# The parts of a node, list or dict, most of them names and numbers.
+		# Pushed last to first, so that they're compared in source order.
+		if len(a) != len(b):
 			return False
+		for i in range(len(a) - 1, -1, -1):
+			x, y = a[i], b[i]
+			if x is not y:
+				if type(x) in values:
+					if x != y:
+						return False
+				else:
+					push((x, y))
+	return True
 		
-		return self.debug__eq__(other)
+def structural_hash(value):
+	""" A hash of the tree `value` that doesn't depend on where it is, equal
+	trees have the same. Like _equal, it takes the tree a part at a time.
+	"""
+	hashes = []
+	# The parts still to hash, and for each part that has parts of its own,
+	# _Hashed, when those are
+	stack = [value]
+	pop, push, extend = stack.pop, stack.append, stack.extend
+	while stack:
+		value = pop()
+		if type(value) is _Hashed:
+			count = len(value.parts)
+			parts = tuple(hashes[len(hashes) - count:])
+			del hashes[len(hashes) - count:]
+			if value.keys is not None:
+				hashes.append(hash(frozenset(zip(value.keys, parts))))
+			else:
+				hashes.append(hash(value.header + parts))
+			continue
 		
-		return all([getattr(self, k) == getattr(other, k) for k in self.__slots__])
+		if isinstance(value, ASTNode):
+			try:
+				hashes.append(value._hash)
+				continue
+			except AttributeError:
+				pass
+			thing = _Hashed((value.__class__.__name__, value.ret_type), None, [getattr(value, k) for k in value._fields])
+		elif isinstance(value, Node):
+			thing = _Hashed((value.node_type, value.leaf), None, [value.children])
+		elif isinstance(value, (list, tuple)):
+			thing = _Hashed((), None, value)
+		elif isinstance(value, dict):
+			thing = _Hashed(None, value.keys(), value.values())
+		else:
+			hashes.append(hash(value))
+			continue
+		push(thing)
+		# Hashed in order
+		extend(reversed(thing.parts))
+	return hashes[0]
+
+class _Hashed(object):
+	""" A part of a tree for structural_hash, whose parts are hashed """
+	__slots__ = ('header', 'keys', 'parts')
+	
+	def __init__(self, header, keys, parts):
+		self.header, self.keys, self.parts = header, keys, parts
+
+def _hashes_differ(node, other):
+	""" Whether the nodes are shared nodes that aren't equal, by their cached hashes """
+	try:
+		return node._hash != other._hash
+	except AttributeError:
+		return False
 
 def to_str(fmt_str):
 	def my__str__(self):
@@ -134,7 +316,8 @@ def to_str(fmt_str):
 class AcceptsList(ASTNode):
 	
 	def __init__(self, *args, **kwargs):
-		assert len(self.__slots__) == 1
+		assert len(self._fields) == 1
+		self.ret_type = self.start = self.end = None
 		if len(args) == 1 and isinstance(args[0], self.__class__):
 			self._set_thing(args[0]._get_thing())
 		else:
@@ -142,15 +325,23 @@ class AcceptsList(ASTNode):
 			self._set_thing(new_args)
 	
 	def _get_thing(self):
-		return getattr(self, self.__slots__[0])
+		return getattr(self, self._fields[0])
 	
 	def _set_thing(self, thing):
-		setattr(self, self.__slots__[0], thing)
+		setattr(self, self._fields[0], thing)
 	
 	def __add__(self, other):
+		result = self.__class__()
+		result._set_thing(list(self._get_thing() or ()))
+		result += other
+		return result
+	
+	def __iadd__(self, other):
 		list_thing = self._get_thing()
 		
-		if isinstance(list_thing, (list, tuple)):
+		if isinstance(list_thing, list):
+			list_thing.append(other)
+		elif isinstance(list_thing, tuple):
 			list_thing = list(list_thing) + [other]
 		elif isinstance(other, (list, tuple)):
 			list_thing = other
@@ -161,9 +352,6 @@ class AcceptsList(ASTNode):
 		
 		return self
 	
-	def __iadd__(self, other):
-		return self +other
-	
 	def __iter__(self):
 		return iter(self._get_thing())
 	
@@ -176,22 +364,6 @@ class AcceptsList(ASTNode):
 	def __ne__(self, other):
 		return not (self == other)
 	
-	def debug__eq__(self, other):
-		ret = True
-		for idx in xrange(len(self._get_thing())):
-			if self[idx] != other[idx]:
-				print("{} != {}".format(self[idx], other[idx]))
-				ret = False
-		return ret
-	
-	def __eq__(self, other):
-		if not isinstance(other, AcceptsList) or len(self._get_thing()) != len(other._get_thing()):
-			return False
-		
-		return self.debug__eq__(other)
-		
-		return all([self[idx] == other[idx] for idx in xrange(len(self._get_thing()))])
-
 @to_str('<empty_node>')
 class EmptyNode(ASTNode):
 	__slots__ = ()
@@ -200,26 +372,50 @@ class EmptyNode(ASTNode):
 class TranslationUnit(AcceptsList):
 	__slots__ = ('declarations',)
 	
-	def accepts(self, visitor):
-		visitor.visit_translation_unit()
-		
-		for declaration in self.declarations:
-			declaration.accepts(visitor)
-
 @to_str('{{{self.suite!r}}}')
 class Suite(AcceptsList):
 	__slots__ = ('suite',)
 	
-	def accepts(self, visitor):
-		self.scope.push()
-		for item in self.suite:
-			item.verify()
+class LazySuite(Suite):
+	""" A function body from a lazy parse, parsed when it is first used.
 		
-		self.scope.pop()
+	`body` is what kaml.parser.parse_body needs for that: the parser and
+	lexer classes, the parser's options, the source, and the offset and line
+	of the body's `{`.
+	"""
+	__slots__ = ('_body',)
+	_fields = Suite._fields
+	
+	def __init__(self, body):
+		super(LazySuite, self).__init__()
+		self._body = body
+	
+	def _get_suite(self):
+		if self._body is not None:
+			from kaml.parser import parse_body
+			Suite.suite.__set__(self, parse_body(*self._body).suite)
+			self._body = None
+		return Suite.suite.__get__(self)
+	
+	def _set_suite(self, suite):
+		self._body = None
+		Suite.suite.__set__(self, suite)
+	
+	suite = property(_get_suite, _set_suite)
+	
+	def __getstate__(self):
+		state, slots = super(LazySuite, self).__getstate__()
+		if self._body is not None:
+			# Still unparsed, keep it that way
+			slots.pop('suite', None)
+		return state, slots
 
 @to_str('{self.decl} -> {self.suite}')
 class FuncDef(ASTNode):
-	__slots__ = ('decl', 'suite')
+	# kaml.resolver sets `locals`, the names of the function's frame slots,
+	# and `free`, the names it has from the functions around it
+	__slots__ = ('decl', 'suite', 'locals', 'free')
+	_fields = ('decl', 'suite')
 	
 	
 @to_str('{self.stmt!r}')
@@ -235,11 +431,11 @@ class IfStmt(Stmt):
 	__slots__ = ('condition', 'true_suite', 'false_suite')
 
 @to_str('while ({self.condition}) {self.suite!r}')
-def WhileStmt(Stmt):
+class WhileStmt(Stmt):
 	__slots__ = ('condition', 'suite')
 
 @to_str('for ({self.expressions}) {self.suite}')
-def ForStmt(Stmt):
+class ForStmt(Stmt):
 	__slots__ = ('expressions', 'suite')
 
 @to_str('Function {self.name}({self.args})')
@@ -341,7 +537,16 @@ class ReturnStmt(Stmt):
 
 @to_str('Ident({self.name})')
 class Identifier(ASTNode):
-	__slots__ = ('name',)
+	""" A name, where it's used or bound, from kaml.resolver. `depth` is
+	how many functions out the frame that has it is, 0 for the function it's
+	in, and `index` is its slot in that frame. Both are None for globals.
+	"""
+	__slots__ = ('name', 'depth', 'index')
+	_fields = ('name',)
+	
+	def __init__(self, name, depth = None, index = None):
+		super(Identifier, self).__init__(name)
+		self.depth, self.index = depth, index
 
 @to_str('Number({self.number})')
 class NumberLiteral(ASTNode):
@@ -381,7 +586,7 @@ class RelationOp(BinaryOp): pass
 class GetItem(Expr):
 	__slots__ = ('base_expr', 'subscript')
 	
-@to_str('{self.base_expr}[{self.substcript}]')
+@to_str('{self.base_expr}{self.subscript}')
 class GetAttr(Expr):
 	__slots__ = ('base_expr', 'subscript')
 
@@ -389,6 +594,15 @@ class GetAttr(Expr):
 class FuncCall(Expr):
 	__slots__ = ('fn_name', 'params')
 
+@to_str('{self.fn_name}#{self.hash_arg}{self.dot_args}{self.kwargs}({self.params})')
+class TagCall(FuncCall):
+	""" A call with an #id, .classes or [keyword arguments], that a -def
+	takes with its hash, dot and kwarg parameters. `hash_arg` is the id or
+	None, `dot_args` the class names, and `kwargs` the arguments by name.
+	"""
+	__slots__ = ('hash_arg', 'dot_args', 'kwargs')
+	_fields = FuncCall._fields + __slots__
+
 class Trailer(Expr):
 	__expr__ = ('expr', 'trailer')
 	def __str__(self): return 'Sub({}[{}])'.format(self.expr, self.trailer)
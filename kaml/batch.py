@@ -0,0 +1,219 @@
+from __future__ import unicode_literals
+from collections import namedtuple
+import io, multiprocessing, os, sys, timeit
+
+from kaml.astnodes import EmptyNode, FuncDef, LazySuite, TranslationUnit
+from kaml.lexer import Lexer
+from kaml.parser import Parser, _missing
+
+__all__ = ['FileResult', 'find_files', 'parse_parallel', 'run_batch', 'split_points', 'summary']
+
+FileResult = namedtuple('FileResult', 'path ok seconds error diagnostics')
+
+def find_files(paths, suffix = '.kaml'):
+	""" The files in `paths`, with directories searched recursively for `suffix` files """
+	files = []
+	for path in paths:
+		if os.path.isdir(path):
+			for root, dirs, names in os.walk(path):
+				dirs.sort()
+				files.extend(os.path.join(root, name) for name in sorted(names) if name.endswith(suffix))
+		else:
+			files.append(path)
+	return files
+
+class _Discard(object):
+	""" Swallows what the parser prints on errors, the error is in the result """
+	def write(self, s):
+		pass
+
+# The lexer or parser of this process, built once by _init_worker, and
+# whether it returns diagnostics
+_worker = None
+_checking = False
+
+def _init_worker(lexer_only, check = False):
+	global _worker, _checking
+	_checking = check
+	if check:
+		_worker = Parser().check
+	elif lexer_only:
+		lexer = Lexer()
+		_worker = lambda data: list(lexer.tokenize(data))
+	else:
+		_worker = Parser().parse
+
+def _process(path):
+	start = timeit.default_timer()
+	stdout = sys.stdout
+	try:
+		with io.open(path, encoding = 'utf-8') as fp:
+			data = fp.read()
+		sys.stdout = _Discard()
+		result = _worker(data)
+	except Exception as e:
+		return FileResult(path, False, timeit.default_timer() - start, '{}: {}'.format(e.__class__.__name__, e), ())
+	finally:
+		sys.stdout = stdout
+	
+	diagnostics = tuple(result) if _checking else ()
+	error = '{} errors'.format(len(diagnostics)) if diagnostics else None
+	return FileResult(path, not diagnostics, timeit.default_timer() - start, error, diagnostics)
+
+def run_batch(paths, jobs = 1, lexer_only = False, check = False):
+	""" Parse (or only lex) every file, with `jobs` worker processes.
+	
+	With `check` files are parsed with Parser.check, and every error in them
+	is in the result's diagnostics. Yields a FileResult per file, in the order
+	they finish.
+	"""
+	if jobs <= 1:
+		_init_worker(lexer_only, check)
+		for path in paths:
+			yield _process(path)
+		return
+	
+	pool = multiprocessing.Pool(jobs, _init_worker, (lexer_only, check))
+	try:
+		chunksize = max(1, len(paths) // (jobs * 8))
+		for result in pool.imap_unordered(_process, paths, chunksize):
+			yield result
+		pool.close()
+	except:
+		pool.terminate()
+		raise
+	finally:
+		pool.join()
+
+def summary(results, elapsed, slowest = 5):
+	""" Totals, files per second, and the slowest files """
+	errors = [r for r in results if not r.ok]
+	lines = ['{} files, {} errors in {:.2f}s, {:.1f} files/s'.format(
+		len(results), len(errors), elapsed, len(results) / elapsed if elapsed else 0.0
+	)]
+	if results:
+		lines.append('slowest:')
+		for r in sorted(results, key = lambda r: -r.seconds)[:slowest]:
+			lines.append('  {:8.4f}s {}'.format(r.seconds, r.path))
+	return '\n'.join(lines)
+
+_OPEN = {'{' : 1, '(' : 1, '[' : 1, '}' : -1, ')' : -1, ']' : -1}
+
+def split_points(source, chunks, lexer_class = Lexer):
+	""" Up to `chunks` - 1 offsets that split `source` into about equal
+	parts, each where a top level item starts.
+	
+	They're found in the tokens of `source`, up to the last one needed: the
+	first token after each `;` or `}` that's at the top level, lexed in the
+	INITIAL state, and not an -else or -elif. So none is in a string, a raw
+	block or a comment. No offsets when `source` doesn't lex.
+	"""
+	lexer = lexer_class()
+	# Lex errors are recorded, not printed
+	lexer.diagnostics = []
+	lexer.lexer.input(source)
+	token = lexer.lexer.token
+	
+	points = []
+	targets = [len(source) * k // chunks for k in range(chunks - 1, 0, -1)]
+	depth = 0
+	after = False # The last token ended an item
+	while targets:
+		initial = lexer.lexer.lexstate == 'INITIAL'
+		tok = token()
+		if tok is None or lexer.diagnostics:
+			break
+		if after and tok.type not in ('ELSE', 'ELIF'):
+			if tok.lexpos >= targets[-1]:
+				points.append(tok.lexpos)
+				while targets and targets[-1] <= tok.lexpos:
+					targets.pop()
+		after = False
+		if initial and tok.type in _OPEN:
+			depth += _OPEN[tok.type]
+			after = depth == 0 and tok.type == '}'
+		elif initial and tok.type == ';':
+			after = depth == 0
+	
+	return [] if lexer.diagnostics else points
+
+# The parser and source of a parse_parallel worker, from _init_chunks
+_chunks = None
+
+def _init_chunks(parser_args, source):
+	global _chunks
+	parser_class, kwargs = parser_args
+	_chunks = (parser_class(**kwargs), source)
+
+def _parse_chunk(region):
+	""" The top level items from `start` to `end` of the source, or None
+	when they aren't the ones a parse of the whole source has there.
+	"""
+	parser, source = _chunks
+	start, end = region
+	stdout = sys.stdout
+	try:
+		# Errors are reported by the parse of the whole source
+		sys.stdout = _Discard()
+		with parser.context() as context:
+			items = context.parse_region(source, start, end, parser.lazy)
+	except Exception:
+		# A split the parse of the whole source doesn't have, it says why
+		# there. Not every exception can be sent back to the pool.
+		return None
+	finally:
+		sys.stdout = stdout
+	if items is _missing:
+		return None
+	
+	for item in items:
+		# Lazy bodies are sent without the source, every one has all of it
+		suite = item.suite if isinstance(item, FuncDef) else None
+		if isinstance(suite, LazySuite) and suite._body is not None:
+			suite._body = suite._body[:3] + (None,) + suite._body[4:]
+	return items
+
+def parse_parallel(parser, source, workers = None):
+	""" What `parser.parse(source)` returns, with the top level items parsed
+	in `workers` processes.
+	
+	The source is split between top level items, and each process parses
+	its parts. When a part doesn't parse the way it does in the whole, as on
+	errors, the whole source is parsed here instead.
+	"""
+	workers = workers or multiprocessing.cpu_count()
+	# Twice as many parts as processes, so one slow part doesn't hold up the rest
+	points = split_points(source, workers * 2, parser.lexer_class) if workers > 1 else []
+	if not points:
+		return parser.parse(source)
+	
+	bounds = [0] + points + [len(source)]
+	parser_args = (parser.__class__, {'lexer_class' : parser.lexer_class, 'lazy' : parser.lazy,
+		'pratt' : parser.pratt, 'spans' : parser.spans})
+	# The workers are forked with the source, only offsets and trees are sent
+	pool = multiprocessing.Pool(workers, _init_chunks, (parser_args, source))
+	try:
+		items = []
+		for chunk in pool.imap(_parse_chunk, zip(bounds, bounds[1:])):
+			if chunk is None:
+				items = None
+				break
+			items.extend(chunk)
+	finally:
+		# Every part is in by now, or the rest aren't needed
+		pool.terminate()
+		pool.join()
+	
+	if items is None:
+		return parser.parse(source)
+	for item in items:
+		suite = item.suite if isinstance(item, FuncDef) else None
+		if isinstance(suite, LazySuite) and suite._body is not None:
+			suite._body = suite._body[:3] + (source,) + suite._body[4:]
+	
+	if not items:
+		return EmptyNode()
+	tree = TranslationUnit(*items)
+	if parser.spans:
+		tree.start, tree.end = items[0].start, items[-1].end
+	return tree
@@ -0,0 +1,22 @@
+from __future__ import unicode_literals
+from collections import namedtuple
+
+__all__ = ['Diagnostic']
+
+class Diagnostic(namedtuple('Diagnostic', 'kind offset line column state message expected')):
+	""" An error found by Parser.check.
+	
+	`kind` is 'lex' or 'parse'. `state` is the lexer state for lex errors and
+	the LR state for parse errors, and `expected` the token types the parser
+	would have accepted there.
+	"""
+	__slots__ = ()
+	
+	def format(self, path = '<input>'):
+		text = '{}:{}:{}: {}'.format(path, self.line, self.column, self.message)
+		if self.expected:
+			text += ' (expected {})'.format(', '.join(self.expected))
+		return text
+	
+	def __str__(self):
+		return self.format()
@@ -0,0 +1,104 @@
+from __future__ import unicode_literals
+
+from kaml.astnodes import ASTNode, LazySuite, Node, structural_hash
+
+__all__ = ['Interner']
+
+class Interner(object):
+	""" Shares the parts of trees that are the same, by hash consing.
+	
+	intern(tree) replaces each subtree, tuple and value in `tree` with the
+	first equal one it was given, in this tree or an earlier one, so that
+	equal subtrees are the same object and __eq__ on them returns at once.
+	The nodes it keeps have their structural hash cached, as dict keys.
+	Lists and dicts can be changed in place, and are only shared as a part
+	of a node that's shared.
+	
+	Trees are interned in place. A shared node is at more than one place in
+	the source, so the nodes it keeps have no spans, and they mustn't be
+	changed after. Lazy bodies that weren't parsed yet are left as they are.
+	"""
+	
+	def __init__(self):
+		# What's kept, by class and contents, where those are the kept ones
+		# and so are by id
+		self._table = {}
+	
+	def __len__(self):
+		return len(self._table)
+	
+	def intern(self, tree):
+		""" `tree`, with what's in it shared with the trees interned before """
+		# The kept value of each one done, by id, with the value, so that the
+		# id isn't reused while this runs, and what it's known by in the keys
+		done = {}
+		stack = [(tree, False)]
+		pop, push = stack.pop, stack.append
+		while stack:
+			value, ready = pop()
+			if id(value) in done:
+				continue
+			if not ready:
+				push((value, True))
+				for item in _contents(value):
+					if id(item) not in done:
+						push((item, False))
+				continue
+			done[id(value)] = (value,) + self._keep(value, done)
+		return done[id(tree)][1]
+	
+	def _keep(self, value, done):
+		""" The kept one for `value`, whose contents are done, and what it's
+		known by in keys: the id of a kept one, and the contents of a list or
+		dict, that aren't shared as they can be changed in place
+		"""
+		table = self._table
+		if isinstance(value, ASTNode):
+			if type(value) is LazySuite and value._body is not None:
+				return value, id(value)
+			key = [value.__class__, value.ret_type]
+			for field in value._fields:
+				_, kept, known = done[id(getattr(value, field))]
+				setattr(value, field, kept)
+				key.append(known)
+			kept = table.get(tuple(key))
+			if kept is None:
+				value.start = value.end = None
+				value._hash = structural_hash(value)
+				kept = table.setdefault(tuple(key), value)
+			return kept, id(kept)
+		
+		if isinstance(value, list):
+			parts = [done[id(item)] for item in value]
+			value[:] = [kept for _, kept, known in parts]
+			return value, (list,) + tuple(known for _, kept, known in parts)
+		if isinstance(value, dict):
+			parts = dict((k, done[id(v)]) for k, v in value.items())
+			value.update((k, kept) for k, (_, kept, known) in parts.items())
+			return value, (dict, frozenset((k, known) for k, (_, kept, known) in parts.items()))
+		
+		if isinstance(value, tuple):
+			key = (tuple,) + tuple(done[id(item)][2] for item in value)
+			value = tuple(done[id(item)][1] for item in value)
+		elif isinstance(value, Node):
+			value.children = done[id(value.children)][1]
+			key = (Node, value.node_type, value.leaf, done[id(value.children)][2])
+		else:
+			# 1, 1.0 and True are equal, but not the same
+			key = (value.__class__, value)
+		kept = table.setdefault(key, value)
+		return kept, id(kept)
+
+def _contents(value):
+	""" What's in `value`, to be interned before it """
+	if isinstance(value, ASTNode):
+		if type(value) is LazySuite and value._body is not None:
+			return ()
+		return [getattr(value, field) for field in value._fields]
+	if isinstance(value, (list, tuple)):
+		return value
+	if isinstance(value, dict):
+		return value.values()
+	if isinstance(value, Node):
+		return (value.children,)
+	return ()
@@ -1,20 +1,161 @@
 from __future__ import unicode_literals
-import re, sys
+import bisect, codecs, hashlib, itertools, os, re, sys, timeit
 
 from ply import lex
+
+from kaml.diagnostics import Diagnostic
+from kaml.lexstats import LexerStats
+from kaml.sourcemap import SourceMap
+from kaml.tokenbuffer import TokenBuffer
 # Influence from pycparser, and aptana's CSS.bnf
 
+def split_rule_name(name, states):
+	""" t_stringsg_stringdbl_INNER -> (('stringsg', 'stringdbl'), 'INNER'), as PLY does """
+	parts = name.split('_')[1:]
+	i = 0
+	while i < len(parts) - 1 and parts[i] in states:
+		i += 1
+	return tuple(parts[:i]) or ('INITIAL',), '_'.join(parts[i:])
+
 class Lexer(object):
 	
+	# Table module for the compiled rules, and the master lexers built so far
+	# (one per class). Instances get a clone of the master, so the rules are
+	# only compiled once per process.
+	lextab = 'kaml.lextab'
+	_masters = {}
+	
 	def __init__(self, **kwargs):
 		self.log = lex.PlyLogger(sys.stderr)
-		self.lexer = lex.lex(module = self, reflags = re.U, debuglog = self.log, **kwargs)
-		self.lexer.lextokens.update({
+		self.trace = kwargs.pop('trace', False)
+		stats = kwargs.pop('stats', False)
+		if kwargs:
+			self.lexer = self._build(**kwargs)
+		else:
+			# clone() rebinds the rules to this instance, but leaves the stack
+			# shared and the current state bound to the master's
+			self.lexer = self._master().clone(self)
+			self.lexer.lexstatestack = []
+			self.lexer.begin('INITIAL')
+		self.nesting = 0
+		self.tok_stack = []
+		self.checkpoints = []
+		self._sourcemap = None
+		self.diagnostics = None # A list to record errors in, instead of printing them
+		self.stats = None
+		if stats:
+			self._profile(LexerStats())
+	
+	def _build(self, **kwargs):
+		lexer = lex.lex(module = self, reflags = self.reflags, debuglog = self.log, **kwargs)
+		lexer.lextokens.update({
 			'{' : 1, '}' : 1,
 			'[' : 1, ']' : 1,
 		})
-		self.nesting = 0
-		self.tok_stack = []
+		return lexer
+	
+	def _master(self):
+		cls = self.__class__
+		if cls not in Lexer._masters:
+			signature = self.signature()
+			try:
+				__import__(cls.lextab)
+				current = getattr(sys.modules[cls.lextab], '_lexsignature', None) == signature
+			except ImportError:
+				current = False
+			
+			# A stale table is left as it is, write_lextab updates it at build time
+			if current:
+				lexer = self._build(optimize = 1, lextab = cls.lextab)
+			else:
+				lexer = self._build()
+			Lexer._masters[cls] = lexer
+		return Lexer._masters[cls]
+	
+	def signature(self):
+		""" Hash of everything the compiled tables depend on """
+		funcs = []
+		strings = []
+		for name in dir(self.__class__):
+			if name.startswith('t_'):
+				rule = getattr(self.__class__, name)
+				if callable(rule):
+					funcs.append((rule.__code__.co_firstlineno, name, rule.__doc__))
+				else:
+					strings.append((name, rule))
+		
+		parts = [repr(self.reflags), repr(sorted(self.tokens)), repr(self.literals), repr(self.states)]
+		parts += ['{}={}'.format(name, doc) for _, name, doc in sorted(funcs)]
+		parts += ['{}={}'.format(name, rule) for name, rule in sorted(strings)]
+		return hashlib.sha1('\n'.join(parts).encode('utf-8')).hexdigest()
+	
+	def write_lextab(self, outputdir = None):
+		""" Write the compiled rules and their signature to the lextab module,
+		in `outputdir` or next to this file. That's for build time, see
+		kaml.tables, at run time a stale table is only left unused.
+		"""
+		# Only the class that owns the table, a subclass would overwrite its base's
+		if 'lextab' not in self.__class__.__dict__:
+			raise ValueError('{} has no lextab of its own'.format(self.__class__.__name__))
+		
+		outputdir = outputdir or os.path.dirname(os.path.abspath(__file__))
+		self._build().writetab(self.lextab, outputdir)
+		with open(os.path.join(outputdir, self.lextab.split('.')[-1] + '.py'), 'a') as fp:
+			fp.write(str('_lexsignature = {!r}\n').format(str(self.signature())))
+	
+	def _profile(self, stats):
+		""" Wrap every rule of self.lexer to count its matches and time them into `stats` """
+		self.stats = stats
+		lexer = self.lexer
+		clock = timeit.default_timer
+		
+		# PLY only keeps the token type of string rules, find their names
+		states = ['INITIAL'] + [s for s, _ in self.states]
+		names = {}
+		for name in dir(self.__class__):
+			if name.startswith('t_') and not callable(getattr(self.__class__, name)):
+				rule_states, tokname = split_rule_name(name, states)
+				for state in rule_states:
+					names[(state, tokname)] = name
+		
+		def wrap(name, func):
+			counts = stats.rules.setdefault(name, [0, 0.0])
+			
+			def timed(tok):
+				if func is not None:
+					tok = func(tok)
+				now = clock()
+				counts[0] += 1
+				counts[1] += now - stats.mark
+				stats.mark = now
+				stats.last = tok
+				if self.nesting > stats.max_nesting:
+					stats.max_nesting = self.nesting
+				return tok
+			return timed
+		
+		for state, table in lexer.lexstatere.items():
+			for n, (cre, findex) in enumerate(table):
+				findex = list(findex)
+				for i, entry in enumerate(findex):
+					if entry and entry[1]:
+						func, tokname = entry
+						name = func.__name__ if func else names.get((state, tokname), tokname)
+						findex[i] = (wrap(name, func), tokname)
+				table[n] = (cre, findex)
+		lexer.begin(lexer.lexstate)
+		
+		# Literals don't go through a rule
+		literals = stats.rules.setdefault('literals', [0, 0.0])
+		token = lexer.token
+		def timed_token():
+			stats.mark = clock()
+			tok = token()
+			if tok is not None and tok is not stats.last:
+				literals[0] += 1
+				literals[1] += clock() - stats.mark
+			return tok
+		lexer.token = timed_token
 	
 	def _get_token(self):
 		if len(self.tok_stack):
@@ -24,39 +165,265 @@ class Lexer(object):
 	def _push_token(self, t):
 		self.tok_stack.append(t)
 	
+	def reset(self):
+		""" Back to the state of a new lexer, for the next input """
+		self.nesting = 0
+		del self.tok_stack[:]
+		del self.lexer.lexstatestack[:]
+		self.lexer.begin('INITIAL')
+		self.lexer.lineno = 1
+	
 	def tokenize(self, data):
 		self.lexer.input(unicode(data))
+		return self._coalesce(self._get_token)
+	
+	def tokenize_buffer(self, data):
+		""" The tokens of `data` in a compact TokenBuffer, for lexing lots of input at once """
+		return TokenBuffer(self.tokenize(data))
+	
+	def tokenize_stream(self, fp, chunk_size = 1 << 16, encoding = 'utf-8'):
+		""" Tokenize a file object (or mmap) without reading it all at once.
+		
+		Produces exactly the same token stream as `tokenize`, but only keeps a
+		window of roughly `chunk_size` characters in memory. Byte streams are
+		decoded incrementally with `encoding`. Token positions are absolute
+		offsets into the decoded stream.
+		"""
+		stream = self._stream_tokens(fp, chunk_size, encoding)
+		
+		def get_token():
+			if len(self.tok_stack):
+				return self.tok_stack.pop(0)
+			return next(stream, None)
+		
+		return self._coalesce(get_token)
+	
+	def _coalesce(self, get_token):
 		while True:
-			tok = self._get_token()
+			tok = get_token()
 				
 			if tok:
 				if tok.type == 'STRING_LIT':
-					t = lex.LexToken()
-					t.lineno = tok.lineno
-					t.type = 'STRING_LIT'
-					t.lexpos = tok.lexpos
-					t.value = ''
+					# The first fragment becomes the coalesced token. Fragments are
+					# collected and joined once, repeated `+=` is quadratic on
+					# large raw blocks.
+					t = tok
+					values = []
 					
 					while tok and tok.type == 'STRING_LIT':
-						t.value += tok.value
-						tok = self._get_token()
+						values.append(tok.value)
+						tok = get_token()
 					
+					t.value = ''.join(values)
 					yield t
 				yield tok
 			else:
 				break
 	
+	# Number of characters a rule may look at beyond (or before) its own match.
+	# A token that ends closer than this to the end of the window is re-lexed
+	# once more input is available.
+	stream_context = 8
+	
+	def _stream_tokens(self, fp, chunk_size, encoding):
+		lexer = self.lexer
+		context = self.stream_context
+		decoder = codecs.getincrementaldecoder(encoding)()
+		
+		def read(size):
+			data = fp.read(size)
+			if isinstance(data, bytes):
+				return decoder.decode(data, not data), not data
+			return data, not data
+		
+		data, eof = read(chunk_size)
+		lexer.input(unicode(data))
+		base = 0 # Offset of lexdata[0] in the whole stream
+		want = chunk_size
+		last_resume = None
+		
+		while True:
+			state = (
+				lexer.lexpos, lexer.lineno, lexer.lexstate,
+				list(lexer.lexstatestack), self.nesting,
+			)
+			try:
+				tok = lexer.token()
+			except lex.LexError:
+				if eof or lexer.lexpos + context <= lexer.lexlen:
+					raise
+				tok = None
+			
+			if not eof and (tok is None or lexer.lexpos + context > lexer.lexlen):
+				# The token may continue past the window; rewind to before it,
+				# drop everything that's already been consumed, and read more.
+				resume = state[0]
+				if resume == last_resume:
+					# A single token spans the whole window, grow it geometrically
+					want *= 2
+				else:
+					want = chunk_size
+				last_resume = resume
+				
+				cut = max(resume - context, 0) # Keep some context for lookbehinds
+				data, eof = read(want)
+				lexer.input(lexer.lexdata[cut:] + data)
+				base += cut
+				
+				lexer.lexpos = resume - cut
+				lexer.lineno = state[1]
+				lexer.begin(state[2])
+				lexer.lexstatestack[:] = state[3]
+				self.nesting = state[4]
+				continue
+			
+			if tok is None:
+				break
+			
+			tok.lexpos += base
+			yield tok
+	
+	# tokenize_checkpointed records the lexer state before every this many tokens
+	checkpoint_interval = 64
+	
+	def tokenize_checkpointed(self, data):
+		""" Tokenize `data` into a list, recording checkpoints for `relex`.
+		
+		Returns the same tokens as `tokenize`, without the trailing None.
+		"""
+		self.lexer.input(unicode(data))
+		self.lexer.lineno = 1
+		self.lexer.begin('INITIAL')
+		del self.lexer.lexstatestack[:]
+		self.nesting = 0
+		self.checkpoints = []
+		tokens = []
+		self._lex_checkpointed(tokens, self.checkpoints)
+		return tokens
+	
+	def relex(self, old_tokens, edit_start, edit_end, new_text):
+		""" Update `old_tokens` after the input has had [edit_start, edit_end) replaced by `new_text`.
+		
+		`old_tokens` is the result of the last tokenize_checkpointed or relex
+		call, and is updated in place. Lexing resumes at the last checkpoint
+		before the edit, and stops at the first old checkpoint after it where
+		the lexer is back in the same state. The tokens after that are kept,
+		only their positions are shifted.
+		"""
+		old_data = self.lexer.lexdata
+		data = old_data[:edit_start] + unicode(new_text) + old_data[edit_end:]
+		delta = len(data) - len(old_data)
+		new_end = edit_end + delta
+		
+		# The last checkpoint whose tokens can't have looked at the edit
+		checkpoints = self.checkpoints
+		if not checkpoints:
+			old_tokens[:] = self.tokenize_checkpointed(data)
+			return old_tokens
+		# The first checkpoint is the start of the input, always safe
+		i = max(bisect.bisect_right([c[1] for c in checkpoints], edit_start - self.stream_context) - 1, 0)
+		
+		index, lexpos, lineno, lexstate, stack, nesting = checkpoints[i]
+		old_after = dict((c[1], j) for j, c in enumerate(checkpoints) if c[1] >= edit_end)
+		
+		def resync(state):
+			j = old_after.get(state[0] - delta)
+			if state[0] >= new_end and j is not None and checkpoints[j][3:] == state[2:]:
+				return j
+		
+		lexer = self.lexer
+		lexer.input(data)
+		lexer.lexpos = lexpos
+		lexer.lineno = lineno
+		lexer.begin(lexstate)
+		lexer.lexstatestack[:] = stack
+		self.nesting = nesting
+		
+		tokens = []
+		new_checkpoints = []
+		found = self._lex_checkpointed(tokens, new_checkpoints, resync, index)
+		if found is None:
+			old_tokens[index:] = tokens
+			checkpoints[i:] = new_checkpoints
+			return old_tokens
+		
+		# Splice in the new tokens, and shift everything after them
+		found, state = found
+		old_index, old_lexpos, old_lineno = checkpoints[found][:3]
+		new_index = index + len(tokens)
+		lines = state[1] - old_lineno
+		old_tokens[index:old_index] = tokens
+		if delta or lines:
+			for tok in itertools.islice(old_tokens, new_index, None):
+				tok.lexpos += delta
+				tok.lineno += lines
+		
+		shift = new_index - old_index
+		checkpoints[i:] = new_checkpoints + [
+			(c[0] + shift, c[1] + delta, c[2] + lines) + c[3:] for c in checkpoints[found:]
+		]
+		return old_tokens
+	
+	def _lex_checkpointed(self, tokens, checkpoints, resync = None, index = 0):
+		""" Lex and coalesce from the current state onto `tokens`.
+		
+		A checkpoint is the lexer state before a token that starts a new
+		coalesced token; one is recorded every `checkpoint_interval` tokens. If
+		`resync` returns something for any of those states, lexing stops there
+		and that is returned with the state.
+		"""
+		lexer = self.lexer
+		interval = self.checkpoint_interval
+		pending = None # Fragments of the STRING_LIT being coalesced
+		
+		while True:
+			state = (lexer.lexpos, lexer.lineno, lexer.lexstate, tuple(lexer.lexstatestack), self.nesting)
+			tok = lexer.token()
+			
+			if pending is not None:
+				if tok is not None and tok.type == 'STRING_LIT':
+					pending.append(tok.value)
+					continue
+				tokens[-1].value = ''.join(pending)
+				pending = None
+			
+			if tok is None:
+				return None
+			
+			if resync is not None:
+				found = resync(state)
+				if found is not None:
+					return found, state
+			if (index + len(tokens)) % interval == 0:
+				checkpoints.append((index + len(tokens),) + state)
+			
+			tokens.append(tok)
+			if tok.type == 'STRING_LIT':
+				pending = [tok.value]
+	
+	def get_sourcemap(self):
+		""" SourceMap of the current input, built on first use.
+		
+		Only meaningful for `tokenize` and parsing, `tokenize_stream` keeps
+		just a window of the input.
+		"""
+		data = self.lexer.lexdata
+		if self._sourcemap is None or self._sourcemap.source is not data:
+			self._sourcemap = SourceMap(data)
+		return self._sourcemap
+	
 	def find_tok_column(self, token):
-		last_cr = self.lexer.lexdata.rfind('\n', 0, token.lexpos)
-		return token.lexpos - last_cr
+		return self.get_sourcemap().location(token.lexpos)[1]
 	
 	def _make_tok_location(self, token):
-		return (token.lineno, self.find_tok_column(token))
+		return self.get_sourcemap().location(token.lexpos)
 	
 	def push(self, s):
 		t = '-' * len(self.lexer.lexstatestack) #@UnusedVariable
-		if self.lexer.trace:
+		if self.trace:
 			self.log.debug("{}Starting {}".format(t, s))
+		if self.stats is not None:
+			self.stats.transition(self.lexer.lexstate, s, len(self.lexer.lexstatestack) + 1)
 		self.lexer.push_state(s)
 	
 	def pop(self):
@@ -64,16 +431,20 @@ class Lexer(object):
 		current = self.lexer.current_state() #@UnusedVariable
 		self.lexer.pop_state()
 		following = self.lexer.current_state() #@UnusedVariable
-		if self.lexer.trace:
+		if self.stats is not None:
+			self.stats.transition(current, following, len(self.lexer.lexstatestack))
+		if self.trace:
 			self.log.debug("{}Ending {}. Continuing {}".format(t, current, following))
 		
 	
+	reflags = re.U
+	
 	reserved = {k.strip() : k.strip().replace('-', '').upper() for k in """
 	-def -set -for -if -elif -else -use -while -continue -break -return
 	or and true false 
 	""".split()}
 	
-	reserved_words = reserved.values()
+	reserved_words = sorted(reserved.values())
 	other_symbols = [
 		'ID', 'SCOPEDID',
 		# Literals
@@ -88,6 +459,8 @@ class Lexer(object):
 		# scoping
 		#'PTR',
 		
+		# A whole expression, made by kaml.pratt rather than by the lexer
+		'EXPRESSION',
 	]
 	
 	literals = [
@@ -132,20 +505,33 @@ class Lexer(object):
 		('comment', 'exclusive')
 	)
 	
+	def _lex_error(self, t, message):
+		if self.diagnostics is None:
+			print(message)
+			return
+		
+		# Diagnostics mode: record it and carry on after the bad character
+		line, column = self.get_sourcemap().location(t.lexpos)
+		self.diagnostics.append(Diagnostic(
+			'lex', t.lexpos, line, column, self.lexer.lexstate,
+			'{}: illegal character {!r}'.format(message, t.value[0]), ()
+		))
+		t.lexer.skip(1)
+	
 	def t_error(self, t):
-		print("Error")
+		self._lex_error(t, "Error")
 	
 	def t_stringsg_stringdbl_error(self, t):
-		print("Error in String")
+		self._lex_error(t, "Error in String")
 	
 	def t_variablestring_error(self, t):
-		print("Error in var string")
+		self._lex_error(t, "Error in var string")
 	
 	def t_rawstr_error(self, t):
-		print("Error in rawstr")
+		self._lex_error(t, "Error in rawstr")
 		
 	def t_comment_error(self, t):
-		print("Error in comment")
+		self._lex_error(t, "Error in comment")
 	
 	def NL(self, t):
 		r'\n+'
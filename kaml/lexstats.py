@@ -0,0 +1,41 @@
+from __future__ import unicode_literals
+
+__all__ = ['LexerStats']
+
+class LexerStats(object):
+	""" What a Lexer created with stats = True has been doing.
+	
+	`rules` maps rule names (and 'literals') to [matches, seconds]; the time
+	of a match runs from the end of the previous one (or the start of the
+	token() call) and includes the regex search. `transitions` counts
+	(from, to) state changes.
+	"""
+	
+	def __init__(self):
+		self.rules = {}
+		self.transitions = {}
+		self.max_nesting = 0
+		self.max_depth = 0
+		self.mark = 0.0 # End of the last match
+		self.last = None # Token of the last match
+	
+	def transition(self, current, following, depth):
+		key = (current, following)
+		self.transitions[key] = self.transitions.get(key, 0) + 1
+		if depth > self.max_depth:
+			self.max_depth = depth
+	
+	def report(self):
+		lines = ['{:<40} {:>10} {:>12} {:>10}'.format('rule', 'matches', 'total ms', 'us/match')]
+		for name, (count, seconds) in sorted(self.rules.items(), key = lambda r: -r[1][1]):
+			if count:
+				lines.append('{:<40} {:>10} {:>12.3f} {:>10.3f}'.format(name, count, seconds * 1e3, seconds * 1e6 / count))
+		
+		lines.append('')
+		lines.append('{:<40} {:>10}'.format('transition', 'count'))
+		for (current, following), count in sorted(self.transitions.items(), key = lambda t: -t[1]):
+			lines.append('{:<40} {:>10}'.format('{} -> {}'.format(current, following), count))
+		
+		lines.append('')
+		lines.append('max nesting {}, max state depth {}'.format(self.max_nesting, self.max_depth))
+		return '\n'.join(lines)
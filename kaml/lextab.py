@@ -0,0 +1,11 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set((u'ADDEQ', u'AND', u'ANDEQ', u'BREAK', u'CONTINUE', u'DEF', u'DIVEQ', u'ELIF', u'ELSE', u'EQ', u'EXPRESSION', u'FALSE', u'FLOAT_LIT', u'FOR', u'GTE', u'ID', u'IF', u'INT_LIT', u'LTE', u'MODEQ', u'MULEQ', u'NE', u'OR', u'OREQ', u'RETURN', u'SCOPEDID', u'SET', u'SHL', u'SHLEQ', u'SHR', u'SHREQ', u'STRING_LIT', u'SUBEQ', u'TRUE', u'USE', u'WHILE', u'XOREQ', u'[', u']', u'{', u'}'))
+_lexreflags   = 32
+_lexliterals  = u'+-*/%=><~!^&|(){}[].?:;,#$\\'
+_lexstateinfo = {u'comment': u'exclusive', u'stringsg': u'exclusive', u'rawstr': u'exclusive', u'stringdbl': u'exclusive', 'INITIAL': 'inclusive', u'variablestring': u'exclusive'}
+_lexstatere   = {u'comment': [(u'(?P<t_comment_END>(?<!\\\\)\\*\\/)|(?P<t_comment_inner>[^\\*]+)', [None, (u't_comment_END', 'END'), (u't_comment_inner', 'inner')])], u'stringsg': [(u'(?P<t_stringsg_stringdbl_NL>\\n+)|(?P<t_stringsg_stringdbl_ESCAPE_CHAR>\\\\[0-9a-fA-F]{1, 6}(\\r\\n | [ \\n\\r\\t\\f])? | \\\\[^\\n\\r\\f0-9a-fA-F])|(?P<t_stringsg_stringdbl_SIMPLE_VAR>\\$[a-zA-Z_\\-][a-zA-Z_0-9\\-]*)|(?P<t_stringsg_stringdbl_VAR_STRING_START>\\{(?!\\{))|(?P<t_stringsg_stringdbl_VAR_STRING_START2>\\$\\{(?!\\{))|(?P<t_stringsg_STRING_END_Q>\\\')|(?P<t_stringsg_stringdbl_INNER>[^\\{\\}\\\'\\"\\$]+)|(?P<t_stringsg_stringdbl_ESCAPED_BRACES>(?:\\{\\{)|(?:\\}\\}))|(?P<t_stringsg_stringdbl_ESCAPED_DOLLAR>\\$(?=[^a-zA-Z_\\-]))', [None, (u't_stringsg_stringdbl_NL', 'NL'), (u't_stringsg_stringdbl_ESCAPE_CHAR', 'ESCAPE_CHAR'), None, (u't_stringsg_stringdbl_SIMPLE_VAR', 'SIMPLE_VAR'), (u't_stringsg_stringdbl_VAR_STRING_START', 'VAR_STRING_START'), (u't_stringsg_stringdbl_VAR_STRING_START2', 'VAR_STRING_START2'), (u't_stringsg_STRING_END_Q', 'STRING_END_Q'), (u't_stringsg_stringdbl_INNER', 'INNER'), (u't_stringsg_stringdbl_ESCAPED_BRACES', 'ESCAPED_BRACES'), (u't_stringsg_stringdbl_ESCAPED_DOLLAR', 'ESCAPED_DOLLAR')])], u'rawstr': [(u'(?P<t_rawstr_NL>\\n+)|(?P<t_rawstr_VAR_STRING_START2>\\$\\{(?!\\{))|(?P<t_rawstr_INNER>[^\\$\\}]+)|(?P<t_rawstr_dollar>\\$((?!\\{)|(\\{\\{)))|(?P<t_rawstr_INNER2>\\}(?!\\}\\}))|(?P<t_rawstr_ESCAPED_BRACE>(?:{{)|(?:}}(?!\\})))|(?P<t_rawstr_END>\\}\\}\\})', [None, (u't_rawstr_NL', 'NL'), (u't_rawstr_VAR_STRING_START2', 'VAR_STRING_START2'), (u't_rawstr_INNER', 'INNER'), (u't_rawstr_dollar', 'dollar'), None, None, (u't_rawstr_INNER2', 'INNER2'), (u't_rawstr_ESCAPED_BRACE', 'ESCAPED_BRACE'), (u't_rawstr_END', 'END')])], u'stringdbl': [(u'(?P<t_stringsg_stringdbl_NL>\\n+)|(?P<t_stringsg_stringdbl_ESCAPE_CHAR>\\\\[0-9a-fA-F]{1, 6}(\\r\\n | [ \\n\\r\\t\\f])? | \\\\[^\\n\\r\\f0-9a-fA-F])|(?P<t_stringsg_stringdbl_SIMPLE_VAR>\\$[a-zA-Z_\\-][a-zA-Z_0-9\\-]*)|(?P<t_stringsg_stringdbl_VAR_STRING_START>\\{(?!\\{))|(?P<t_stringsg_stringdbl_VAR_STRING_START2>\\$\\{(?!\\{))|(?P<t_stringdbl_STRING_END_Q>")|(?P<t_stringsg_stringdbl_INNER>[^\\{\\}\\\'\\"\\$]+)|(?P<t_stringsg_stringdbl_ESCAPED_BRACES>(?:\\{\\{)|(?:\\}\\}))|(?P<t_stringsg_stringdbl_ESCAPED_DOLLAR>\\$(?=[^a-zA-Z_\\-]))', [None, (u't_stringsg_stringdbl_NL', 'NL'), (u't_stringsg_stringdbl_ESCAPE_CHAR', 'ESCAPE_CHAR'), None, (u't_stringsg_stringdbl_SIMPLE_VAR', 'SIMPLE_VAR'), (u't_stringsg_stringdbl_VAR_STRING_START', 'VAR_STRING_START'), (u't_stringsg_stringdbl_VAR_STRING_START2', 'VAR_STRING_START2'), (u't_stringdbl_STRING_END_Q', 'STRING_END_Q'), (u't_stringsg_stringdbl_INNER', 'INNER'), (u't_stringsg_stringdbl_ESCAPED_BRACES', 'ESCAPED_BRACES'), (u't_stringsg_stringdbl_ESCAPED_DOLLAR', 'ESCAPED_DOLLAR')])], 'INITIAL': [(u'(?P<t_INITIAL_variablestring_SGCOMMENT>\\/\\/[^\\n]*(\\n|$))|(?P<t_INITIAL_variablestring_MLCOMMENT>\\/\\*)|(?P<t_INITIAL_variablestring_NL>\\s*\\n+\\s*)|(?P<t_INITIAL_variablestring_ID>-?[a-zA-Z_][a-zA-Z_0-9\\-]*)|(?P<t_INITIAL_variablestring_FLOAT_LIT>[0-9]+\\.[0-9]+)|(?P<t_INITIAL_variablestring_OCT_LIT>-?0[1-7]+)|(?P<t_INITIAL_variablestring_HEX_LIT>0x[0-9a-fA-F]+)|(?P<t_INITIAL_variablestring_INT_LIT>-?(0|[1-9][0-9]*))|(?P<t_INITIAL_variablestring_STRING_BEGIN>[\\\'"])|(?P<t_INITIAL_variablestring_RAWBLOCK_BEGIN>\\{\\{\\{)|(?P<t_INITIAL_variablestring_SCOPEDID>:-?[a-zA-Z_][a-zA-Z_0-9\\-]*)|(?P<t_INITIAL_variablestring_OR>\\|\\|)|(?P<t_INITIAL_variablestring_SHLEQ><<=)|(?P<t_INITIAL_variablestring_SHREQ>>>=)|(?P<t_INITIAL_variablestring_ADDEQ>\\+=)|(?P<t_INITIAL_variablestring_SUBEQ>\\-=)|(?P<t_INITIAL_variablestring_MULEQ>\\*=)|(?P<t_INITIAL_variablestring_OREQ>\\|=)|(?P<t_INITIAL_variablestring_SHR>>>)|(?P<t_INITIAL_variablestring_LTE><=)|(?P<t_INITIAL_variablestring_NE>!=)|(?P<t_INITIAL_variablestring_AND>&&)|(?P<t_INITIAL_variablestring_EQ>==)|(?P<t_INITIAL_variablestring_SHL><<)|(?P<t_INITIAL_variablestring_GTE>>=)|(?P<t_INITIAL_variablestring_MODEQ>%=)|(?P<t_INITIAL_variablestring_XOREQ>^=)|(?P<t_INITIAL_variablestring_DIVEQ>/=)|(?P<t_INITIAL_variablestring_ANDEQ>&=)', [None, (u't_INITIAL_variablestring_SGCOMMENT', 'SGCOMMENT'), None, (u't_INITIAL_variablestring_MLCOMMENT', 'MLCOMMENT'), (u't_INITIAL_variablestring_NL', 'NL'), (u't_INITIAL_variablestring_ID', 'ID'), (u't_INITIAL_variablestring_FLOAT_LIT', 'FLOAT_LIT'), (u't_INITIAL_variablestring_OCT_LIT', 'OCT_LIT'), (u't_INITIAL_variablestring_HEX_LIT', 'HEX_LIT'), (u't_INITIAL_variablestring_INT_LIT', 'INT_LIT'), None, (u't_INITIAL_variablestring_STRING_BEGIN', 'STRING_BEGIN'), (u't_INITIAL_variablestring_RAWBLOCK_BEGIN', 'RAWBLOCK_BEGIN'), (None, 'SCOPEDID'), (None, 'OR'), (None, 'SHLEQ'), (None, 'SHREQ'), (None, 'ADDEQ'), (None, 'SUBEQ'), (None, 'MULEQ'), (None, 'OREQ'), (None, 'SHR'), (None, 'LTE'), (None, 'NE'), (None, 'AND'), (None, 'EQ'), (None, 'SHL'), (None, 'GTE'), (None, 'MODEQ'), (None, 'XOREQ'), (None, 'DIVEQ'), (None, 'ANDEQ')])], u'variablestring': [(u'(?P<t_INITIAL_variablestring_SGCOMMENT>\\/\\/[^\\n]*(\\n|$))|(?P<t_INITIAL_variablestring_MLCOMMENT>\\/\\*)|(?P<t_INITIAL_variablestring_NL>\\s*\\n+\\s*)|(?P<t_INITIAL_variablestring_ID>-?[a-zA-Z_][a-zA-Z_0-9\\-]*)|(?P<t_INITIAL_variablestring_FLOAT_LIT>[0-9]+\\.[0-9]+)|(?P<t_INITIAL_variablestring_OCT_LIT>-?0[1-7]+)|(?P<t_INITIAL_variablestring_HEX_LIT>0x[0-9a-fA-F]+)|(?P<t_INITIAL_variablestring_INT_LIT>-?(0|[1-9][0-9]*))|(?P<t_INITIAL_variablestring_STRING_BEGIN>[\\\'"])|(?P<t_INITIAL_variablestring_RAWBLOCK_BEGIN>\\{\\{\\{)|(?P<t_variablestring_LBRACE>\\{)|(?P<t_variablestring_END>\\})|(?P<t_INITIAL_variablestring_SCOPEDID>:-?[a-zA-Z_][a-zA-Z_0-9\\-]*)|(?P<t_INITIAL_variablestring_OR>\\|\\|)|(?P<t_INITIAL_variablestring_SHLEQ><<=)|(?P<t_INITIAL_variablestring_SHREQ>>>=)|(?P<t_INITIAL_variablestring_ADDEQ>\\+=)|(?P<t_INITIAL_variablestring_SUBEQ>\\-=)|(?P<t_INITIAL_variablestring_MULEQ>\\*=)|(?P<t_INITIAL_variablestring_OREQ>\\|=)|(?P<t_INITIAL_variablestring_SHR>>>)|(?P<t_INITIAL_variablestring_LTE><=)|(?P<t_INITIAL_variablestring_NE>!=)|(?P<t_INITIAL_variablestring_AND>&&)|(?P<t_INITIAL_variablestring_EQ>==)|(?P<t_INITIAL_variablestring_SHL><<)|(?P<t_INITIAL_variablestring_GTE>>=)|(?P<t_INITIAL_variablestring_MODEQ>%=)|(?P<t_INITIAL_variablestring_XOREQ>^=)|(?P<t_INITIAL_variablestring_DIVEQ>/=)|(?P<t_INITIAL_variablestring_ANDEQ>&=)', [None, (u't_INITIAL_variablestring_SGCOMMENT', 'SGCOMMENT'), None, (u't_INITIAL_variablestring_MLCOMMENT', 'MLCOMMENT'), (u't_INITIAL_variablestring_NL', 'NL'), (u't_INITIAL_variablestring_ID', 'ID'), (u't_INITIAL_variablestring_FLOAT_LIT', 'FLOAT_LIT'), (u't_INITIAL_variablestring_OCT_LIT', 'OCT_LIT'), (u't_INITIAL_variablestring_HEX_LIT', 'HEX_LIT'), (u't_INITIAL_variablestring_INT_LIT', 'INT_LIT'), None, (u't_INITIAL_variablestring_STRING_BEGIN', 'STRING_BEGIN'), (u't_INITIAL_variablestring_RAWBLOCK_BEGIN', 'RAWBLOCK_BEGIN'), (u't_variablestring_LBRACE', 'LBRACE'), (u't_variablestring_END', 'END'), (None, 'SCOPEDID'), (None, 'OR'), (None, 'SHLEQ'), (None, 'SHREQ'), (None, 'ADDEQ'), (None, 'SUBEQ'), (None, 'MULEQ'), (None, 'OREQ'), (None, 'SHR'), (None, 'LTE'), (None, 'NE'), (None, 'AND'), (None, 'EQ'), (None, 'SHL'), (None, 'GTE'), (None, 'MODEQ'), (None, 'XOREQ'), (None, 'DIVEQ'), (None, 'ANDEQ')])]}
+_lexstateignore = {'comment': u'', 'stringsg': u'', 'rawstr': u'', 'stringdbl': u'', 'INITIAL': u'\t ', 'variablestring': u'\t '}
+_lexstateerrorf = {'comment': 't_comment_error', 'stringsg': 't_stringsg_stringdbl_error', 'rawstr': 't_rawstr_error', 'stringdbl': 't_stringsg_stringdbl_error', 'INITIAL': 't_error', 'variablestring': 't_variablestring_error'}
+_lexstateeoff = {}
+_lexsignature = '474b975ebe8c8a51490def2c74efc1394ce9c635'
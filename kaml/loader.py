@@ -0,0 +1,233 @@
+from __future__ import unicode_literals
+from collections import namedtuple
+import hashlib, io, multiprocessing, os
+
+from ply import lex
+
+from kaml import get_parser
+from kaml.astnodes import UseStmt
+from kaml.parser import ParseException
+
+__all__ = ['ImportCycle', 'Loader', 'LoaderError', 'Module', 'ModuleNotFound', 'import_path']
+
+class LoaderError(Exception):
+	""" A template that can't be loaded """
+
+class ModuleNotFound(LoaderError):
+	def __init__(self, name, importer):
+		self.name = name
+		self.importer = importer
+		super(ModuleNotFound, self).__init__('No module {} under the search roots, used by {}'.format(name, importer))
+
+class ImportCycle(LoaderError):
+	def __init__(self, cycle):
+		# The names of the modules, starting and ending with the same one
+		self.cycle = cycle
+		super(ImportCycle, self).__init__('-use cycle: {}'.format(' -> '.join(cycle)))
+
+class Module(namedtuple('Module', 'name path tree uses')):
+	""" A loaded template: its name, file and tree, and the names of the
+	modules that its -use statements import, in order.
+	"""
+	__slots__ = ()
+
+def import_path(use):
+	""" The names in the package path of the UseStmt `use`, and whether it ends in `*` """
+	parts = []
+	while isinstance(use, UseStmt):
+		parts.append(use.child)
+		use = use.root
+	parts.append(use)
+	parts.reverse()
+	return tuple(part for part in parts if part and part != '*'), parts[-1] == '*'
+
+# The parser of a loader's worker process
+_parser = None
+
+def _init_worker(lexer_class, cache):
+	global _parser
+	_parser = get_parser(lexer_class, cache)
+
+def _parse(source):
+	try:
+		return True, _parser.parse(source)
+	except (ParseException, lex.LexError) as e:
+		return False, '{}: {}'.format(e.__class__.__name__, e)
+
+class Loader(object):
+	""" Loads templates, and the modules they -use, from files under `roots`.
+	
+	`-use a:b;` and `-use a:b:*;` import the module a:b, the file a/b.kaml
+	under the first root that has it or, when none does, the module a that
+	b is in. Each module is parsed once, when it's first used, and again
+	only when its file changes: a new mtime or size has the file read, and
+	it's parsed again if its contents changed. The modules that a load has
+	to parse are parsed in `jobs` processes, a level of the -use graph at a
+	time.
+	"""
+	
+	suffix = '.kaml'
+	
+	def __init__(self, roots, jobs = 1, lexer_class = None, cache = None):
+		self.roots = [os.path.abspath(root) for root in roots]
+		self.jobs = jobs
+		self.lexer_class = lexer_class
+		self.parser = get_parser(lexer_class, cache)
+		# The modules loaded so far, by name
+		self.modules = {}
+		# The number of files parsed
+		self.parses = 0
+		# (mtime, size, sha1) of the file of each module, when it was read
+		self._stamps = {}
+	
+	def find(self, parts):
+		""" The name and file of the module of the package path `parts`, or None """
+		for n in range(len(parts), 0, -1):
+			for root in self.roots:
+				path = os.path.join(root, *parts[:n]) + self.suffix
+				if os.path.isfile(path):
+					return ':'.join(parts[:n]), path
+		return None
+	
+	def name(self, path):
+		""" The module name of the file at `path`, or the path if it isn't under a root """
+		path = os.path.abspath(path)
+		if path.endswith(self.suffix):
+			for root in self.roots:
+				relative = os.path.relpath(path[:-len(self.suffix)], root)
+				if not relative.startswith(os.pardir):
+					return ':'.join(relative.split(os.sep))
+		return path
+	
+	def load(self, path):
+		""" The Module of the template at `path`, with the modules it uses loaded """
+		path = os.path.abspath(path)
+		name = self.name(path)
+		self._load([(name, path)])
+		self.order(name)
+		return self.modules[name]
+	
+	def load_module(self, name):
+		""" The module `name`, like `-use name;` would import it """
+		found = self.find(tuple(name.split(':')))
+		if found is None:
+			raise ModuleNotFound(name, None)
+		self._load([found])
+		self.order(found[0])
+		return self.modules[found[0]]
+	
+	def order(self, name):
+		""" The modules that `name` uses, and theirs, each after the ones it
+		uses, and then `name` itself. Raises ImportCycle if one uses itself.
+		"""
+		order = []
+		done = set()
+		path = []
+		
+		def visit(name):
+			if name in done:
+				return
+			if name in path:
+				raise ImportCycle(path[path.index(name):] + [name])
+			path.append(name)
+			for used in self.modules[name].uses:
+				visit(used)
+			path.pop()
+			done.add(name)
+			order.append(self.modules[name])
+		
+		visit(name)
+		return order
+	
+	def graph(self):
+		""" The names of the modules that each loaded module uses """
+		return {name : module.uses for name, module in self.modules.items()}
+	
+	def _load(self, modules):
+		""" Load `modules`, (name, path) pairs, and what they use, one level at a time """
+		seen = set(name for name, _ in modules)
+		# The module that uses each one, None for the ones asked for
+		importers = {}
+		pool = None
+		try:
+			while modules:
+				changed = []
+				for name, path in modules:
+					try:
+						source, stamp = self._read(name, path)
+					except (IOError, OSError):
+						# Deleted since it was found
+						raise ModuleNotFound(name, importers.get(name))
+					if source is not None:
+						changed.append((name, path, source, stamp))
+				
+				if len(changed) > 1 and self.jobs > 1 and pool is None:
+					pool = multiprocessing.Pool(self.jobs, _init_worker, (self.lexer_class, self.parser.cache))
+				sources = [source for _, _, source, _ in changed]
+				results = pool.map(_parse, sources) if pool is not None else map(self._parse, sources)
+				
+				found = {}
+				for (name, path, _, stamp), (ok, tree) in zip(changed, results):
+					if not ok:
+						raise LoaderError('{}: {}'.format(path, tree))
+					self.parses += 1
+					self.modules[name] = Module(name, path, tree, self._uses(name, tree, found))
+					self._stamps[name] = stamp
+				
+				following = []
+				for name, _ in modules:
+					for used in self.modules[name].uses:
+						if used not in seen:
+							seen.add(used)
+							importers[used] = name
+							if used not in found:
+								# Used by a module that was loaded before
+								module = self.find(tuple(used.split(':')))
+								if module is None:
+									raise ModuleNotFound(used, name)
+								found[used] = module[1]
+							following.append((used, found[used]))
+				modules = following
+		finally:
+			if pool is not None:
+				pool.terminate()
+				pool.join()
+	
+	def _read(self, name, path):
+		""" The source of the module `name` and the stamp of its file, or None
+		for the source when the module is loaded from that file as it is now.
+		"""
+		stat = os.stat(path)
+		stamp = self._stamps.get(name)
+		loaded = name in self.modules and self.modules[name].path == path
+		if loaded and stamp[:2] == (stat.st_mtime, stat.st_size):
+			return None, stamp
+		
+		with io.open(path, encoding = 'utf-8') as fp:
+			source = fp.read()
+		digest = hashlib.sha1(source.encode('utf-8')).hexdigest()
+		if loaded and stamp[2] == digest:
+			# Touched, but the same
+			self._stamps[name] = (stat.st_mtime, stat.st_size, digest)
+			return None, stamp
+		return source, (stat.st_mtime, stat.st_size, digest)
+	
+	def _parse(self, source):
+		try:
+			return True, self.parser.parse(source)
+		except (ParseException, lex.LexError) as e:
+			return False, '{}: {}'.format(e.__class__.__name__, e)
+	
+	def _uses(self, name, tree, found):
+		""" The names of the modules that `tree` uses, with their files added to `found` """
+		uses = []
+		for item in getattr(tree, 'declarations', ()):
+			if isinstance(item, UseStmt):
+				parts, _ = import_path(item)
+				module = self.find(parts)
+				if module is None:
+					raise ModuleNotFound(':'.join(parts), name)
+				found[module[0]] = module[1]
+				if module[0] not in uses:
+					uses.append(module[0])
+		return tuple(uses)
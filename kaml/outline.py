@@ -0,0 +1,160 @@
+from __future__ import unicode_literals
+from collections import namedtuple
+
+from kaml.lexer import Lexer
+
+__all__ = ['Event', 'Signature', 'scan']
+
+class Event(namedtuple('Event', 'kind name offset signature')):
+	""" Something kaml.outline.scan found in a template.
+	
+	`kind` is 'use', 'def_start', 'def_end' or 'call'. `name` is the package
+	of a use, with its parts joined by ':', and the name of the function
+	otherwise. `offset` is where the -use, -def or called name starts, and
+	for def_end the offset after the body's `}`. `signature` is the Signature
+	of a def_start, and None for the others.
+	"""
+	__slots__ = ()
+
+class Signature(namedtuple('Signature', 'hash_arg dot_args kwargs positional')):
+	""" The parameters of a -def by name, as its ParamSeq has them: the #hash
+	parameter or None, and tuples of the .dot, [kwarg] and positional ones.
+	"""
+	__slots__ = ()
+
+OPEN = frozenset(['(', '[', '{'])
+CLOSE = frozenset([')', ']', '}'])
+
+def scan(source, lexer_class = None):
+	""" The outline of `source`: its uses, its functions with their
+	parameters, and the calls outside of them, as Events.
+	
+	Works from the tokens alone, without building a tree. Function bodies
+	are skipped brace by brace, and nothing is checked that isn't needed to
+	find the events, Parser.check finds the errors. A call is found at its
+	`(`, after any calls in its [kwargs].
+	"""
+	lexer = (lexer_class or Lexer)().lexer
+	lexer.input(source)
+	return _events(lexer.token)
+
+def _events(token):
+	# The name a `(` would call, and those of the `[` that are open
+	callee = None
+	brackets = []
+	# After a # or . of a call, whose ID is a parameter and not the callee
+	marker = False
+	
+	tok = token()
+	while tok is not None:
+		kind = tok.type
+		if kind == 'ID':
+			if not marker:
+				callee = (tok.value, tok.lexpos)
+			marker = False
+		elif kind == '(':
+			if callee is not None:
+				yield Event('call', callee[0], callee[1], None)
+			callee = None
+		elif kind == 'SCOPEDID':
+			if callee is not None:
+				callee = (callee[0] + tok.value, callee[1])
+		elif kind == '#' or kind == '.':
+			marker = True
+		elif kind == '[':
+			brackets.append(callee)
+			callee = None
+		elif kind == ']':
+			callee = brackets.pop() if brackets else None
+		elif kind == 'USE':
+			start = tok.lexpos
+			name, tok = _package(token)
+			yield Event('use', name, start, None)
+			callee = None
+			continue
+		elif kind == 'DEF':
+			for event in _function(tok, token):
+				yield event
+			callee = None
+		else:
+			callee = None
+		tok = token()
+
+def _package(token):
+	""" The name of the package after a -use, and the token after it """
+	parts = []
+	tok = token()
+	while tok is not None:
+		kind = tok.type
+		if kind == 'ID' or kind == '*':
+			parts.append(tok.value)
+		elif kind == 'SCOPEDID':
+			parts.append(tok.value[1:])
+		elif kind != ':':
+			break
+		tok = token()
+	return ':'.join(parts), tok
+
+def _function(tok, token):
+	""" The events of the -def at `tok`, up to the `}` of its body """
+	start = tok.lexpos
+	tok = token()
+	if tok is None or tok.type != 'ID':
+		return
+	name = tok.value
+	
+	hash_arg, dot_args, kwargs, positional = None, [], (), ()
+	tok = token()
+	while tok is not None and (tok.type == '#' or tok.type == '.'):
+		marker = tok.type
+		tok = token()
+		if tok is None or tok.type != 'ID':
+			break
+		if marker == '#':
+			hash_arg = tok.value
+		else:
+			dot_args.append(tok.value)
+		tok = token()
+	if tok is not None and tok.type == '[':
+		kwargs, tok = _names(token, ']')
+	if tok is not None and tok.type == '(':
+		positional, tok = _names(token, ')')
+	yield Event('def_start', name, start, Signature(hash_arg, tuple(dot_args), tuple(kwargs), tuple(positional)))
+	
+	if tok is None or tok.type != '{':
+		return
+	depth = 1
+	while depth:
+		tok = token()
+		if tok is None:
+			return
+		if tok.type == '{':
+			depth += 1
+		elif tok.type == '}':
+			depth -= 1
+	yield Event('def_end', name, tok.lexpos + 1, None)
+
+def _names(token, close):
+	""" The names of the parameters up to `close`, and the token after it """
+	names = []
+	depth = 0
+	# At the start of a parameter, where its name is
+	first = True
+	while True:
+		tok = token()
+		if tok is None:
+			return names, None
+		kind = tok.type
+		if depth == 0:
+			if kind == close:
+				return names, token()
+			if kind == ',':
+				first = True
+				continue
+			if first and kind == 'ID':
+				names.append(tok.value)
+		first = False
+		if kind in OPEN:
+			depth += 1
+		elif kind in CLOSE:
+			depth -= 1
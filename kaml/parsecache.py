@@ -0,0 +1,163 @@
+from __future__ import unicode_literals
+from collections import OrderedDict
+import errno, hashlib, os, tempfile, threading
+
+try:
+	import cPickle as pickle
+except ImportError:
+	import pickle
+
+from kaml import __version__
+
+__all__ = ['ParseCache']
+
+class ParseCache(object):
+	""" Parsed TranslationUnits, keyed by a hash of the source, the grammar and
+	the kaml version.
+	
+	Trees are stored pickled, so every hit returns a fresh copy that the
+	caller is free to change. The in-memory store drops the least recently
+	used trees once they take more than `max_bytes`. With `path`, trees are
+	also written to that directory and outlive the process.
+	"""
+	
+	suffix = '.kamlc'
+	
+	def __init__(self, max_bytes = 64 << 20, path = None):
+		self.max_bytes = max_bytes
+		self.path = path
+		self.nbytes = 0
+		self.hits = 0
+		self.disk_hits = 0
+		self.misses = 0
+		self.evictions = 0
+		self._entries = OrderedDict()
+		self._lock = threading.Lock()
+		
+		if path is not None and not os.path.isdir(path):
+			try:
+				os.makedirs(path)
+			except OSError as e:
+				if e.errno != errno.EEXIST:
+					raise
+	
+	def key(self, data, signature):
+		""" The key of source `data`, parsed with a grammar of `signature` """
+		if not isinstance(data, bytes):
+			data = data.encode('utf-8')
+		digest = hashlib.sha1('{}\n{}\n'.format(__version__, signature).encode('ascii'))
+		digest.update(data)
+		return digest.hexdigest()
+	
+	def get(self, key, default = None):
+		with self._lock:
+			blob = self._entries.pop(key, None)
+			if blob is not None:
+				self._entries[key] = blob
+		
+		from_disk = blob is None
+		if from_disk:
+			blob = self._read(key)
+			if blob is None:
+				with self._lock:
+					self.misses += 1
+				return default
+		
+		try:
+			tree = pickle.loads(blob)
+		except Exception:
+			# A file from a broken write or an incompatible kaml, parse again
+			self.discard(key)
+			with self._lock:
+				self.misses += 1
+			return default
+		
+		if from_disk:
+			self._store(key, blob)
+		with self._lock:
+			if from_disk:
+				self.disk_hits += 1
+			self.hits += 1
+		return tree
+	
+	def put(self, key, tree):
+		blob = pickle.dumps(tree, pickle.HIGHEST_PROTOCOL)
+		self._store(key, blob)
+		if self.path is not None:
+			self._write(key, blob)
+	
+	def discard(self, key):
+		with self._lock:
+			blob = self._entries.pop(key, None)
+			if blob is not None:
+				self.nbytes -= len(blob)
+		
+		if self.path is not None:
+			try:
+				os.remove(self._filename(key))
+			except OSError:
+				pass
+	
+	def clear(self):
+		""" Empty the in-memory store, files on disk are kept """
+		with self._lock:
+			self._entries.clear()
+			self.nbytes = 0
+	
+	def stats(self):
+		return {
+			'hits' : self.hits,
+			'disk_hits' : self.disk_hits,
+			'misses' : self.misses,
+			'evictions' : self.evictions,
+			'entries' : len(self._entries),
+			'bytes' : self.nbytes,
+		}
+	
+	def __len__(self):
+		return len(self._entries)
+	
+	def __contains__(self, key):
+		return key in self._entries
+	
+	def _store(self, key, blob):
+		if len(blob) > self.max_bytes:
+			return
+		
+		with self._lock:
+			old = self._entries.pop(key, None)
+			if old is not None:
+				self.nbytes -= len(old)
+			self._entries[key] = blob
+			self.nbytes += len(blob)
+			
+			while self.nbytes > self.max_bytes:
+				_, evicted = self._entries.popitem(last = False)
+				self.nbytes -= len(evicted)
+				self.evictions += 1
+	
+	def _filename(self, key):
+		return os.path.join(self.path, key + self.suffix)
+	
+	def _read(self, key):
+		if self.path is None:
+			return None
+		try:
+			with open(self._filename(key), 'rb') as fp:
+				return fp.read()
+		except (IOError, OSError):
+			return None
+	
+	def _write(self, key, blob):
+		""" Write to a temporary file and rename it, so readers never see half a tree """
+		fd, tmp = tempfile.mkstemp(suffix = '.tmp', dir = self.path)
+		try:
+			with os.fdopen(fd, 'wb') as fp:
+				fp.write(blob)
+			getattr(os, 'replace', os.rename)(tmp, self._filename(key))
+		except:
+			try:
+				os.remove(tmp)
+			except OSError:
+				pass
+			raise
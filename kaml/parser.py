@@ -1,39 +1,771 @@
 from __future__ import unicode_literals
-import itertools
+from collections import namedtuple
+from contextlib import contextmanager
+from functools import partial
+import hashlib, itertools, threading
 
-from ply import yacc
+import ply
+from ply import lex, yacc
 
+from kaml.diagnostics import Diagnostic
 from kaml.lexer import Lexer
 from kaml.astnodes import * 
+from kaml.astnodes import ASTNode
+
+def _append(seq, item):
+	""" `seq` + [`item`], in place when `seq` is already a list """
+	if isinstance(seq, list):
+		seq.append(item)
+		return seq
+	if isinstance(seq, tuple):
+		return list(seq) + [item]
+	return [seq, item]
+
+# Default for ParseCache.get, as None is a valid tree
+_missing = object()
+
+# Where a function body that a lazy parse skipped starts
+_LazyBody = namedtuple('_LazyBody', 'source start lineno')
+
+# Parsers for LazySuite bodies, by parser and lexer class and options
+_body_parsers = {}
+
+def parse_body(parser_class, lexer_class, options, source, start, lineno):
+	""" The Suite of a function body that a lazy parse skipped, parsed with
+	the `options` of the parser that skipped it
+	"""
+	key = (parser_class, lexer_class, options)
+	if key not in _body_parsers:
+		_body_parsers[key] = parser_class(lexer_class = lexer_class, **dict(options))
+	
+	with _body_parsers[key].context() as context:
+		return context.parse_body(source, start, lineno)
+
+def _spans(action, length):
+	""" `action`, followed by setting the offsets of the first and last token
+	of the production, of `length` symbols, on its symbol and on the node it
+	built.
+	
+	Does what yacc's `tracking` does, but only for the offsets, and with the
+	end of the last token rather than its start. ParseContext._parse_spans
+	does the same in its loop, these are for the parses that yacc's parser
+	still runs: in diagnostics mode, and with debug or tracking.
+	"""
+	if length == 0:
+		def reduce(p):
+			action(p)
+			result = p.slice[0]
+			result.lexpos = result.end = None
+		reduce.action = action
+		return reduce
+	
+	def reduce(p):
+		action(p)
+		symbols = p.slice
+		result = symbols[0]
+		first = symbols[1]
+		start = result.lexpos = first.lexpos
+		end = result.end = symbols[length].end
+		if start is None or end is None:
+			# Empty productions at either end
+			spans = [(sym.lexpos, sym.end) for sym in symbols[1:] if sym.lexpos is not None]
+			start, end = result.lexpos, result.end = (spans[0][0], spans[-1][1]) if spans else (None, None)
+		
+		# New nodes, and ones that the production added to in place
+		node = result.value
+		if node is first.value:
+			if length == 1 or not isinstance(node, ASTNode):
+				return
+		elif not isinstance(node, ASTNode) or node.start is not None:
+			return
+		node.start = start
+		node.end = end
+	reduce.action = action
+	return reduce
+
+def _pass(p):
+	""" The action of a production of one symbol that passes its value on """
+	result, symbol = p.slice
+	result.value = symbol.value
+
+def _forward(p):
+	""" The action of a production of one symbol that passes it on, span and all """
+	result, symbol = p.slice
+	result.value = symbol.value
+	result.lexpos = symbol.lexpos
+	result.end = symbol.end
+
+def _ends(token, lexer):
+	""" `token`, setting the offset after each token as its `end` """
+	def next_token():
+		tok = token()
+		if tok is not None:
+			tok.end = lexer.lexpos
+		return tok
+	return next_token
+
+def _region(token, lexer, end, after):
+	""" The tokens from `token` that start before `end`. The one after them
+	goes in `after`, with whether the lexer was between tokens at the top
+	level, rather than in a string or comment, when it started.
+	"""
+	while True:
+		between = lexer.lexstate == 'INITIAL' and not lexer.lexstatestack
+		tok = token()
+		if tok is None or tok.lexpos >= end:
+			after.append((tok, between))
+			return
+		yield tok
+
+def _common_prefix(a, b):
+	""" The length of the longest common prefix of `a` and `b` """
+	low, high = 0, min(len(a), len(b))
+	# Halve the part that's left, comparing slices is much faster than characters
+	while low < high:
+		mid = (low + high + 1) // 2
+		if a[low:mid] == b[low:mid]:
+			low = mid
+		else:
+			high = mid - 1
+	return low
+
+def _common_suffix(a, b, limit):
+	""" The length of the longest common suffix of `a` and `b`, up to `limit` """
+	low, high = 0, limit
+	while low < high:
+		mid = (low + high + 1) // 2
+		if a[len(a) - mid:len(a) - low] == b[len(b) - mid:len(b) - low]:
+			low = mid
+		else:
+			high = mid - 1
+	return low
+
+def _shift(node, delta, source, lines):
+	""" Move the tree `node` by `delta` characters and `lines` lines, into
+	`source`, that has it at its new offsets.
+	"""
+	# A node can be in the tree more than once, it's moved once
+	seen = set()
+	stack = [node]
+	pop, push, extend = stack.pop, stack.append, stack.extend
+	while stack:
+		node = pop()
+		if id(node) in seen:
+			continue
+		seen.add(id(node))
+		
+		if isinstance(node, ASTNode):
+			if node.start is not None:
+				node.start += delta
+				node.end += delta
+			if type(node) is LazySuite and node._body is not None:
+				# Parsed later, from the new source
+				parser_class, lexer_class, options, _, start, lineno = node._body
+				node._body = (parser_class, lexer_class, options, source, start + delta, lineno + lines)
+				continue
+			
+			for slot in node._fields:
+				value = getattr(node, slot, None)
+				# Most are names and numbers
+				if value is not None and not isinstance(value, basestring):
+					push(value)
+		elif isinstance(node, (list, tuple)):
+			extend(node)
+		elif isinstance(node, dict):
+			extend(node.values())
+		elif isinstance(node, Node):
+			extend(node.children)
 
 class ParseException(Exception):pass
 
+class _Resync(Exception):
+	""" Raised by recover() to start the parse again after an error """
+
+# The PLY versions whose LRParser.parse ParseContext._parse_spans follows. It
+# works on yacc's tables and stacks directly, with other versions _run leaves
+# the parse to yacc's parser.
+_PLY_VERSIONS = ('3.11',)
+
+class ParseContext(object):
+	""" The state of one parse: its lexer, the LR parser's stacks, and the
+	errors found so far. A Parser runs each parse in a context of its own, so
+	the same Parser can be used from several threads, or from inside a parse.
+	"""
+	# Whether _parse_spans can run with the PLY that's installed
+	spans_loop = ply.__version__ in _PLY_VERSIONS
+	
+	def __init__(self, lexer, tables, spans = True):
+		self.lexer = lexer
+		self.parser = yacc.LRParser(tables, self.error)
+		# For the p_ methods, that only have the LR parser
+		self.parser.context = self
+		# Whether the tables set spans, which needs the end of every token
+		self.spans = spans
+		self.diagnostics = None
+		self.unclosed = 0
+		# With Parser(pratt = True), an ExpressionParser and the LR states it takes over in
+		self.expressions = None
+		# For _parse_spans, made on its first parse
+		self.reductions = None
+	
+	def reset(self):
+		self.lexer.reset()
+		self.diagnostics = self.lexer.diagnostics = None
+		self.unclosed = 0
+	
+	def parse(self, data, debug = 0, tracking = 0, lazy = False):
+		if not (lazy or self.spans or self.expressions or self.diagnostics is not None):
+			return self.parser.parse(data, self.lexer.lexer, debug, tracking, None)
+		
+		lexer = self.lexer.lexer
+		lexer.input(data)
+		if debug or tracking:
+			return self.parser.parse(None, lexer, debug, tracking, self._tokens(lexer.token, lazy))
+		return self._run(self._tokens(lexer.token, lazy))
+	
+	def _run(self, token):
+		""" The LR parse of the tokens from `token` """
+		if self.diagnostics is not None:
+			# After each error, from the top level with the token after it
+			while True:
+				try:
+					return self.parser.parse(None, self.lexer.lexer, 0, 0, token)
+				except _Resync:
+					pass
+		if self.spans and self.spans_loop:
+			return self._parse_spans(token)
+		return self.parser.parse(None, self.lexer.lexer, 0, 0, token)
+	
+	def _parse_spans(self, token):
+		""" The LR parse of the tokens from `token`, as yacc's parser does it,
+		but setting the spans in the loop rather than in an action around each
+		p_ method, and passing on the value of one symbol productions without
+		calling anything. There's no error recovery: the first syntax error
+		goes to error(), that raises, as it does outside diagnostics mode. A p_
+		method that raises SyntaxError, where yacc's parser would start its
+		recovery, is a syntax error at the lookahead too.
+		
+		It follows LRParser.parse of the PLY versions in _PLY_VERSIONS.
+		"""
+		parser = self.parser
+		actions, goto, defaulted = parser.action, parser.goto, parser.defaulted_states
+		if self.reductions is None:
+			# The name, length and p_ method of each production, None for the ones _forward does
+			self.reductions = [(p.name, p.len, None if p.callable is _forward else getattr(p.callable, 'action', p.callable))
+				for p in parser.productions]
+		reductions = self.reductions
+		
+		p = yacc.YaccProduction(None)
+		p.lexer, p.parser = self.lexer.lexer, parser
+		eof = yacc.YaccSymbol()
+		eof.type = '$end'
+		statestack = parser.statestack = [0]
+		symstack = parser.symstack = p.stack = [eof]
+		state = 0
+		lookahead = None
+		try:
+			while True:
+				if state in defaulted:
+					t = defaulted[state]
+				else:
+					if lookahead is None:
+						lookahead = token() or eof
+					t = actions[state].get(lookahead.type)
+					if t is None:
+						# An error at the end of the input gives up, as yacc's parser does
+						parser.state = state
+						self.error(lookahead if lookahead is not eof else None)
+						return None
+				
+				if t > 0:
+					statestack.append(t)
+					state = t
+					symstack.append(lookahead)
+					lookahead = None
+					continue
+				if t == 0:
+					return symstack[-1].value
+				
+				name, length, action = reductions[-t]
+				sym = yacc.YaccSymbol()
+				sym.type = name
+				if action is None:
+					first = symstack[-1]
+					sym.value, sym.lexpos, sym.end = first.value, first.lexpos, first.end
+					symstack[-1] = sym
+					statestack.pop()
+				elif length:
+					sym.value = None
+					symbols = symstack[-length - 1:]
+					symbols[0] = sym
+					del symstack[-length:]
+					p.slice = symbols
+					action(p)
+					del statestack[-length:]
+					symstack.append(sym)
+					
+					first = symbols[1]
+					start = sym.lexpos = first.lexpos
+					end = sym.end = symbols[length].end
+					if start is None or end is None:
+						# Empty productions at either end
+						spans = [(s.lexpos, s.end) for s in symbols[1:] if s.lexpos is not None]
+						start, end = sym.lexpos, sym.end = (spans[0][0], spans[-1][1]) if spans else (None, None)
+					
+					# New nodes, and ones that the production added to in place
+					node = sym.value
+					if isinstance(node, ASTNode) and (node.start is None if node is not first.value else length > 1):
+						node.start = start
+						node.end = end
+				else:
+					sym.value = sym.lexpos = sym.end = None
+					p.slice = [sym]
+					action(p)
+					symstack.append(sym)
+				state = goto[statestack[-1]][name]
+				statestack.append(state)
+		except SyntaxError:
+			if lookahead is None:
+				lookahead = token() or eof
+			parser.state = state
+			self.error(lookahead if lookahead is not eof else None)
+			return None
+	
+	def parse_region(self, source, start, end, lazy = False):
+		""" The top level items of `source` from `start` up to `end`, both
+		offsets where an item starts or ends.
+		
+		Returns _missing when the tokens there aren't the ones a parse of all
+		of `source` has, like when the region opens a comment or string that
+		runs on past `end`, or ends in the middle of an item.
+		"""
+		lexer = self.lexer.lexer
+		lexer.input(source)
+		lexer.lexpos = start
+		lexer.lineno = source.count('\n', 0, start) + 1
+		after = []
+		tokens = partial(next, _region(lexer.token, lexer, end, after), None)
+		tree = self._run(self._tokens(tokens, lazy))
+		
+		tok, between = after[0] if after else (None, False)
+		if not between or (tok.lexpos != end if tok is not None else end != len(source)):
+			return _missing
+		if isinstance(tree, TranslationUnit):
+			return list(tree.declarations)
+		return [] if isinstance(tree, EmptyNode) else _missing
+	
+	def _tokens(self, token, lazy):
+		""" `token` with the filters this parse needs on top """
+		lexer = self.lexer.lexer
+		if self.spans or self.expressions:
+			token = _ends(token, lexer)
+		if lazy:
+			token = partial(next, self._skip_bodies(token, lexer.lexdata), None)
+		if self.expressions is not None:
+			token = partial(next, self._expressions(token), None)
+		return token
+	
+	def parse_body(self, source, start, lineno):
+		""" Parse the function body whose `{` is at `start` in `source` """
+		lexer = self.lexer.lexer
+		lexer.input(source)
+		lexer.lexpos = start
+		lexer.lineno = lineno
+		token = lexer.token
+		if self.spans:
+			token = _ends(token, lexer)
+		tokens = self._body(token, start, lineno)
+		tree = self._run(partial(next, tokens, None))
+		return tree.declarations[0].suite
+	
+	def _skip_bodies(self, token, source):
+		""" The tokens of a lazy parse. Each function body is matched up to its
+		`}` but only its braces are passed on, the `{` with the body's position
+		as its value.
+		"""
+		in_decl = False
+		while True:
+			tok = token()
+			if tok is None:
+				return
+			
+			if tok.type == 'DEF':
+				in_decl = True
+			elif tok.type == '{' and in_decl:
+				in_decl = False
+				depth = 1
+				while depth:
+					end = token()
+					if end is None:
+						# Unclosed, the parser reports it at the end of input
+						yield tok
+						return
+					if end.type == '{':
+						depth += 1
+					elif end.type == '}':
+						depth -= 1
+				
+				tok.value = _LazyBody(source, tok.lexpos, tok.lineno)
+				yield tok
+				yield end
+				continue
+			
+			yield tok
+	
+	def _expressions(self, token):
+		""" The tokens for the LR parser, with each expression that starts where
+		nothing else can parsed by the ExpressionParser into one EXPRESSION token.
+		"""
+		from kaml.pratt import ExpressionError
+		
+		pratt, entries = self.expressions
+		parser = self.parser
+		starts = pratt.starts
+		after = None
+		while True:
+			if after is not None:
+				tok, after = after, None
+			else:
+				tok = token()
+				if tok is None:
+					return
+			
+			# The parser asks for a token in the state on top of its stack
+			comma = entries.get(parser.statestack[-1])
+			if comma is None or tok.type not in starts:
+				yield tok
+				continue
+			
+			try:
+				node, after = pratt.parse(tok, token, comma)
+			except ExpressionError:
+				# The LR parser takes these, and reports the error if there is one
+				for tok in pratt.consumed:
+					if tok is None:
+						return
+					yield tok
+				continue
+			
+			expr = lex.LexToken()
+			expr.type, expr.value, expr.lexpos, expr.lineno = 'EXPRESSION', node, tok.lexpos, tok.lineno
+			expr.end = pratt.end
+			yield expr
+			if after is None:
+				return
+	
+	def _body(self, token, start, lineno):
+		""" The tokens of `-def _` and then of one function body """
+		for kind, value in (('DEF', '-def'), ('ID', '_')):
+			tok = lex.LexToken()
+			tok.type, tok.value, tok.lexpos, tok.lineno, tok.end = kind, value, start, lineno, start
+			yield tok
+		
+		depth = 0
+		while True:
+			tok = token()
+			if tok is None:
+				return
+			yield tok
+			
+			if tok.type == '{':
+				depth += 1
+			elif tok.type == '}':
+				depth -= 1
+				if depth == 0:
+					return
+	
+	def error(self, p):
+		if self.diagnostics is not None:
+			return self.recover(p)
+		
+		if p is not None:
+			loc = self.lexer.get_sourcemap().location(p.lexpos)
+			print('Parser Error[{}:{}]: {}'.format(loc[0], loc[1], p))
+			raise ParseException('Parser Error[{}:{}]: {}'.format(loc[0], loc[1], p))
+		else:
+			print("Parser Error, inserting ';'")
+			# Just guess, and hope that the error occurred in a statement
+			return ';'
+	
+	def invalid(self, offset, message):
+		""" An error in what the grammar accepts, that a p_ method found at
+		`offset`. Raises a ParseException as error() does, or in diagnostics
+		mode records it and lets the parse go on.
+		"""
+		line, column = self.lexer.get_sourcemap().location(offset)
+		if self.diagnostics is None:
+			print('Parser Error[{}:{}]: {}'.format(line, column, message))
+			raise ParseException('Parser Error[{}:{}]: {}'.format(line, column, message))
+		self.diagnostics.append(Diagnostic('parse', offset, line, column, self.parser.statestack[-1], message, ()))
+	
+	def recover(self, p):
+		""" error() in diagnostics mode: record the error, skip to a `;` or `}`,
+		and have _run start the parse again at the top level with the token
+		after that. The `}` of blocks that were open on the stack are expected
+		to turn up later.
+		
+		PLY's own recovery would drop the stack too, but then doesn't report
+		the errors in the next few tokens.
+		"""
+		parser = self.parser
+		
+		if p is not None and p.type == '}' and self.unclosed:
+			self.unclosed -= 1
+			raise _Resync()
+		
+		offset = p.lexpos if p is not None else len(self.lexer.lexer.lexdata or '')
+		line, column = self.lexer.get_sourcemap().location(offset)
+		if p is None:
+			message = 'unexpected end of input'
+		else:
+			message = 'unexpected {} {!r}'.format(p.type, p.value)
+		self.diagnostics.append(Diagnostic(
+			'parse', offset, line, column, parser.state, message,
+			tuple(sorted(t for t in parser.action[parser.state] if t != 'EXPRESSION'))
+		))
+		
+		# The stack is dropped after this, and restarts empty
+		self.unclosed += len([s for s in parser.symstack if s.type == '{'])
+		depth = 0
+		while p is not None:
+			if p.type == '{':
+				depth += 1
+			elif p.type == '}':
+				depth -= 1
+				if depth < 0:
+					# Closed one of the blocks on the stack
+					self.unclosed = max(self.unclosed - 1, 0)
+				if depth <= 0:
+					break
+			elif p.type == ';' and depth == 0:
+				break
+			p = parser.token()
+		# At the end of the input the parse ends, there's nothing to start again with
+		if p is not None:
+			raise _Resync()
+
 class Parser(object):
 	
+	# LR automata built so far, shared by all the instances of a class. The
+	# tables are read from kaml/parsetab.py, and built in memory when the
+	# grammar's signature doesn't match it. write_parsetab updates the file.
+	_automata = {}
+	# Signatures of the grammar, by parser and lexer class
+	_signatures = {}
+	
 	def __init__(self, *args, **kwargs):
-		self.lexer = Lexer()
+		self.lexer_class = kwargs.pop('lexer_class', Lexer)
+		self.cache = kwargs.pop('cache', None)
+		# Parse function bodies only when they are first used
+		self.lazy = kwargs.pop('lazy', False)
+		# Parse expressions with kaml.pratt instead of the LR tables
+		self.pratt = kwargs.pop('pratt', False)
+		# Share the subtrees that are the same, in one tree and across trees,
+		# with a kaml.interning.Interner of its own or the one given
+		intern = kwargs.pop('intern', False)
+		# Set the start and end offsets of the nodes
+		self.spans = kwargs.pop('spans', not intern)
+		if intern and self.spans:
+			raise ValueError('Shared nodes are at more than one place, intern needs spans = False')
+		# What a LazySuite's body is parsed with, as this parser would have
+		self._body_options = (('pratt', self.pratt), ('spans', self.spans))
+		self.interner = None
+		if intern:
+			from kaml.interning import Interner
+			self.interner = intern if isinstance(intern, Interner) else Interner()
+		self.lexer = self.lexer_class()
 		self.tokens = self.lexer.tokens
 		
-		self.parser = yacc.yacc(module = self, *args, **kwargs)
+		if args or kwargs:
+			automaton = yacc.yacc(module = self, *args, **kwargs)
+		else:
+			key = (self.__class__, tuple(self.tokens))
+			if key not in Parser._automata:
+				Parser._automata[key] = yacc.yacc(module = self, debug = False, write_tables = False)
+			automaton = Parser._automata[key]
+		self.tables = self._bind(automaton)
+		self.parser = yacc.LRParser(self.tables, self.p_error)
+		if self.pratt:
+			from kaml.pratt import expression_entries
+			self._entries = expression_entries(self.tables)
+		
+		# Contexts that aren't in use, the first one parses with self.lexer
+		self._contexts = [self._new_context(self.lexer)]
+		self._lock = threading.Lock()
+	
+	def _new_context(self, lexer):
+		context = ParseContext(lexer, self.tables, self.spans)
+		if self.pratt:
+			from kaml.pratt import ExpressionParser
+			context.expressions = (ExpressionParser(self.precedence), self._entries)
+		return context
+	
+	def _bind(self, automaton):
+		""" Tables that share the LR automaton of `automaton`, but call this instance's p_ methods """
+		lr = yacc.LRTable()
+		lr.lr_action = automaton.action
+		lr.lr_goto = automaton.goto
+		lr.lr_productions = [
+			yacc.MiniProduction(p.str, p.name, p.len, p.func, p.file, p.line)
+			for p in automaton.productions
+		]
+		lr.bind_callables({p.func : getattr(self, p.func) for p in lr.lr_productions if p.func})
+		
+		# One action can have productions of different lengths
+		actions = {}
+		for p in lr.lr_productions:
+			if p.len == 1 and p.name in self.passthrough:
+				# Most reductions are these, they don't need to call the p_ method
+				p.callable = _forward if self.spans else _pass
+			elif p.func and self.spans:
+				if (p.func, p.len) not in actions:
+					actions[p.func, p.len] = _spans(p.callable, p.len)
+				p.callable = actions[p.func, p.len]
+		return lr
+	
+	@contextmanager
+	def context(self):
+		""" A ParseContext that no other parse is using """
+		with self._lock:
+			context = self._contexts.pop() if self._contexts else None
+		if context is None:
+			context = self._new_context(self.lexer_class())
+		
+		try:
+			yield context
+		finally:
+			context.reset()
+			with self._lock:
+				self._contexts.append(context)
+	
+	def write_parsetab(self):
+		""" Write kaml/parsetab.py again if the grammar changed, at build time like Lexer.write_lextab """
+		yacc.yacc(module = self, debug = False)
+	
+	def signature(self):
+		""" Hash of the grammar and the lexer rules, everything a parse result depends on """
+		key = (self.__class__, self.lexer_class)
+		if key not in Parser._signatures:
+			pinfo = yacc.ParserReflect({k : getattr(self, k) for k in dir(self)})
+			pinfo.get_all()
+			grammar = '{}\n{}'.format(pinfo.signature(), self.lexer.signature())
+			Parser._signatures[key] = hashlib.sha1(grammar.encode('utf-8')).hexdigest()
+		return Parser._signatures[key]
 	
 	def parse(self, data, debug = 0, tracking = 0):
 		if not data:
 			return []
 		
-		return self.parser.parse(data, self.lexer.lexer, debug, tracking, None)
+		key = None
+		if self.cache is not None and not debug and not tracking:
+			# Trees without spans, with lazy bodies or with shared nodes aren't
+			# what a parser without those options should get
+			options = [name for name, on in (('nospans', not self.spans), ('lazy', self.lazy),
+				('intern', self.interner is not None)) if on]
+			key = self.cache.key(data, ':'.join([self.signature()] + options))
+			tree = self.cache.get(key, _missing)
+			if tree is not _missing:
+				return self._intern(tree)
+		
+		with self.context() as context:
+			tree = context.parse(data, debug, tracking, self.lazy)
+		
+		tree = self._intern(tree)
+		if key is not None:
+			self.cache.put(key, tree)
+		return tree
+	
+	def _intern(self, tree):
+		return tree if self.interner is None else self.interner.intern(tree)
+	
+	def reparse(self, tree, old, new):
+		""" The tree of `new`, an edit of `old` whose tree is `tree`.
+		
+		Only the top level items the edit touches are parsed again, the others
+		are reused, moved to their offsets in `new`. They move out of `tree`,
+		which isn't valid after this. Falls back to a full parse where that
+		can't be done, like when the edit opens a comment that runs to the end.
+		"""
+		items = getattr(tree, 'declarations', None)
+		if not (self.spans and items and new) or items[0].start is None:
+			return self.parse(new)
+		if old == new:
+			return tree
+		
+		prefix = _common_prefix(old, new)
+		suffix = _common_suffix(old, new, min(len(old), len(new)) - prefix)
+		delta = len(new) - len(old)
+		
+		# Items before the edit are kept, but for the last one, that what comes
+		# after it can still add to, like an -if that gains an -else
+		first = 0
+		while first < len(items) and items[first].end <= prefix:
+			first += 1
+		first = max(first - 1, 0)
+		last = first
+		while last < len(items) and items[last].start < len(old) - suffix:
+			last += 1
+		
+		start = items[first - 1].end if first else 0
+		end = items[last].start + delta if last < len(items) else len(new)
+		with self.context() as context:
+			changed = context.parse_region(new, start, end, self.lazy)
+		if changed is _missing:
+			return self.parse(new)
+		
+		lines = new.count('\n', start, end) - old.count('\n', start, end - delta)
+		if delta or lines:
+			for item in items[last:]:
+				_shift(item, delta, new, lines)
+		
+		items = items[:first] + changed + items[last:]
+		if not items:
+			return EmptyNode()
+		result = TranslationUnit(*items)
+		result.start, result.end = items[0].start, items[-1].end
+		return result
+	
+	def parse_parallel(self, data, workers = None):
+		""" The tree of `data`, parsed in `workers` processes, see kaml.batch.parse_parallel """
+		if not data:
+			return []
+		from kaml.batch import parse_parallel
+		return self._intern(parse_parallel(self, data, workers))
+	
+	def check(self, data):
+		""" Every lexer and parser error in `data`, as Diagnostics.
+		
+		After an error the parser skips to the next `;` or `}` and carries on
+		from the top level, so one pass finds all the errors in a file.
+		"""
+		with self.context() as context:
+			context.diagnostics = context.lexer.diagnostics = []
+			context.parse(data)
+			return sorted(context.diagnostics, key = lambda d: d.offset)
 	
 	
 	start = 'translation-unit'
+	
+	# Nonterminals whose productions of one symbol only pass its value on,
+	# their actions are replaced by _pass or _forward
+	passthrough = frozenset('''
+		top-level-block-item package-import function-body parameter-decl
+		hash-param-opt kwarg-param-opt statement literal primary-expression
+		postfix-expression unary-expression multiplicative-expression
+		additive-expression shift-expression relational-expression
+		equality-expression and-expression xor-expression or-expression
+		and-test or-test conditional-expression assignment-expression
+		expression expression-list
+	'''.split())
 	precedence = (
 		('left', ','),
 		('right', '?', ':', '=', 'ADDEQ', 'SUBEQ', 'MULEQ', 'DIVEQ', 'MODEQ', 'SHLEQ', 'SHREQ', 'ANDEQ', 'XOREQ', 'OREQ'),
-		('left', 'OR'),
+		('right', 'OR'),
 		('left', 'AND'),
 		('left', '|'),
 		('left', '^'),
 		('left', '&'),
-		('left', 'EQ'),
-		('left', 'NE'),
+		('left', 'EQ', 'NE'),
 		('left', '<', 'LTE', '>', 'GTE'),
 		('left', 'SHL', 'SHR'),
 		('left', '-', '+'),
@@ -54,14 +786,8 @@ class Parser(object):
 		return list_thing
 	
 	def p_error(self, p):
-		if p is not None:
-			loc = self.lexer._make_tok_location(p)
-			print('Parser Error[{}:{}]: {}'.format(loc[0], loc[1], p))
-			raise ParseException('Parser Error[{}:{}]: {}'.format(loc[0], loc[1], p))
-		else:
-			print("Parser Error, inserting ';'")
-			# Just guess, and hope that the error occurred in a statement
-			return ';'
+		# Only used by self.parser, parses run in a ParseContext that handles their errors
+		raise ParseException('Parser Error: {}'.format(p))
 	
 	def p_translation_unit(self, p):
 		''' translation-unit : 
@@ -80,7 +806,8 @@ class Parser(object):
 		if len(p) == 2:
 			p[0] = [p[1]]
 		else:
-			p[0] = p[1] + [p[2]]
+			p[1].append(p[2])
+			p[0] = p[1]
 	
 	def p_top_level_block_item(self, p):
 		''' top-level-block-item : use-statement
@@ -104,9 +831,13 @@ class Parser(object):
 	def p_package_import(self, p):
 		''' package-import : ID 
 		                   | package-import ':' ID
+		                   | package-import SCOPEDID
 		'''
 		if len(p) == 2:
 			p[0] = p[1]
+		elif len(p) == 3:
+			# The lexer makes `:name` one token
+			p[0] = UseStmt(p[1], p[2][1:])
 		else:
 			p[0] = UseStmt(p[1], p[3])
 		
@@ -193,7 +924,11 @@ class Parser(object):
 		'''
 		s = ParamSeq() if not isinstance(p[0], ParamSeq) else p[0]
 		
-		s += VariableDecl(p[1], p[2])
+		decl = VariableDecl(p[1], p[2])
+		if self.spans:
+			# _spans only sets the node of the whole production
+			decl.start, decl.end = p.slice[1].lexpos, p.slice[2].end or p.slice[1].end
+		s += decl
 		
 		if len(p) == 5:
 			s += p[4]
@@ -235,7 +970,10 @@ class Parser(object):
 		                       | '{' '}'
 		'''
 		if len(p) == 3:
-			p[0] = Suite([])
+			if isinstance(p[1], _LazyBody):
+				p[0] = LazySuite((self.__class__, self.lexer_class, self._body_options) + p[1])
+			else:
+				p[0] = Suite([])
 		else:
 			p[0] = Suite(p[2])
 	
@@ -246,7 +984,8 @@ class Parser(object):
 		if len(p) == 2:
 			p[0] = Suite(p[1])
 		else:
-			p[0] = p[1] + p[2]
+			p[1].suite.append(p[2])
+			p[0] = p[1]
 	
 	def p_statement(self, p):
 		''' statement : expression-statement
@@ -262,7 +1001,17 @@ class Parser(object):
 	def p_set_statement(self, p):
 		''' set-statement : SET assignment-expression ';'
 		'''
-		p[0] = SetStmt(p[2])
+		assign = p[2]
+		if not isinstance(assign, Assign) or not isinstance(assign.lhs, basestring):
+			p.parser.context.invalid(p.lexpos(1), '-set needs a name and a value, not {!r}'.format(assign))
+			return
+		
+		# -set a += 1 is -set a = a + 1
+		if assign.op == '=':
+			value = assign.rhs
+		else:
+			value = BinaryOp(assign.lhs, assign.op[:-1], assign.rhs)
+		p[0] = SetStmt(assign.lhs, value)
 	
 	def p_loop_statement(self, p):
 		''' loop-statement : for-loop
@@ -278,7 +1027,7 @@ class Parser(object):
 	def p_while_loop(self, p):
 		''' while-loop : WHILE '(' expression ')' compound-statement
 		'''
-		p[0] = WhileStmt(p[2], p[4])
+		p[0] = WhileStmt(p[3], p[5])
 	
 	def p_expression_statement(self, p):
 		''' expression-statement : expression ';'
@@ -385,28 +1134,25 @@ class Parser(object):
 		
 		if lp == 2:
 			p[0] = p[1]
+		elif lp == 3:
+			p[0] = GetAttr(p[1], p[2])
+		elif lp == 4:  # '(' expression ')'
+			p[0] = p[2]
 		elif lp == 5:
-			ast_note_type = {
-				'{' : GetItem,
-				'(' : FuncCall
-			}[p[2]]
-			
-			p[0] = ast_note_type(p[1], p[3])
-		
-		elif lp == 4:
-			if p[1] == '(':  # '(' expression ')'
-				p[0] = p[2]
-			else:
-				p[0] = GetAttr(p[1], p[3])
-		
+			p[0] = GetItem(p[1], p[3])
 		else:
-			raise Exception('Unknown structure for postfix expression {!r}, {}'.format(p, len(p)))
+			args = p[6] if isinstance(p[6], list) else [p[6]]
+			if p[2] or p[3] or p[4]:
+				p[0] = TagCall(p[1], args, p[2].name if p[2] else None, tuple(decl.name for decl in p[3]),
+					p[4].kwargs if p[4] else {})
+			else:
+				p[0] = FuncCall(p[1], args)
 		
 	def p_expression_list_opt(self, p):
 		''' expression-list-opt : expression-list
 		                        |
 		'''
-		p[0] = p[1]
+		p[0] = p[1] if len(p) > 1 else []
 	
 	def p_expression_list(self, p):
 		''' expression-list : assignment-expression
@@ -416,10 +1162,7 @@ class Parser(object):
 			p[0] = p[1]
 		
 		else:
-			if isinstance(p[1], (list, tuple)):
-				p[0] = list(p[1]) + [p[3]]
-			else:
-				p[0] = [p[1], p[3]]
+			p[0] = _append(p[1], p[3])
 	
 	# TODO: test this right recursion
 	def p_unary_expression(self, p):
@@ -545,12 +1288,13 @@ class Parser(object):
 		if len(p) == 2:
 			p[0] = p[1]
 		else:
-			p[0] = Node('ternary', (p[1], p[3], [5]))
+			p[0] = Node('ternary', (p[1], p[3], p[5]))
 	
 	# TODO: test this right recursion
 	def p_assignment_expression(self, p):
 		''' assignment-expression : conditional-expression
 		                          | or-test assignment-operator assignment-expression
+		                          | EXPRESSION
 		'''
 		if len(p) == 2:
 			p[0] = p[1]
@@ -580,12 +1324,13 @@ class Parser(object):
 		if len(p) == 2:
 			p[0] = p[1]
 		else:
-			if isinstance(p[1], (tuple, list)):
-				p[0] = list(p[1]) + [p[3]]
-			else:
-				p[0] = [p[1], p[3]]
+			p[0] = _append(p[1], p[3])
 	
 	def p_conditional_expr_list(self, p):
 		''' conditional-expr-list : conditional-expression
 		                          | conditional-expr-list ',' conditional-expression
 		'''
+		if len(p) == 2:
+			p[0] = p[1]
+		else:
+			p[0] = _append(p[1], p[3])
@@ -0,0 +1,165 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = u"translation-unitleft,right?:=ADDEQSUBEQMULEQDIVEQMODEQSHLEQSHREQANDEQXOREQOREQrightORleftANDleft|left^left&leftEQNEleft<LTE>GTEleftSHLSHRleft-+left*/%rightUMINUSleft.#ADDEQ AND ANDEQ BREAK CONTINUE DEF DIVEQ ELIF ELSE EQ EXPRESSION FALSE FLOAT_LIT FOR GTE ID IF INT_LIT LTE MODEQ MULEQ NE OR OREQ RETURN SCOPEDID SET SHL SHLEQ SHR SHREQ STRING_LIT SUBEQ TRUE USE WHILE XOREQ translation-unit : \n\t\t                     | top-level-block-items\n\t\t\n\t\t top-level-block-items : top-level-block-item\n\t\t                   | top-level-block-items top-level-block-item\n\t\t top-level-block-item : use-statement\n\t\t                         | function-definition\n\t\t                         | statement\n\t\t use-statement : USE package-import ';'\n\t\t                  | USE package-import ':' '*' ';'\n\t\t package-import : ID \n\t\t                   | package-import ':' ID\n\t\t                   | package-import SCOPEDID\n\t\t function-definition : function-decl function-body\n\t\t function-decl : DEF ID hash-param-opt dot-param-opt kwarg-param-opt positional-params-opt\n\t\t positional-params-opt : \n\t\t                          | '(' parameter-decl-seq ')'\n\t\t function-body : compound-statement \n\t\t kwarg-param-opt :\n\t\t                    | kwarg-param-decl\n\t\t hash-param-opt :\n\t\t                    | hash-param-decl\n\t\t dot-param-opt :\n\t\t                    | dot-param-decl dot-param-opt\n\t\t parameter-decl-seq :\n\t\t                       | parameter-decl-list\n\t\t parameter-decl-list : parameter-decl optional-assign\n\t\t                        | parameter-decl optional-assign ',' parameter-decl-seq\n\t\t kwarg-param-decl : '[' parameter-decl-seq ']'\n\t\t hash-param-decl : '#' ID\n\t\t dot-param-decl : '.' ID\n\t\t parameter-decl : ID\n\t\t\n\t\toptional-assign :\n\t\t                | '=' assignment-expression\n\t\t compound-statement : '{' statement-seq '}' \n\t\t                       | '{' '}'\n\t\t statement-seq : statement\n\t\t                  | statement-seq statement\n\t\t statement : expression-statement\n\t\t              | compound-statement\n\t\t              | selection-statement\n\t\t              | jump-statement\n\t\t              | declaration-statement\n\t\t              | loop-statement\n\t\t              | set-statement\n\t\t set-statement : SET assignment-expression ';'\n\t\t loop-statement : for-loop\n\t\t                   | while-loop\n\t\t for-loop : FOR '(' expression-list ')' compound-statement \n\t\t while-loop : WHILE '(' expression ')' compound-statement\n\t\t expression-statement : expression ';'\n\t\t jump-statement : RETURN expression ';'\n\t\t                   | RETURN ';'\n\t\t                   | BREAK ';'\n\t\t                   | CONTINUE ';'\n\t\t selection-statement : IF '(' expression ')' compound-statement selection-statement-tail\n\t\t selection-statement-tail : ELIF '(' expression ')' compound-statement selection-statement-tail\n\t\t                             | ELSE compound-statement\n\t\t                             |\n\t\t declaration-statement : block-declaration\n\t\t block-declaration : ID '=' assignment-expression ';'\n\t\t literal : integer-literal\n\t\t            | floating-literal\n\t\t            | string-literal\n\t\t            | boolean-literal\n\t\t integer-literal : INT_LIT\n\t\t floating-literal : FLOAT_LIT string-literal : STRING_LIT \n\t\t                   | string-literal STRING_LIT\n\t\t boolean-literal : TRUE\n\t\t                    | FALSE\n\t\t\n\t\tprimary-expression : literal\n\t\t                   | ID\n\t\t\n\t\tpostfix-expression : primary-expression\n\t\t                   | postfix-expression '[' conditional-expr-list  ']'\n\t\t                   | postfix-expression hash-param-opt dot-param-opt kwarg-param-opt '(' expression-list-opt ')'\n\t\t                   | postfix-expression SCOPEDID\n\t\t                   | '(' expression ')'\n\t\t expression-list-opt : expression-list\n\t\t                        |\n\t\t expression-list : assignment-expression\n\t\t                    | expression-list ',' assignment-expression\n\t\t unary-expression : postfix-expression\n\t\t                     | unary-operator unary-expression %prec UMINUS\n\t\t unary-operator : '+'\n\t\t                   | '-'\n\t\t                   | '!'\n\t\t                   | '~'\n\t\t multiplicative-expression : unary-expression\n\t\t                              | multiplicative-expression '*' unary-expression\n\t\t                              | multiplicative-expression '/' unary-expression\n\t\t                              | multiplicative-expression '%' unary-expression\n\t\t additive-expression : multiplicative-expression\n\t\t                        | additive-expression '+' multiplicative-expression\n\t\t                        | additive-expression '-' multiplicative-expression \n\t\t shift-expression : additive-expression\n\t\t                     | shift-expression SHL additive-expression\n\t\t                     | shift-expression SHR additive-expression   \n\t\t relational-expression : shift-expression\n\t\t                          | relational-expression '<' shift-expression\n\t\t                          | relational-expression '>' shift-expression\n\t\t                          | relational-expression LTE shift-expression\n\t\t                          | relational-expression GTE shift-expression\n\t\t equality-expression : relational-expression\n\t\t                        | equality-expression EQ relational-expression\n\t\t                        | equality-expression NE relational-expression\n\t\t and-expression : equality-expression\n\t\t                   | and-expression '&' equality-expression\n\t\t xor-expression : and-expression\n\t\t                   | xor-expression '^' and-expression \n\t\t or-expression : xor-expression\n\t\t                  | or-expression '|' xor-expression \n\t\t and-test : or-expression\n\t\t             | and-test AND or-expression\n\t\t or-test : and-test\n\t\t            | and-test OR or-test\n\t\t conditional-expression : or-test\n\t\t                           | or-test '?' expression ':' assignment-expression\n\t\t assignment-expression : conditional-expression\n\t\t                          | or-test assignment-operator assignment-expression\n\t\t                          | EXPRESSION\n\t\t assignment-operator : '='\n\t\t                        | MULEQ\n\t\t                        | DIVEQ\n\t\t                        | MODEQ\n\t\t                        | ADDEQ\n\t\t                        | SUBEQ\n\t\t                        | ANDEQ\n\t\t                        | XOREQ\n\t\t                        | OREQ\n\t\t                        | SHLEQ\n\t\t                        | SHREQ\n\t\t expression : assignment-expression\n\t\t           | expression ',' assignment-expression\n\t\t conditional-expr-list : conditional-expression\n\t\t                          | conditional-expr-list ',' conditional-expression\n\t\t"
+    
+_lr_action_items = {u'USE':([0,3,8,10,18,20,22,23,28,35,38,39,40,44,59,60,82,85,92,95,96,107,111,112,131,138,148,152,179,182,190,191,192,202,208,213,214,],[48,-38,48,-41,-3,-43,-39,-59,-40,-7,-5,-42,-47,-46,-44,-6,-4,-52,-54,-35,-50,-53,-13,-17,-51,-34,-45,-8,-60,-48,-49,-9,-58,-55,-57,-58,-56,]),u'RETURN':([0,3,8,10,18,20,22,23,25,28,35,38,39,40,44,59,60,82,85,92,93,94,95,96,107,111,112,131,137,138,148,152,179,182,190,191,192,202,208,213,214,],[12,-38,12,-41,-3,-43,-39,-59,12,-40,-7,-5,-42,-47,-46,-44,-6,-4,-52,-54,12,-36,-35,-50,-53,-13,-17,-51,-37,-34,-45,-8,-60,-48,-49,-9,-58,-55,-57,-58,-56,]),u'SHREQ':([1,2,6,7,9,11,14,16,27,30,32,33,37,41,42,43,45,51,54,55,56,57,58,61,66,81,87,99,122,123,124,125,126,129,130,132,133,149,150,155,156,158,159,160,161,162,163,174,204,],[-103,-69,71,-63,-106,-65,-95,-62,-82,-61,-88,-71,-64,-110,-70,-112,-66,-114,-67,-72,-98,-108,-92,-73,-72,-68,-83,-76,-102,-101,-99,-100,-77,-104,-105,-94,-93,-109,-111,-113,-115,-97,-96,-107,-91,-89,-90,-74,-75,]),u'MODEQ':([1,2,6,7,9,11,14,16,27,30,32,33,37,41,42,43,45,51,54,55,56,57,58,61,66,81,87,99,122,123,124,125,126,129,130,132,133,149,150,155,156,158,159,160,161,162,163,174,204,],[-103,-69,75,-63,-106,-65,-95,-62,-82,-61,-88,-71,-64,-110,-70,-112,-66,-114,-67,-72,-98,-108,-92,-73,-72,-68,-83,-76,-102,-101,-99,-100,-77,-104,-105,-94,-93,-109,-111,-113,-115,-97,-96,-107,-91,-89,-90,-74,-75,]),'|':([1,2,7,9,11,14,16,27,30,32,33,37,41,42,43,45,54,55,56,57,58,61,66,81,87,99,122,123,124,125,126,129,130,132,133,149,150,155,158,159,160,161,162,163,174,204,],[-103,-69,-63,-106,-65,-95,-62,-82,-61,-88,-71,-64,-110,-70,106,-66,-67,-72,-98,-108,-92,-73,-72,-68,-83,-76,-102,-101,-99,-100,-77,-104,-105,-94,-93,-109,-111,106,-97,-96,-107,-91,-89,-90,-74,-75,]),u'ELIF':([95,138,192,213,],[-35,-34,200,200,]),',':([1,2,6,7,9,11,14,16,19,26,27,30,32,33,34,36,37,41,42,43,45,51,54,55,56,57,58,61,66,67,81,86,87,99,122,123,124,125,126,127,128,129,130,132,133,135,136,139,144,145,146,147,149,150,154,155,156,158,159,160,161,162,163,174,180,183,185,187,189,195,197,204,206,211,],[-103,-69,-116,-63,-106,-65,-95,-62,-132,97,-82,-61,-88,-71,-118,-120,-64,-110,-70,-112,-66,-114,-67,-72,-98,-108,-92,-73,-72,97,-68,97,-83,-76,-102,-101,-99,-100,-77,-119,97,-104,-105,-94,-93,-80,167,-133,173,-116,-134,97,-109,-111,97,-113,-115,-97,-96,-107,-91,-89,-90,-74,-117,-81,-32,-31,-135,167,205,-75,-33,97,]),u'SUBEQ':([1,2,6,7,9,11,14,16,27,30,32,33,37,41,42,43,45,51,54,55,56,57,58,61,66,81,87,99,122,123,124,125,126,129,130,132,133,149,150,155,156,158,159,160,161,162,163,174,204,],[-103,-69,76,-63,-106,-65,-95,-62,-82,-61,-88,-71,-64,-110,-70,-112,-66,-114,-67,-72,-98,-108,-92,-73,-72,-68,-83,-76,-102,-101,-99,-100,-77,-104,-105,-94,-93,-109,-111,-113,-115,-97,-96,-107,-91,-89,-90,-74,-75,]),u'WHILE':([0,3,8,10,18,20,22,23,25,28,35,38,39,40,44,59,60,82,85,92,93,94,95,96,107,111,112,131,137,138,148,152,179,182,190,191,192,202,208,213,214,],[29,-38,29,-41,-3,-43,-39,-59,29,-40,-7,-5,-42,-47,-46,-44,-6,-4,-52,-54,29,-36,-35,-50,-53,-13,-17,-51,-37,-34,-45,-8,-60,-48,-49,-9,-58,-55,-57,-58,-56,]),u'TRUE':([0,3,5,8,10,12,13,17,18,20,22,23,25,28,31,35,38,39,40,44,47,52,53,59,60,62,63,64,65,68,69,70,71,72,73,74,75,76,77,78,79,80,82,83,84,85,88,89,91,92,93,94,95,96,97,102,103,105,106,107,110,111,112,113,114,115,116,117,118,119,120,121,131,137,138,148,152,164,167,173,179,182,184,190,191,192,198,202,207,208,213,214,],[2,-38,2,2,-41,2,2,-84,-3,-43,-39,-59,2,-40,2,-7,-5,-42,-47,-46,-87,-85,-86,-44,-6,2,2,2,2,-127,-123,-128,-131,2,-121,-130,-124,-126,-122,-125,-129,2,-4,2,2,-52,2,2,2,-54,2,-36,-35,-50,2,2,2,2,2,-53,2,-13,-17,2,2,2,2,2,2,2,2,2,-51,-37,-34,-45,-8,2,2,2,-60,-48,2,-49,-9,-58,2,-55,2,-57,-58,-56,]),u'DEF':([0,3,8,10,18,20,22,23,28,35,38,39,40,44,59,60,82,85,92,95,96,107,111,112,131,138,148,152,179,182,190,191,192,202,208,213,214,],[15,-38,15,-41,-3,-43,-39,-59,-40,-7,-5,-42,-47,-46,-44,-6,-4,-52,-54,-35,-50,-53,-13,-17,-51,-34,-45,-8,-60,-48,-49,-9,-58,-55,-57,-58,-56,]),'!':([0,3,5,8,10,12,13,17,18,20,22,23,25,28,31,35,38,39,40,44,47,52,53,59,60,62,63,64,65,68,69,70,71,72,73,74,75,76,77,78,79,80,82,83,84,85,88,89,91,92,93,94,95,96,97,102,103,105,106,107,110,111,112,113,114,115,116,117,118,119,120,121,131,137,138,148,152,164,167,173,179,182,184,190,191,192,198,202,207,208,213,214,],[53,-38,53,53,-41,53,53,-84,-3,-43,-39,-59,53,-40,53,-7,-5,-42,-47,-46,-87,-85,-86,-44,-6,53,53,53,53,-127,-123,-128,-131,53,-121,-130,-124,-126,-122,-125,-129,53,-4,53,53,-52,53,53,53,-54,53,-36,-35,-50,53,53,53,53,53,-53,53,-13,-17,53,53,53,53,53,53,53,53,53,-51,-37,-34,-45,-8,53,53,53,-60,-48,53,-49,-9,-58,53,-55,53,-57,-58,-56,]),'#':([2,7,11,16,27,30,33,37,42,45,54,55,61,66,81,90,99,126,174,204,],[-69,-63,-65,-62,98,-61,-71,-64,-70,-66,-67,-72,-73,-72,-68,98,-76,-77,-74,-75,]),u'SET':([0,3,8,10,18,20,22,23,25,28,35,38,39,40,44,59,60,82,85,92,93,94,95,96,107,111,112,131,137,138,148,152,179,182,190,191,192,202,208,213,214,],[31,-38,31,-41,-3,-43,-39,-59,31,-40,-7,-5,-42,-47,-46,-44,-6,-4,-52,-54,31,-36,-35,-50,-53,-13,-17,-51,-37,-34,-45,-8,-60,-48,-49,-9,-58,-55,-57,-58,-56,]),u'XOREQ':([1,2,6,7,9,11,14,16,27,30,32,33,37,41,42,43,45,51,54,55,56,57,58,61,66,81,87,99,122,123,124,125,126,129,130,132,133,149,150,155,156,158,159,160,161,162,163,174,204,],[-103,-69,70,-63,-106,-65,-95,-62,-82,-61,-88,-71,-64,-110,-70,-112,-66,-114,-67,-72,-98,-108,-92,-73,-72,-68,-83,-76,-102,-101,-99,-100,-77,-104,-105,-94,-93,-109,-111,-113,-115,-97,-96,-107,-91,-89,-90,-74,-75,]),'&':([1,2,7,9,11,14,16,27,30,32,33,37,42,45,54,55,56,57,58,61,66,81,87,99,122,123,124,125,126,129,130,132,133,149,158,159,160,161,162,163,174,204,],[-103,-69,-63,-106,-65,-95,-62,-82,-61,-88,-71,-64,-70,-66,-67,-72,-98,118,-92,-73,-72,-68,-83,-76,-102,-101,-99,-100,-77,-104,-105,-94,-93,118,-97,-96,-107,-91,-89,-90,-74,-75,]),')':([1,2,6,7,9,11,14,16,19,27,30,32,33,34,36,37,41,42,43,45,51,54,56,57,58,61,66,67,81,87,99,122,123,124,125,126,127,129,130,132,133,135,136,139,147,149,150,154,155,156,158,159,160,161,162,163,174,180,183,184,185,186,187,193,195,196,197,203,204,205,206,210,211,],[-103,-69,-116,-63,-106,-65,-95,-62,-132,-82,-61,-88,-71,-118,-120,-64,-110,-70,-112,-66,-114,-67,-98,-108,-92,-73,-72,126,-68,-83,-76,-102,-101,-99,-100,-77,-119,-104,-105,-94,-93,-80,166,-133,175,-109,-111,178,-113,-115,-97,-96,-107,-91,-89,-90,-74,-117,-81,-79,-32,-25,-31,-24,-78,204,-26,209,-75,-24,-33,-27,212,]),'(':([0,2,3,5,7,8,10,11,12,13,16,17,18,20,21,22,23,25,27,28,29,30,31,33,35,37,38,39,40,42,44,45,47,49,52,53,54,55,59,60,61,62,63,64,65,66,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,88,89,90,91,92,93,94,95,96,97,99,100,101,102,103,105,106,107,110,111,112,113,114,115,116,117,118,119,120,121,126,131,134,137,138,140,141,142,148,152,164,165,167,168,169,171,172,173,174,179,181,182,184,190,191,192,198,199,200,202,204,207,208,213,214,],[5,-69,-38,5,-63,5,-41,-65,5,5,-62,-84,-3,-43,91,-39,-59,5,-20,-40,103,-61,5,-71,-7,-64,-5,-42,-47,-70,-46,-66,-87,110,-85,-86,-67,-72,-44,-6,-73,5,5,5,5,-72,-127,-123,-128,-131,5,-121,-130,-124,-126,-122,-125,-129,5,-68,-4,5,5,-52,5,5,-20,5,-54,5,-36,-35,-50,5,-76,-22,-21,5,5,5,5,-53,5,-13,-17,5,5,5,5,5,5,5,5,5,-77,-51,-22,-37,-34,-29,-18,-22,-45,-8,5,-18,5,-19,184,-23,-30,5,-74,-60,193,-48,5,-49,-9,-58,5,-28,207,-55,-75,5,-57,-58,-56,]),'+':([0,2,3,5,7,8,10,11,12,13,14,16,17,18,20,22,23,25,27,28,30,31,32,33,35,37,38,39,40,42,44,45,47,52,53,54,55,58,59,60,61,62,63,64,65,66,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,87,88,89,91,92,93,94,95,96,97,99,102,103,105,106,107,110,111,112,113,114,115,116,117,118,119,120,121,126,131,132,133,137,138,148,152,158,159,161,162,163,164,167,173,174,179,182,184,190,191,192,198,202,204,207,208,213,214,],[17,-69,-38,17,-63,17,-41,-65,17,17,89,-62,-84,-3,-43,-39,-59,17,-82,-40,-61,17,-88,-71,-7,-64,-5,-42,-47,-70,-46,-66,-87,-85,-86,-67,-72,-92,-44,-6,-73,17,17,17,17,-72,-127,-123,-128,-131,17,-121,-130,-124,-126,-122,-125,-129,17,-68,-4,17,17,-52,-83,17,17,17,-54,17,-36,-35,-50,17,-76,17,17,17,17,-53,17,-13,-17,17,17,17,17,17,17,17,17,17,-77,-51,-94,-93,-37,-34,-45,-8,89,89,-91,-89,-90,17,17,17,-74,-60,-48,17,-49,-9,-58,17,-55,-75,17,-57,-58,-56,]),'*':([2,7,11,16,27,30,32,33,37,42,45,54,55,58,61,66,81,87,99,126,132,133,153,161,162,163,174,204,],[-69,-63,-65,-62,-82,-61,-88,-71,-64,-70,-66,-67,-72,120,-73,-72,-68,-83,-76,-77,120,120,176,-91,-89,-90,-74,-75,]),'-':([0,2,3,5,7,8,10,11,12,13,14,16,17,18,20,22,23,25,27,28,30,31,32,33,35,37,38,39,40,42,44,45,47,52,53,54,55,58,59,60,61,62,63,64,65,66,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,87,88,89,91,92,93,94,95,96,97,99,102,103,105,106,107,110,111,112,113,114,115,116,117,118,119,120,121,126,131,132,133,137,138,148,152,158,159,161,162,163,164,167,173,174,179,182,184,190,191,192,198,202,204,207,208,213,214,],[52,-69,-38,52,-63,52,-41,-65,52,52,88,-62,-84,-3,-43,-39,-59,52,-82,-40,-61,52,-88,-71,-7,-64,-5,-42,-47,-70,-46,-66,-87,-85,-86,-67,-72,-92,-44,-6,-73,52,52,52,52,-72,-127,-123,-128,-131,52,-121,-130,-124,-126,-122,-125,-129,52,-68,-4,52,52,-52,-83,52,52,52,-54,52,-36,-35,-50,52,-76,52,52,52,52,-53,52,-13,-17,52,52,52,52,52,52,52,52,52,-77,-51,-94,-93,-37,-34,-45,-8,88,88,-91,-89,-90,52,52,52,-74,-60,-48,52,-49,-9,-58,52,-55,-75,52,-57,-58,-56,]),u'NE':([1,2,7,9,11,14,16,27,30,32,33,37,42,45,54,55,56,58,61,66,81,87,99,122,123,124,125,126,129,130,132,133,158,159,160,161,162,163,174,204,],[-103,-69,-63,84,-65,-95,-62,-82,-61,-88,-71,-64,-70,-66,-67,-72,-98,-92,-73,-72,-68,-83,-76,-102,-101,-99,-100,-77,-104,-105,-94,-93,-97,-96,84,-91,-89,-90,-74,-75,]),'/':([2,7,11,16,27,30,32,33,37,42,45,54,55,58,61,66,81,87,99,126,132,133,161,162,163,174,204,],[-69,-63,-65,-62,-82,-61,-88,-71,-64,-70,-66,-67,-72,121,-73,-72,-68,-83,-76,-77,121,121,-91,-89,-90,-74,-75,]),'.':([2,7,11,16,27,30,33,37,42,45,54,55,61,66,81,90,99,100,101,126,134,140,142,172,174,204,],[-69,-63,-65,-62,-20,-61,-71,-64,-70,-66,-67,-72,-73,-72,-68,-20,-76,143,-21,-77,143,-29,143,-30,-74,-75,]),u'MULEQ':([1,2,6,7,9,11,14,16,27,30,32,33,37,41,42,43,45,51,54,55,56,57,58,61,66,81,87,99,122,123,124,125,126,129,130,132,133,149,150,155,156,158,159,160,161,162,163,174,204,],[-103,-69,77,-63,-106,-65,-95,-62,-82,-61,-88,-71,-64,-110,-70,-112,-66,-114,-67,-72,-98,-108,-92,-73,-72,-68,-83,-76,-102,-101,-99,-100,-77,-104,-105,-94,-93,-109,-111,-113,-115,-97,-96,-107,-91,-89,-90,-74,-75,]),u'ADDEQ':([1,2,6,7,9,11,14,16,27,30,32,33,37,41,42,43,45,51,54,55,56,57,58,61,66,81,87,99,122,123,124,125,126,129,130,132,133,149,150,155,156,158,159,160,161,162,163,174,204,],[-103,-69,78,-63,-106,-65,-95,-62,-82,-61,-88,-71,-64,-110,-70,-112,-66,-114,-67,-72,-98,-108,-92,-73,-72,-68,-83,-76,-102,-101,-99,-100,-77,-104,-105,-94,-93,-109,-111,-113,-115,-97,-96,-107,-91,-89,-90,-74,-75,]),u'SHL':([2,7,11,14,16,27,30,32,33,37,42,45,54,55,56,58,61,66,81,87,99,122,123,124,125,126,132,133,158,159,161,162,163,174,204,],[-69,-63,-65,-95,-62,-82,-61,-88,-71,-64,-70,-66,-67,-72,117,-92,-73,-72,-68,-83,-76,117,117,117,117,-77,-94,-93,-97,-96,-91,-89,-90,-74,-75,]),';':([1,2,6,7,9,11,12,14,16,19,24,26,27,30,32,33,34,36,37,41,42,43,45,46,51,54,55,56,57,58,61,66,81,86,87,99,104,108,109,122,123,124,125,126,127,129,130,132,133,139,149,150,151,155,156,157,158,159,160,161,162,163,174,176,177,180,204,],[-103,-69,-116,-63,-106,-65,85,-95,-62,-132,92,96,-82,-61,-88,-71,-118,-120,-64,-110,-70,-112,-66,107,-114,-67,-72,-98,-108,-92,-73,-72,-68,131,-83,-76,148,152,-10,-102,-101,-99,-100,-77,-119,-104,-105,-94,-93,-133,-109,-111,-12,-113,-115,179,-97,-96,-107,-91,-89,-90,-74,191,-11,-117,-75,]),':':([1,2,6,7,9,11,14,16,19,27,30,32,33,34,36,37,41,42,43,45,51,54,56,57,58,61,66,81,87,99,108,109,122,123,124,125,126,127,128,129,130,132,133,139,149,150,151,155,156,158,159,160,161,162,163,174,177,180,204,],[-103,-69,-116,-63,-106,-65,-95,-62,-132,-82,-61,-88,-71,-118,-120,-64,-110,-70,-112,-66,-114,-67,-98,-108,-92,-73,-72,-68,-83,-76,153,-10,-102,-101,-99,-100,-77,-119,164,-104,-105,-94,-93,-133,-109,-111,-12,-113,-115,-97,-96,-107,-91,-89,-90,-74,-11,-117,-75,]),u'EXPRESSION':([0,3,5,8,10,12,18,20,22,23,25,28,31,35,38,39,40,44,59,60,68,69,70,71,72,73,74,75,76,77,78,79,80,82,85,91,92,93,94,95,96,97,103,107,110,111,112,115,131,137,138,148,152,164,167,179,182,184,190,191,192,198,202,207,208,213,214,],[36,-38,36,36,-41,36,-3,-43,-39,-59,36,-40,36,-7,-5,-42,-47,-46,-44,-6,-127,-123,-128,-131,36,-121,-130,-124,-126,-122,-125,-129,36,-4,-52,36,-54,36,-36,-35,-50,36,36,-53,36,-13,-17,36,-51,-37,-34,-45,-8,36,36,-60,-48,36,-49,-9,-58,36,-55,36,-57,-58,-56,]),u'OREQ':([1,2,6,7,9,11,14,16,27,30,32,33,37,41,42,43,45,51,54,55,56,57,58,61,66,81,87,99,122,123,124,125,126,129,130,132,133,149,150,155,156,158,159,160,161,162,163,174,204,],[-103,-69,79,-63,-106,-65,-95,-62,-82,-61,-88,-71,-64,-110,-70,-112,-66,-114,-67,-72,-98,-108,-92,-73,-72,-68,-83,-76,-102,-101,-99,-100,-77,-104,-105,-94,-93,-109,-111,-113,-115,-97,-96,-107,-91,-89,-90,-74,-75,]),u'DIVEQ':([1,2,6,7,9,11,14,16,27,30,32,33,37,41,42,43,45,51,54,55,56,57,58,61,66,81,87,99,122,123,124,125,126,129,130,132,133,149,150,155,156,158,159,160,161,162,163,174,204,],[-103,-69,69,-63,-106,-65,-95,-62,-82,-61,-88,-71,-64,-110,-70,-112,-66,-114,-67,-72,-98,-108,-92,-73,-72,-68,-83,-76,-102,-101,-99,-100,-77,-104,-105,-94,-93,-109,-111,-113,-115,-97,-96,-107,-91,-89,-90,-74,-75,]),'$end':([0,3,4,8,10,18,20,22,23,28,35,38,39,40,44,59,60,82,85,92,95,96,107,111,112,131,138,148,152,179,182,190,191,192,202,208,213,214,],[-1,-38,0,-2,-41,-3,-43,-39,-59,-40,-7,-5,-42,-47,-46,-44,-6,-4,-52,-54,-35,-50,-53,-13,-17,-51,-34,-45,-8,-60,-48,-49,-9,-58,-55,-57,-58,-56,]),u'SHR':([2,7,11,14,16,27,30,32,33,37,42,45,54,55,56,58,61,66,81,87,99,122,123,124,125,126,132,133,158,159,161,162,163,174,204,],[-69,-63,-65,-95,-62,-82,-61,-88,-71,-64,-70,-66,-67,-72,116,-92,-73,-72,-68,-83,-76,116,116,116,116,-77,-94,-93,-97,-96,-91,-89,-90,-74,-75,]),u'GTE':([1,2,7,11,14,16,27,30,32,33,37,42,45,54,55,56,58,61,66,81,87,99,122,123,124,125,126,129,130,132,133,158,159,161,162,163,174,204,],[62,-69,-63,-65,-95,-62,-82,-61,-88,-71,-64,-70,-66,-67,-72,-98,-92,-73,-72,-68,-83,-76,-102,-101,-99,-100,-77,62,62,-94,-93,-97,-96,-91,-89,-90,-74,-75,]),u'FOR':([0,3,8,10,18,20,22,23,25,28,35,38,39,40,44,59,60,82,85,92,93,94,95,96,107,111,112,131,137,138,148,152,179,182,190,191,192,202,208,213,214,],[21,-38,21,-41,-3,-43,-39,-59,21,-40,-7,-5,-42,-47,-46,-44,-6,-4,-52,-54,21,-36,-35,-50,-53,-13,-17,-51,-37,-34,-45,-8,-60,-48,-49,-9,-58,-55,-57,-58,-56,]),u'EQ':([1,2,7,9,11,14,16,27,30,32,33,37,42,45,54,55,56,58,61,66,81,87,99,122,123,124,125,126,129,130,132,133,158,159,160,161,162,163,174,204,],[-103,-69,-63,83,-65,-95,-62,-82,-61,-88,-71,-64,-70,-66,-67,-72,-98,-92,-73,-72,-68,-83,-76,-102,-101,-99,-100,-77,-104,-105,-94,-93,-97,-96,83,-91,-89,-90,-74,-75,]),u'SHLEQ':([1,2,6,7,9,11,14,16,27,30,32,33,37,41,42,43,45,51,54,55,56,57,58,61,66,81,87,99,122,123,124,125,126,129,130,132,133,149,150,155,156,158,159,160,161,162,163,174,204,],[-103,-69,74,-63,-106,-65,-95,-62,-82,-61,-88,-71,-64,-110,-70,-112,-66,-114,-67,-72,-98,-108,-92,-73,-72,-68,-83,-76,-102,-101,-99,-100,-77,-104,-105,-94,-93,-109,-111,-113,-115,-97,-96,-107,-91,-89,-90,-74,-75,]),u'ELSE':([95,138,192,213,],[-35,-34,201,201,]),u'ANDEQ':([1,2,6,7,9,11,14,16,27,30,32,33,37,41,42,43,45,51,54,55,56,57,58,61,66,81,87,99,122,123,124,125,126,129,130,132,133,149,150,155,156,158,159,160,161,162,163,174,204,],[-103,-69,68,-63,-106,-65,-95,-62,-82,-61,-88,-71,-64,-110,-70,-112,-66,-114,-67,-72,-98,-108,-92,-73,-72,-68,-83,-76,-102,-101,-99,-100,-77,-104,-105,-94,-93,-109,-111,-113,-115,-97,-96,-107,-91,-89,-90,-74,-75,]),u'LTE':([1,2,7,11,14,16,27,30,32,33,37,42,45,54,55,56,58,61,66,81,87,99,122,123,124,125,126,129,130,132,133,158,159,161,162,163,174,204,],[63,-69,-63,-65,-95,-62,-82,-61,-88,-71,-64,-70,-66,-67,-72,-98,-92,-73,-72,-68,-83,-76,-102,-101,-99,-100,-77,63,63,-94,-93,-97,-96,-91,-89,-90,-74,-75,]),'%':([2,7,11,16,27,30,32,33,37,42,45,54,55,58,61,66,81,87,99,126,132,133,161,162,163,174,204,],[-69,-63,-65,-62,-82,-61,-88,-71,-64,-70,-66,-67,-72,119,-73,-72,-68,-83,-76,-77,119,119,-91,-89,-90,-74,-75,]),'[':([2,7,11,16,27,30,33,37,42,45,54,55,61,66,81,90,99,100,101,126,134,140,141,142,165,171,172,174,204,],[-69,-63,-65,-62,102,-61,-71,-64,-70,-66,-67,-72,-73,-72,-68,-20,-76,-22,-21,-77,-22,-29,170,-22,170,-23,-30,-74,-75,]),']':([1,2,6,7,9,11,14,16,27,30,32,33,34,36,37,41,42,43,45,51,54,56,57,58,61,66,81,87,99,122,123,124,125,126,127,129,130,132,133,144,145,146,149,150,155,156,158,159,160,161,162,163,170,174,180,185,186,187,188,189,197,204,205,206,210,],[-103,-69,-116,-63,-106,-65,-95,-62,-82,-61,-88,-71,-118,-120,-64,-110,-70,-112,-66,-114,-67,-98,-108,-92,-73,-72,-68,-83,-76,-102,-101,-99,-100,-77,-119,-104,-105,-94,-93,174,-116,-134,-109,-111,-113,-115,-97,-96,-107,-91,-89,-90,-24,-74,-117,-32,-25,-31,199,-135,-26,-75,-24,-33,-27,]),u'ID':([0,3,5,8,10,12,13,15,17,18,20,22,23,25,28,31,35,38,39,40,44,47,48,52,53,59,60,62,63,64,65,68,69,70,71,72,73,74,75,76,77,78,79,80,82,83,84,85,88,89,91,92,93,94,95,96,97,98,102,103,105,106,107,110,111,112,113,114,115,116,117,118,119,120,121,131,137,138,143,148,152,153,164,167,170,173,179,182,184,190,191,192,193,198,202,205,207,208,213,214,],[55,-38,66,55,-41,66,66,90,-84,-3,-43,-39,-59,55,-40,66,-7,-5,-42,-47,-46,-87,109,-85,-86,-44,-6,66,66,66,66,-127,-123,-128,-131,66,-121,-130,-124,-126,-122,-125,-129,66,-4,66,66,-52,66,66,66,-54,55,-36,-35,-50,66,140,66,66,66,66,-53,66,-13,-17,66,66,66,66,66,66,66,66,66,-51,-37,-34,172,-45,-8,177,66,66,187,66,-60,-48,66,-49,-9,-58,187,66,-55,187,66,-57,-58,-56,]),u'IF':([0,3,8,10,18,20,22,23,25,28,35,38,39,40,44,59,60,82,85,92,93,94,95,96,107,111,112,131,137,138,148,152,179,182,190,191,192,202,208,213,214,],[49,-38,49,-41,-3,-43,-39,-59,49,-40,-7,-5,-42,-47,-46,-44,-6,-4,-52,-54,49,-36,-35,-50,-53,-13,-17,-51,-37,-34,-45,-8,-60,-48,-49,-9,-58,-55,-57,-58,-56,]),u'AND':([1,2,7,9,11,14,16,27,30,32,33,37,41,42,43,45,51,54,55,56,57,58,61,66,81,87,99,122,123,124,125,126,129,130,132,133,149,150,155,158,159,160,161,162,163,174,204,],[-103,-69,-63,-106,-65,-95,-62,-82,-61,-88,-71,-64,-110,-70,-112,-66,113,-67,-72,-98,-108,-92,-73,-72,-68,-83,-76,-102,-101,-99,-100,-77,-104,-105,-94,-93,-109,-111,-113,-97,-96,-107,-91,-89,-90,-74,-75,]),u'FALSE':([0,3,5,8,10,12,13,17,18,20,22,23,25,28,31,35,38,39,40,44,47,52,53,59,60,62,63,64,65,68,69,70,71,72,73,74,75,76,77,78,79,80,82,83,84,85,88,89,91,92,93,94,95,96,97,102,103,105,106,107,110,111,112,113,114,115,116,117,118,119,120,121,131,137,138,148,152,164,167,173,179,182,184,190,191,192,198,202,207,208,213,214,],[42,-38,42,42,-41,42,42,-84,-3,-43,-39,-59,42,-40,42,-7,-5,-42,-47,-46,-87,-85,-86,-44,-6,42,42,42,42,-127,-123,-128,-131,42,-121,-130,-124,-126,-122,-125,-129,42,-4,42,42,-52,42,42,42,-54,42,-36,-35,-50,42,42,42,42,42,-53,42,-13,-17,42,42,42,42,42,42,42,42,42,-51,-37,-34,-45,-8,42,42,42,-60,-48,42,-49,-9,-58,42,-55,42,-57,-58,-56,]),'=':([1,2,6,7,9,11,14,16,27,30,32,33,37,41,42,43,45,51,54,55,56,57,58,61,66,81,87,99,122,123,124,125,126,129,130,132,133,149,150,155,156,158,159,160,161,162,163,174,185,187,204,],[-103,-69,73,-63,-106,-65,-95,-62,-82,-61,-88,-71,-64,-110,-70,-112,-66,-114,-67,115,-98,-108,-92,-73,-72,-68,-83,-76,-102,-101,-99,-100,-77,-104,-105,-94,-93,-109,-111,-113,-115,-97,-96,-107,-91,-89,-90,-74,198,-31,-75,]),u'SCOPEDID':([2,7,11,16,27,30,33,37,42,45,54,55,61,66,81,99,108,109,126,151,174,177,204,],[-69,-63,-65,-62,99,-61,-71,-64,-70,-66,-67,-72,-73,-72,-68,-76,151,-10,-77,-12,-74,-11,-75,]),u'FLOAT_LIT':([0,3,5,8,10,12,13,17,18,20,22,23,25,28,31,35,38,39,40,44,47,52,53,59,60,62,63,64,65,68,69,70,71,72,73,74,75,76,77,78,79,80,82,83,84,85,88,89,91,92,93,94,95,96,97,102,103,105,106,107,110,111,112,113,114,115,116,117,118,119,120,121,131,137,138,148,152,164,167,173,179,182,184,190,191,192,198,202,207,208,213,214,],[45,-38,45,45,-41,45,45,-84,-3,-43,-39,-59,45,-40,45,-7,-5,-42,-47,-46,-87,-85,-86,-44,-6,45,45,45,45,-127,-123,-128,-131,45,-121,-130,-124,-126,-122,-125,-129,45,-4,45,45,-52,45,45,45,-54,45,-36,-35,-50,45,45,45,45,45,-53,45,-13,-17,45,45,45,45,45,45,45,45,45,-51,-37,-34,-45,-8,45,45,45,-60,-48,45,-49,-9,-58,45,-55,45,-57,-58,-56,]),'^':([1,2,7,9,11,14,16,27,30,32,33,37,41,42,45,54,55,56,57,58,61,66,81,87,99,122,123,124,125,126,129,130,132,133,149,150,158,159,160,161,162,163,174,204,],[-103,-69,-63,-106,-65,-95,-62,-82,-61,-88,-71,-64,105,-70,-66,-67,-72,-98,-108,-92,-73,-72,-68,-83,-76,-102,-101,-99,-100,-77,-104,-105,-94,-93,-109,105,-97,-96,-107,-91,-89,-90,-74,-75,]),'<':([1,2,7,11,14,16,27,30,32,33,37,42,45,54,55,56,58,61,66,81,87,99,122,123,124,125,126,129,130,132,133,158,159,161,162,163,174,204,],[64,-69,-63,-65,-95,-62,-82,-61,-88,-71,-64,-70,-66,-67,-72,-98,-92,-73,-72,-68,-83,-76,-102,-101,-99,-100,-77,64,64,-94,-93,-97,-96,-91,-89,-90,-74,-75,]),u'BREAK':([0,3,8,10,18,20,22,23,25,28,35,38,39,40,44,59,60,82,85,92,93,94,95,96,107,111,112,131,137,138,148,152,179,182,190,191,192,202,208,213,214,],[46,-38,46,-41,-3,-43,-39,-59,46,-40,-7,-5,-42,-47,-46,-44,-6,-4,-52,-54,46,-36,-35,-50,-53,-13,-17,-51,-37,-34,-45,-8,-60,-48,-49,-9,-58,-55,-57,-58,-56,]),u'INT_LIT':([0,3,5,8,10,12,13,17,18,20,22,23,25,28,31,35,38,39,40,44,47,52,53,59,60,62,63,64,65,68,69,70,71,72,73,74,75,76,77,78,79,80,82,83,84,85,88,89,91,92,93,94,95,96,97,102,103,105,106,107,110,111,112,113,114,115,116,117,118,119,120,121,131,137,138,148,152,164,167,173,179,182,184,190,191,192,198,202,207,208,213,214,],[11,-38,11,11,-41,11,11,-84,-3,-43,-39,-59,11,-40,11,-7,-5,-42,-47,-46,-87,-85,-86,-44,-6,11,11,11,11,-127,-123,-128,-131,11,-121,-130,-124,-126,-122,-125,-129,11,-4,11,11,-52,11,11,11,-54,11,-36,-35,-50,11,11,11,11,11,-53,11,-13,-17,11,11,11,11,11,11,11,11,11,-51,-37,-34,-45,-8,11,11,11,-60,-48,11,-49,-9,-58,11,-55,11,-57,-58,-56,]),u'CONTINUE':([0,3,8,10,18,20,22,23,25,28,35,38,39,40,44,59,60,82,85,92,93,94,95,96,107,111,112,131,137,138,148,152,179,182,190,191,192,202,208,213,214,],[24,-38,24,-41,-3,-43,-39,-59,24,-40,-7,-5,-42,-47,-46,-44,-6,-4,-52,-54,24,-36,-35,-50,-53,-13,-17,-51,-37,-34,-45,-8,-60,-48,-49,-9,-58,-55,-57,-58,-56,]),'?':([1,2,6,7,9,11,14,16,27,30,32,33,37,41,42,43,45,51,54,55,56,57,58,61,66,81,87,99,122,123,124,125,126,129,130,132,133,145,149,150,155,156,158,159,160,161,162,163,174,204,],[-103,-69,80,-63,-106,-65,-95,-62,-82,-61,-88,-71,-64,-110,-70,-112,-66,-114,-67,-72,-98,-108,-92,-73,-72,-68,-83,-76,-102,-101,-99,-100,-77,-104,-105,-94,-93,80,-109,-111,-113,-115,-97,-96,-107,-91,-89,-90,-74,-75,]),u'STRING_LIT':([0,3,5,7,8,10,12,13,17,18,20,22,23,25,28,31,35,38,39,40,44,47,52,53,54,59,60,62,63,64,65,68,69,70,71,72,73,74,75,76,77,78,79,80,81,82,83,84,85,88,89,91,92,93,94,95,96,97,102,103,105,106,107,110,111,112,113,114,115,116,117,118,119,120,121,131,137,138,148,152,164,167,173,179,182,184,190,191,192,198,202,207,208,213,214,],[54,-38,54,81,54,-41,54,54,-84,-3,-43,-39,-59,54,-40,54,-7,-5,-42,-47,-46,-87,-85,-86,-67,-44,-6,54,54,54,54,-127,-123,-128,-131,54,-121,-130,-124,-126,-122,-125,-129,54,-68,-4,54,54,-52,54,54,54,-54,54,-36,-35,-50,54,54,54,54,54,-53,54,-13,-17,54,54,54,54,54,54,54,54,54,-51,-37,-34,-45,-8,54,54,54,-60,-48,54,-49,-9,-58,54,-55,54,-57,-58,-56,]),'{':([0,3,8,10,18,20,22,23,25,28,35,38,39,40,44,50,59,60,82,85,90,92,93,94,95,96,101,107,111,112,131,134,137,138,140,142,148,152,165,166,168,171,172,175,178,179,181,182,190,191,192,194,199,201,202,208,209,212,213,214,],[25,-38,25,-41,-3,-43,-39,-59,25,-40,-7,-5,-42,-47,-46,25,-44,-6,-4,-52,-20,-54,25,-36,-35,-50,-21,-53,-13,-17,-51,-22,-37,-34,-29,-22,-45,-8,-18,25,-19,-23,-30,25,25,-60,-15,-48,-49,-9,-58,-14,-28,25,-55,-57,-16,25,-58,-56,]),'>':([1,2,7,11,14,16,27,30,32,33,37,42,45,54,55,56,58,61,66,81,87,99,122,123,124,125,126,129,130,132,133,158,159,161,162,163,174,204,],[65,-69,-63,-65,-95,-62,-82,-61,-88,-71,-64,-70,-66,-67,-72,-98,-92,-73,-72,-68,-83,-76,-102,-101,-99,-100,-77,65,65,-94,-93,-97,-96,-91,-89,-90,-74,-75,]),'}':([3,10,20,22,23,25,28,39,40,44,59,85,92,93,94,95,96,107,131,137,138,148,179,182,190,192,202,208,213,214,],[-38,-41,-43,-39,-59,95,-40,-42,-47,-46,-44,-52,-54,138,-36,-35,-50,-53,-51,-37,-34,-45,-60,-48,-49,-58,-55,-57,-58,-56,]),u'OR':([1,2,7,9,11,14,16,27,30,32,33,37,41,42,43,45,51,54,55,56,57,58,61,66,81,87,99,122,123,124,125,126,129,130,132,133,149,150,155,158,159,160,161,162,163,174,204,],[-103,-69,-63,-106,-65,-95,-62,-82,-61,-88,-71,-64,-110,-70,-112,-66,114,-67,-72,-98,-108,-92,-73,-72,-68,-83,-76,-102,-101,-99,-100,-77,-104,-105,-94,-93,-109,-111,-113,-97,-96,-107,-91,-89,-90,-74,-75,]),'~':([0,3,5,8,10,12,13,17,18,20,22,23,25,28,31,35,38,39,40,44,47,52,53,59,60,62,63,64,65,68,69,70,71,72,73,74,75,76,77,78,79,80,82,83,84,85,88,89,91,92,93,94,95,96,97,102,103,105,106,107,110,111,112,113,114,115,116,117,118,119,120,121,131,137,138,148,152,164,167,173,179,182,184,190,191,192,198,202,207,208,213,214,],[47,-38,47,47,-41,47,47,-84,-3,-43,-39,-59,47,-40,47,-7,-5,-42,-47,-46,-87,-85,-86,-44,-6,47,47,47,47,-127,-123,-128,-131,47,-121,-130,-124,-126,-122,-125,-129,47,-4,47,47,-52,47,47,47,-54,47,-36,-35,-50,47,47,47,47,47,-53,47,-13,-17,47,47,47,47,47,47,47,47,47,-51,-37,-34,-45,-8,47,47,47,-60,-48,47,-49,-9,-58,47,-55,47,-57,-58,-56,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {u'expression-list-opt':([184,],[196,]),u'postfix-expression':([0,5,8,12,13,25,31,62,63,64,65,72,80,83,84,88,89,91,93,97,102,103,105,106,110,113,114,115,116,117,118,119,120,121,164,167,173,184,198,207,],[27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,27,]),u'unary-expression':([0,5,8,12,13,25,31,62,63,64,65,72,80,83,84,88,89,91,93,97,102,103,105,106,110,113,114,115,116,117,118,119,120,121,164,167,173,184,198,207,],[32,32,32,32,87,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,32,161,162,163,32,32,32,32,32,32,]),u'unary-operator':([0,5,8,12,13,25,31,62,63,64,65,72,80,83,84,88,89,91,93,97,102,103,105,106,110,113,114,115,116,117,118,119,120,121,164,167,173,184,198,207,],[13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,13,]),u'selection-statement':([0,8,25,93,],[28,28,28,28,]),u'dot-param-decl':([100,134,142,],[142,142,142,]),u'relational-expression':([0,5,8,12,25,31,72,80,83,84,91,93,97,102,103,105,106,110,113,114,115,118,164,167,173,184,198,207,],[1,1,1,1,1,1,1,1,129,130,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,1,]),u'kwarg-param-opt':([141,165,],[169,181,]),u'integer-literal':([0,5,8,12,13,25,31,62,63,64,65,72,80,83,84,88,89,91,93,97,102,103,105,106,110,113,114,115,116,117,118,119,120,121,164,167,173,184,198,207,],[30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,30,]),u'parameter-decl':([170,193,205,],[185,185,185,]),u'additive-expression':([0,5,8,12,25,31,62,63,64,65,72,80,83,84,91,93,97,102,103,105,106,110,113,114,115,116,117,118,164,167,173,184,198,207,],[14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,14,158,159,14,14,14,14,14,14,14,]),u'function-decl':([0,8,],[50,50,]),u'expression-statement':([0,8,25,93,],[3,3,3,3,]),u'and-test':([0,5,8,12,25,31,72,80,91,93,97,102,103,110,114,115,164,167,173,184,198,207,],[51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,51,]),u'dot-param-opt':([100,134,142,],[141,165,171,]),u'translation-unit':([0,],[4,]),u'optional-assign':([185,],[197,]),u'floating-literal':([0,5,8,12,13,25,31,62,63,64,65,72,80,83,84,88,89,91,93,97,102,103,105,106,110,113,114,115,116,117,118,119,120,121,164,167,173,184,198,207,],[16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,16,]),u'expression-list':([91,184,],[136,195,]),u'or-test':([0,5,8,12,25,31,72,80,91,93,97,102,103,110,114,115,164,167,173,184,198,207,],[6,6,6,6,6,6,6,6,6,6,6,145,6,6,156,6,6,6,145,6,6,6,]),u'top-level-block-item':([0,8,],[18,82,]),u'hash-param-decl':([27,90,],[101,101,]),u'function-body':([50,],[111,]),u'literal':([0,5,8,12,13,25,31,62,63,64,65,72,80,83,84,88,89,91,93,97,102,103,105,106,110,113,114,115,116,117,118,119,120,121,164,167,173,184,198,207,],[33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,33,]),u'selection-statement-tail':([192,213,],[202,214,]),u'conditional-expression':([0,5,8,12,25,31,72,80,91,93,97,102,103,110,115,164,167,173,184,198,207,],[34,34,34,34,34,34,34,34,34,34,34,146,34,34,34,34,34,189,34,34,34,]),u'statement':([0,8,25,93,],[35,35,94,137,]),u'assignment-expression':([0,5,8,12,25,31,72,80,91,93,97,103,110,115,164,167,184,198,207,],[19,19,19,19,19,104,127,19,135,19,139,19,19,157,180,183,135,206,19,]),u'loop-statement':([0,8,25,93,],[20,20,20,20,]),u'boolean-literal':([0,5,8,12,13,25,31,62,63,64,65,72,80,83,84,88,89,91,93,97,102,103,105,106,110,113,114,115,116,117,118,119,120,121,164,167,173,184,198,207,],[37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,37,]),u'use-statement':([0,8,],[38,38,]),u'top-level-block-items':([0,],[8,]),u'parameter-decl-list':([170,193,205,],[186,186,186,]),u'declaration-statement':([0,8,25,93,],[39,39,39,39,]),u'while-loop':([0,8,25,93,],[40,40,40,40,]),u'conditional-expr-list':([102,],[144,]),u'equality-expression':([0,5,8,12,25,31,72,80,91,93,97,102,103,105,106,110,113,114,115,118,164,167,173,184,198,207,],[9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,9,160,9,9,9,9,9,9,]),u'compound-statement':([0,8,25,50,93,166,175,178,201,212,],[22,22,22,112,22,182,190,192,208,213,]),u'shift-expression':([0,5,8,12,25,31,62,63,64,65,72,80,83,84,91,93,97,102,103,105,106,110,113,114,115,118,164,167,173,184,198,207,],[56,56,56,56,56,56,122,123,124,125,56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,56,]),u'xor-expression':([0,5,8,12,25,31,72,80,91,93,97,102,103,106,110,113,114,115,164,167,173,184,198,207,],[41,41,41,41,41,41,41,41,41,41,41,41,41,150,41,41,41,41,41,41,41,41,41,41,]),u'and-expression':([0,5,8,12,25,31,72,80,91,93,97,102,103,105,106,110,113,114,115,164,167,173,184,198,207,],[57,57,57,57,57,57,57,57,57,57,57,57,57,149,57,57,57,57,57,57,57,57,57,57,57,]),u'jump-statement':([0,8,25,93,],[10,10,10,10,]),u'assignment-operator':([6,],[72,]),u'multiplicative-expression':([0,5,8,12,25,31,62,63,64,65,72,80,83,84,88,89,91,93,97,102,103,105,106,110,113,114,115,116,117,118,164,167,173,184,198,207,],[58,58,58,58,58,58,58,58,58,58,58,58,58,58,132,133,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,58,]),u'set-statement':([0,8,25,93,],[59,59,59,59,]),u'or-expression':([0,5,8,12,25,31,72,80,91,93,97,102,103,110,113,114,115,164,167,173,184,198,207,],[43,43,43,43,43,43,43,43,43,43,43,43,43,43,155,43,43,43,43,43,43,43,43,]),u'for-loop':([0,8,25,93,],[44,44,44,44,]),u'hash-param-opt':([27,90,],[100,134,]),u'kwarg-param-decl':([141,165,],[168,168,]),u'positional-params-opt':([181,],[194,]),u'block-declaration':([0,8,25,93,],[23,23,23,23,]),u'function-definition':([0,8,],[60,60,]),u'package-import':([48,],[108,]),u'primary-expression':([0,5,8,12,13,25,31,62,63,64,65,72,80,83,84,88,89,91,93,97,102,103,105,106,110,113,114,115,116,117,118,119,120,121,164,167,173,184,198,207,],[61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,61,]),u'statement-seq':([25,],[93,]),u'parameter-decl-seq':([170,193,205,],[188,203,210,]),u'string-literal':([0,5,8,12,13,25,31,62,63,64,65,72,80,83,84,88,89,91,93,97,102,103,105,106,110,113,114,115,116,117,118,119,120,121,164,167,173,184,198,207,],[7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,7,]),u'expression':([0,5,8,12,25,80,93,103,110,207,],[26,67,26,86,26,128,26,147,154,211,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> translation-unit","S'",1,None,None,None),
+  (u'translation-unit -> <empty>',u'translation-unit',0,'p_translation_unit','parser.py',626),
+  (u'translation-unit -> top-level-block-items',u'translation-unit',1,'p_translation_unit','parser.py',627),
+  (u'top-level-block-items -> top-level-block-item',u'top-level-block-items',1,'p_top_level_block_seq','parser.py',636),
+  (u'top-level-block-items -> top-level-block-items top-level-block-item',u'top-level-block-items',2,'p_top_level_block_seq','parser.py',637),
+  (u'top-level-block-item -> use-statement',u'top-level-block-item',1,'p_top_level_block_item','parser.py',646),
+  (u'top-level-block-item -> function-definition',u'top-level-block-item',1,'p_top_level_block_item','parser.py',647),
+  (u'top-level-block-item -> statement',u'top-level-block-item',1,'p_top_level_block_item','parser.py',648),
+  (u'use-statement -> USE package-import ;',u'use-statement',3,'p_use_statement','parser.py',653),
+  (u'use-statement -> USE package-import : * ;',u'use-statement',5,'p_use_statement','parser.py',654),
+  (u'package-import -> ID',u'package-import',1,'p_package_import','parser.py',665),
+  (u'package-import -> package-import : ID',u'package-import',3,'p_package_import','parser.py',666),
+  (u'package-import -> package-import SCOPEDID',u'package-import',2,'p_package_import','parser.py',667),
+  (u'function-definition -> function-decl function-body',u'function-definition',2,'p_function_definition','parser.py',678),
+  (u'function-decl -> DEF ID hash-param-opt dot-param-opt kwarg-param-opt positional-params-opt',u'function-decl',6,'p_function_decl','parser.py',683),
+  (u'positional-params-opt -> <empty>',u'positional-params-opt',0,'p_function_positional_params_opt','parser.py',695),
+  (u'positional-params-opt -> ( parameter-decl-seq )',u'positional-params-opt',3,'p_function_positional_params_opt','parser.py',696),
+  (u'function-body -> compound-statement',u'function-body',1,'p_function_body','parser.py',705),
+  (u'kwarg-param-opt -> <empty>',u'kwarg-param-opt',0,'p_kwarg_param_opt','parser.py',710),
+  (u'kwarg-param-opt -> kwarg-param-decl',u'kwarg-param-opt',1,'p_kwarg_param_opt','parser.py',711),
+  (u'hash-param-opt -> <empty>',u'hash-param-opt',0,'p_hash_param_opt','parser.py',719),
+  (u'hash-param-opt -> hash-param-decl',u'hash-param-opt',1,'p_hash_param_opt','parser.py',720),
+  (u'dot-param-opt -> <empty>',u'dot-param-opt',0,'p_dot_param_opt','parser.py',728),
+  (u'dot-param-opt -> dot-param-decl dot-param-opt',u'dot-param-opt',2,'p_dot_param_opt','parser.py',729),
+  (u'parameter-decl-seq -> <empty>',u'parameter-decl-seq',0,'p_parameter_decl_seq','parser.py',740),
+  (u'parameter-decl-seq -> parameter-decl-list',u'parameter-decl-seq',1,'p_parameter_decl_seq','parser.py',741),
+  (u'parameter-decl-list -> parameter-decl optional-assign',u'parameter-decl-list',2,'p_parameter_decl_list','parser.py',755),
+  (u'parameter-decl-list -> parameter-decl optional-assign , parameter-decl-seq',u'parameter-decl-list',4,'p_parameter_decl_list','parser.py',756),
+  (u'kwarg-param-decl -> [ parameter-decl-seq ]',u'kwarg-param-decl',3,'p_kwarg_param_decl','parser.py',772),
+  (u'hash-param-decl -> # ID',u'hash-param-decl',2,'p_hash_param_decl','parser.py',777),
+  (u'dot-param-decl -> . ID',u'dot-param-decl',2,'p_dot_param_decl','parser.py',782),
+  (u'parameter-decl -> ID',u'parameter-decl',1,'p_parameter_decl','parser.py',787),
+  (u'optional-assign -> <empty>',u'optional-assign',0,'p_optional_assign','parser.py',793),
+  (u'optional-assign -> = assignment-expression',u'optional-assign',2,'p_optional_assign','parser.py',794),
+  (u'compound-statement -> { statement-seq }',u'compound-statement',3,'p_compound_statement','parser.py',802),
+  (u'compound-statement -> { }',u'compound-statement',2,'p_compound_statement','parser.py',803),
+  (u'statement-seq -> statement',u'statement-seq',1,'p_statement_seq','parser.py',814),
+  (u'statement-seq -> statement-seq statement',u'statement-seq',2,'p_statement_seq','parser.py',815),
+  (u'statement -> expression-statement',u'statement',1,'p_statement','parser.py',823),
+  (u'statement -> compound-statement',u'statement',1,'p_statement','parser.py',824),
+  (u'statement -> selection-statement',u'statement',1,'p_statement','parser.py',825),
+  (u'statement -> jump-statement',u'statement',1,'p_statement','parser.py',826),
+  (u'statement -> declaration-statement',u'statement',1,'p_statement','parser.py',827),
+  (u'statement -> loop-statement',u'statement',1,'p_statement','parser.py',828),
+  (u'statement -> set-statement',u'statement',1,'p_statement','parser.py',829),
+  (u'set-statement -> SET assignment-expression ;',u'set-statement',3,'p_set_statement','parser.py',834),
+  (u'loop-statement -> for-loop',u'loop-statement',1,'p_loop_statement','parser.py',839),
+  (u'loop-statement -> while-loop',u'loop-statement',1,'p_loop_statement','parser.py',840),
+  (u'for-loop -> FOR ( expression-list ) compound-statement',u'for-loop',5,'p_for_loop','parser.py',845),
+  (u'while-loop -> WHILE ( expression ) compound-statement',u'while-loop',5,'p_while_loop','parser.py',850),
+  (u'expression-statement -> expression ;',u'expression-statement',2,'p_expression_statement','parser.py',855),
+  (u'jump-statement -> RETURN expression ;',u'jump-statement',3,'p_jump_statement','parser.py',860),
+  (u'jump-statement -> RETURN ;',u'jump-statement',2,'p_jump_statement','parser.py',861),
+  (u'jump-statement -> BREAK ;',u'jump-statement',2,'p_jump_statement','parser.py',862),
+  (u'jump-statement -> CONTINUE ;',u'jump-statement',2,'p_jump_statement','parser.py',863),
+  (u'selection-statement -> IF ( expression ) compound-statement selection-statement-tail',u'selection-statement',6,'p_selection_statement','parser.py',871),
+  (u'selection-statement-tail -> ELIF ( expression ) compound-statement selection-statement-tail',u'selection-statement-tail',6,'p_selection_statement_tail','parser.py',876),
+  (u'selection-statement-tail -> ELSE compound-statement',u'selection-statement-tail',2,'p_selection_statement_tail','parser.py',877),
+  (u'selection-statement-tail -> <empty>',u'selection-statement-tail',0,'p_selection_statement_tail','parser.py',878),
+  (u'declaration-statement -> block-declaration',u'declaration-statement',1,'p_declaration_statement','parser.py',888),
+  (u'block-declaration -> ID = assignment-expression ;',u'block-declaration',4,'p_block_declaration','parser.py',893),
+  (u'literal -> integer-literal',u'literal',1,'p_literal','parser.py',898),
+  (u'literal -> floating-literal',u'literal',1,'p_literal','parser.py',899),
+  (u'literal -> string-literal',u'literal',1,'p_literal','parser.py',900),
+  (u'literal -> boolean-literal',u'literal',1,'p_literal','parser.py',901),
+  (u'integer-literal -> INT_LIT',u'integer-literal',1,'p_integer_literal','parser.py',906),
+  (u'floating-literal -> FLOAT_LIT',u'floating-literal',1,'p_floating_literal','parser.py',912),
+  (u'string-literal -> STRING_LIT',u'string-literal',1,'p_string_literal','parser.py',917),
+  (u'string-literal -> string-literal STRING_LIT',u'string-literal',2,'p_string_literal','parser.py',918),
+  (u'boolean-literal -> TRUE',u'boolean-literal',1,'p_boolean_literal','parser.py',934),
+  (u'boolean-literal -> FALSE',u'boolean-literal',1,'p_boolean_literal','parser.py',935),
+  (u'primary-expression -> literal',u'primary-expression',1,'p_primary_expression','parser.py',942),
+  (u'primary-expression -> ID',u'primary-expression',1,'p_primary_expression','parser.py',943),
+  (u'postfix-expression -> primary-expression',u'postfix-expression',1,'p_postfix_expression','parser.py',949),
+  (u'postfix-expression -> postfix-expression [ conditional-expr-list ]',u'postfix-expression',4,'p_postfix_expression','parser.py',950),
+  (u'postfix-expression -> postfix-expression hash-param-opt dot-param-opt kwarg-param-opt ( expression-list-opt )',u'postfix-expression',7,'p_postfix_expression','parser.py',951),
+  (u'postfix-expression -> postfix-expression SCOPEDID',u'postfix-expression',2,'p_postfix_expression','parser.py',952),
+  (u'postfix-expression -> ( expression )',u'postfix-expression',3,'p_postfix_expression','parser.py',953),
+  (u'expression-list-opt -> expression-list',u'expression-list-opt',1,'p_expression_list_opt','parser.py',972),
+  (u'expression-list-opt -> <empty>',u'expression-list-opt',0,'p_expression_list_opt','parser.py',973),
+  (u'expression-list -> assignment-expression',u'expression-list',1,'p_expression_list','parser.py',978),
+  (u'expression-list -> expression-list , assignment-expression',u'expression-list',3,'p_expression_list','parser.py',979),
+  (u'unary-expression -> postfix-expression',u'unary-expression',1,'p_unary_expression','parser.py',989),
+  (u'unary-expression -> unary-operator unary-expression',u'unary-expression',2,'p_unary_expression','parser.py',990),
+  (u'unary-operator -> +',u'unary-operator',1,'p_unary_operator','parser.py',998),
+  (u'unary-operator -> -',u'unary-operator',1,'p_unary_operator','parser.py',999),
+  (u'unary-operator -> !',u'unary-operator',1,'p_unary_operator','parser.py',1000),
+  (u'unary-operator -> ~',u'unary-operator',1,'p_unary_operator','parser.py',1001),
+  (u'multiplicative-expression -> unary-expression',u'multiplicative-expression',1,'p_multiplicative_expression','parser.py',1006),
+  (u'multiplicative-expression -> multiplicative-expression * unary-expression',u'multiplicative-expression',3,'p_multiplicative_expression','parser.py',1007),
+  (u'multiplicative-expression -> multiplicative-expression / unary-expression',u'multiplicative-expression',3,'p_multiplicative_expression','parser.py',1008),
+  (u'multiplicative-expression -> multiplicative-expression % unary-expression',u'multiplicative-expression',3,'p_multiplicative_expression','parser.py',1009),
+  (u'additive-expression -> multiplicative-expression',u'additive-expression',1,'p_additive_expression','parser.py',1017),
+  (u'additive-expression -> additive-expression + multiplicative-expression',u'additive-expression',3,'p_additive_expression','parser.py',1018),
+  (u'additive-expression -> additive-expression - multiplicative-expression',u'additive-expression',3,'p_additive_expression','parser.py',1019),
+  (u'shift-expression -> additive-expression',u'shift-expression',1,'p_shift_expression','parser.py',1027),
+  (u'shift-expression -> shift-expression SHL additive-expression',u'shift-expression',3,'p_shift_expression','parser.py',1028),
+  (u'shift-expression -> shift-expression SHR additive-expression',u'shift-expression',3,'p_shift_expression','parser.py',1029),
+  (u'relational-expression -> shift-expression',u'relational-expression',1,'p_relational_expression','parser.py',1037),
+  (u'relational-expression -> relational-expression < shift-expression',u'relational-expression',3,'p_relational_expression','parser.py',1038),
+  (u'relational-expression -> relational-expression > shift-expression',u'relational-expression',3,'p_relational_expression','parser.py',1039),
+  (u'relational-expression -> relational-expression LTE shift-expression',u'relational-expression',3,'p_relational_expression','parser.py',1040),
+  (u'relational-expression -> relational-expression GTE shift-expression',u'relational-expression',3,'p_relational_expression','parser.py',1041),
+  (u'equality-expression -> relational-expression',u'equality-expression',1,'p_equality_expression','parser.py',1049),
+  (u'equality-expression -> equality-expression EQ relational-expression',u'equality-expression',3,'p_equality_expression','parser.py',1050),
+  (u'equality-expression -> equality-expression NE relational-expression',u'equality-expression',3,'p_equality_expression','parser.py',1051),
+  (u'and-expression -> equality-expression',u'and-expression',1,'p_and_expression','parser.py',1059),
+  (u'and-expression -> and-expression & equality-expression',u'and-expression',3,'p_and_expression','parser.py',1060),
+  (u'xor-expression -> and-expression',u'xor-expression',1,'p_xor_expression','parser.py',1068),
+  (u'xor-expression -> xor-expression ^ and-expression',u'xor-expression',3,'p_xor_expression','parser.py',1069),
+  (u'or-expression -> xor-expression',u'or-expression',1,'p_or_expression','parser.py',1077),
+  (u'or-expression -> or-expression | xor-expression',u'or-expression',3,'p_or_expression','parser.py',1078),
+  (u'and-test -> or-expression',u'and-test',1,'p_and_test','parser.py',1086),
+  (u'and-test -> and-test AND or-expression',u'and-test',3,'p_and_test','parser.py',1087),
+  (u'or-test -> and-test',u'or-test',1,'p_or_test','parser.py',1096),
+  (u'or-test -> and-test OR or-test',u'or-test',3,'p_or_test','parser.py',1097),
+  (u'conditional-expression -> or-test',u'conditional-expression',1,'p_conditional_expression','parser.py',1105),
+  (u'conditional-expression -> or-test ? expression : assignment-expression',u'conditional-expression',5,'p_conditional_expression','parser.py',1106),
+  (u'assignment-expression -> conditional-expression',u'assignment-expression',1,'p_assignment_expression','parser.py',1115),
+  (u'assignment-expression -> or-test assignment-operator assignment-expression',u'assignment-expression',3,'p_assignment_expression','parser.py',1116),
+  (u'assignment-expression -> EXPRESSION',u'assignment-expression',1,'p_assignment_expression','parser.py',1117),
+  (u'assignment-operator -> =',u'assignment-operator',1,'p_assignment_operator','parser.py',1126),
+  (u'assignment-operator -> MULEQ',u'assignment-operator',1,'p_assignment_operator','parser.py',1127),
+  (u'assignment-operator -> DIVEQ',u'assignment-operator',1,'p_assignment_operator','parser.py',1128),
+  (u'assignment-operator -> MODEQ',u'assignment-operator',1,'p_assignment_operator','parser.py',1129),
+  (u'assignment-operator -> ADDEQ',u'assignment-operator',1,'p_assignment_operator','parser.py',1130),
+  (u'assignment-operator -> SUBEQ',u'assignment-operator',1,'p_assignment_operator','parser.py',1131),
+  (u'assignment-operator -> ANDEQ',u'assignment-operator',1,'p_assignment_operator','parser.py',1132),
+  (u'assignment-operator -> XOREQ',u'assignment-operator',1,'p_assignment_operator','parser.py',1133),
+  (u'assignment-operator -> OREQ',u'assignment-operator',1,'p_assignment_operator','parser.py',1134),
+  (u'assignment-operator -> SHLEQ',u'assignment-operator',1,'p_assignment_operator','parser.py',1135),
+  (u'assignment-operator -> SHREQ',u'assignment-operator',1,'p_assignment_operator','parser.py',1136),
+  (u'expression -> assignment-expression',u'expression',1,'p_expression','parser.py',1141),
+  (u'expression -> expression , assignment-expression',u'expression',3,'p_expression','parser.py',1142),
+  (u'conditional-expr-list -> conditional-expression',u'conditional-expr-list',1,'p_conditional_expr_list','parser.py',1150),
+  (u'conditional-expr-list -> conditional-expr-list , conditional-expression',u'conditional-expr-list',3,'p_conditional_expr_list','parser.py',1151),
+]
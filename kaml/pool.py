@@ -0,0 +1,54 @@
+from __future__ import unicode_literals
+from contextlib import contextmanager
+
+try:
+	from queue import Queue
+except ImportError:
+	from Queue import Queue
+
+from kaml import get_parser
+
+__all__ = ['ParserPool']
+
+class ParserPool(object):
+	""" A fixed number of warm Parsers, for worker threads to borrow.
+	
+	The parsers are built, and have parsed once, before the pool is returned,
+	so the first parse in a thread doesn't pay for building the lexer. When
+	every parser is lent out, `acquire` blocks until one is released.
+	"""
+	
+	# Goes through the lexer states and the main parts of the grammar
+	warmup = '-def fn(a) { x = "a" + {{{ raw }}}; -return x; }'
+	
+	def __init__(self, size = 4, lexer_class = None, cache = None):
+		self.size = size
+		self._idle = Queue()
+		for _ in range(size):
+			parser = get_parser(lexer_class)
+			parser.parse(self.warmup)
+			parser.cache = cache
+			self._idle.put(parser)
+	
+	def acquire(self, timeout = None):
+		return self._idle.get(True, timeout)
+	
+	def release(self, parser):
+		self._idle.put(parser)
+	
+	@contextmanager
+	def parser(self, timeout = None):
+		""" A parser for the duration of the `with` block """
+		parser = self.acquire(timeout)
+		try:
+			yield parser
+		finally:
+			self.release(parser)
+	
+	def parse(self, data):
+		with self.parser() as parser:
+			return parser.parse(data)
+	
+	def check(self, data):
+		with self.parser() as parser:
+			return parser.check(data)
@@ -0,0 +1,220 @@
+from __future__ import unicode_literals
+
+from kaml.astnodes import *
+from kaml.parser import _append
+
+__all__ = ['ExpressionError', 'ExpressionParser', 'expression_entries']
+
+# Nonterminals of the expression part of the grammar
+EXPRESSION_RULES = frozenset('''
+	expression expression-list expression-list-opt assignment-expression
+	assignment-operator conditional-expression conditional-expr-list or-test
+	and-test or-expression xor-expression and-expression equality-expression
+	relational-expression shift-expression additive-expression
+	multiplicative-expression unary-expression unary-operator postfix-expression
+	primary-expression literal integer-literal floating-literal string-literal
+	boolean-literal
+'''.split())
+
+# Tokens that can start an expression
+STARTS = frozenset(['ID', 'INT_LIT', 'FLOAT_LIT', 'STRING_LIT', 'TRUE', 'FALSE', '(', '+', '-', '!', '~'])
+
+UNARY = frozenset(['+', '-', '!', '~'])
+
+# Rows of the precedence table that aren't binary operators
+STRUCTURAL = frozenset([',', '?', ':', 'UMINUS', '.', '#'])
+
+# Binary operators that don't build a BinaryOp
+TESTS = {'OR' : 'or_test', 'AND' : 'and_test'}
+
+def expression_entries(tables):
+	""" The LR states where nothing but an expression can start.
+	
+	Maps each state to whether the expression there is a comma separated
+	list (`expression`, `expression-list`) or an `assignment-expression`.
+	"""
+	entries = {}
+	for state, actions in tables.lr_action.items():
+		# Shifts an EXPRESSION, rather than reducing what came before it
+		if actions.get('EXPRESSION', 0) <= 0:
+			continue
+		gotos = tables.lr_goto.get(state)
+		if gotos and EXPRESSION_RULES.issuperset(gotos):
+			entries[state] = 'expression' in gotos or 'expression-list' in gotos
+	return entries
+
+class ExpressionError(Exception):
+	""" Something the expression parser doesn't parse, the LR parser gets those tokens instead """
+
+class ExpressionParser(object):
+	""" A precedence climbing parser for kaml expressions.
+	
+	Builds the same nodes as the LR grammar, with one call per operator
+	instead of a reduction per precedence level. Binding powers and
+	associativity come from `precedence`, a table like Parser.precedence.
+	Not thread safe, each parse context has its own.
+	"""
+	
+	starts = STARTS
+	
+	def __init__(self, precedence):
+		self.binary = {}
+		self.assign_ops = frozenset()
+		for power, row in enumerate(precedence, 1):
+			assoc, ops = row[0], row[1:]
+			if '=' in ops:
+				self.assign_ops = frozenset(ops) - STRUCTURAL
+				continue
+			for op in ops:
+				if op not in STRUCTURAL:
+					self.binary[op] = (power, assoc == 'right')
+		self.lowest = min(power for power, _ in self.binary.values())
+		
+		self.tok = None
+		self.token = None
+		self.consumed = []
+		# The end offset of the last token parsed
+		self.end = None
+	
+	def parse(self, tok, token, comma = True):
+		""" Parse the expression that starts with `tok`, reading on with `token()`.
+		
+		With `comma` it's an `expression`, otherwise an `assignment-expression`.
+		Returns the expression and the token after it. Every token read is in
+		`consumed`, for when ExpressionError is raised.
+		"""
+		self.tok = tok
+		self.token = token
+		self.consumed = [tok]
+		node = self.expression() if comma else self.assignment()
+		return node, self.tok
+	
+	def advance(self):
+		tok = self.tok
+		self.end = tok.end
+		self.tok = next_tok = self.token()
+		self.consumed.append(next_tok)
+		return tok
+	
+	def expect(self, kind):
+		if self.tok is None or self.tok.type != kind:
+			raise ExpressionError(kind)
+		return self.advance()
+	
+	def start(self):
+		""" The offset of the next token, which has to be there """
+		if self.tok is None:
+			raise ExpressionError(None)
+		return self.tok.lexpos
+	
+	def span(self, node, start):
+		""" `node`, from `start` to the end of the last token """
+		node.start, node.end = start, self.end
+		return node
+	
+	def expression(self):
+		node = self.assignment()
+		while self.tok is not None and self.tok.type == ',':
+			self.advance()
+			node = _append(node, self.assignment())
+		return node
+	
+	def assignment(self):
+		start = self.start()
+		node = self.conditional()
+		tok = self.tok
+		if tok is not None and tok.type in self.assign_ops:
+			self.advance()
+			rhs = self.assignment()
+			node = self.span(Assign(node, tok.value, rhs), start)
+			node.ret_type = getattr(rhs, 'ret_type', type(rhs))
+		return node
+	
+	def conditional(self):
+		node = self.binary_expression(self.lowest)
+		if self.tok is not None and self.tok.type == '?':
+			self.advance()
+			middle = self.expression()
+			self.expect(':')
+			node = Node('ternary', (node, middle, self.assignment()))
+		return node
+	
+	def binary_expression(self, min_power):
+		start = self.start()
+		lhs = self.unary()
+		binary = self.binary
+		while True:
+			tok = self.tok
+			if tok is None or tok.type not in binary:
+				return lhs
+			power, right = binary[tok.type]
+			if power < min_power:
+				return lhs
+			
+			self.advance()
+			rhs = self.binary_expression(power if right else power + 1)
+			if tok.type in TESTS:
+				lhs = Node(TESTS[tok.type], [lhs, rhs])
+			else:
+				lhs = self.span(BinaryOp(lhs, tok.value, rhs), start)
+	
+	def unary(self):
+		tok = self.tok
+		if tok is not None and tok.type in UNARY:
+			self.advance()
+			return Node('UnaryOp', [tok.value, self.unary()])
+		return self.postfix()
+	
+	def postfix(self):
+		start = self.start()
+		tok = self.tok
+		kind = tok.type
+		if kind == 'ID':
+			self.advance()
+			node = tok.value
+		elif kind == '(':
+			self.advance()
+			node = self.expression()
+			self.expect(')')
+		elif kind == 'INT_LIT' or kind == 'FLOAT_LIT':
+			self.advance()
+			node = self.span(NumberLiteral(tok.value), start)
+			node.ret_type = int if kind == 'INT_LIT' else float
+		elif kind == 'STRING_LIT':
+			self.advance()
+			node = StringLiteral(tok.value)
+			node.ret_type = str
+			while self.tok is not None and self.tok.type == 'STRING_LIT':
+				node.value += self.advance().value
+			self.span(node, start)
+		elif kind == 'TRUE' or kind == 'FALSE':
+			self.advance()
+			node = self.span(BoolLiteral(tok.value == 'TRUE'), start)
+			node.ret_type = bool
+		else:
+			raise ExpressionError(kind)
+		
+		while self.tok is not None:
+			kind = self.tok.type
+			if kind == '[':
+				self.advance()
+				subscript = self.conditional()
+				while self.tok is not None and self.tok.type == ',':
+					self.advance()
+					subscript = _append(subscript, self.conditional())
+				self.expect(']')
+				node = self.span(GetItem(node, subscript), start)
+			elif kind == 'SCOPEDID':
+				node = self.span(GetAttr(node, self.advance().value), start)
+			elif kind == '(':
+				self.advance()
+				args = [] if self.tok is not None and self.tok.type == ')' else self.expression()
+				self.expect(')')
+				node = self.span(FuncCall(node, args if isinstance(args, list) else [args]), start)
+			elif kind == '#' or kind == '.':
+				# Calls with #id and .class, left to the LR parser
+				raise ExpressionError(kind)
+			else:
+				return node
+		
+		return node
@@ -0,0 +1,211 @@
+from __future__ import unicode_literals
+
+from kaml.astnodes import *
+from kaml.astnodes import ASTNode, Expr, Scope, _VALUES
+
+__all__ = ['resolve']
+
+class _Frame(object):
+	""" The slots of a function while it's resolved """
+	__slots__ = ('names', 'free', 'level')
+	
+	def __init__(self, level):
+		self.names = []
+		self.free = []
+		self.level = level
+
+# What a global name is bound to, functions' are (frame, index)
+_GLOBAL = (None, None)
+
+# The fields of the expressions and statements that have expressions in
+# them, where a string is a name. Subclasses that aren't here have their
+# base class's.
+_EXPRESSIONS = {
+	Stmt : ('stmt',),
+	ReturnStmt : ('expr',),
+	Expr : ('expr',),
+	BinaryOp : ('lhs', 'rhs'),
+	GetItem : ('base_expr', 'subscript'),
+	GetAttr : ('base_expr',),
+	FuncCall : ('fn_name', 'params'),
+	TagCall : ('fn_name', 'params', 'kwargs'),
+}
+
+# Steps of the walk that aren't a part of the tree to resolve
+_BIND, _SET, _ENTER, _LEAVE, _POP = range(5)
+
+def resolve(tree):
+	""" Find what each name in `tree` is, for an evaluator that keeps each
+	function's locals in an array, a frame, rather than in a dict for each
+	scope. `tree` is changed in place, and returned.
+	
+	Each name becomes an Identifier, where it's used and where it's bound,
+	the name of a VariableDecl, SetStmt, FuncDecl or parameter. Its `depth`
+	and `index` find it: `depth` frames out from the function it's in, at
+	`index`. They're None for globals: names at the top level, and names
+	that aren't bound anywhere around the use. FuncDef gets the names of its
+	frame's slots as `locals` and the names it has from the functions around
+	it as `free`.
+	
+	Names are bound in the order of the tree. Parameters are bound in the
+	function, their defaults are found outside it. A VariableDecl binds a
+	new local in the innermost Suite around it, unless the name is already
+	bound around it, like Scope; -set only ever assigns to a name that's
+	there. Each local has its own slot, a name in a Suite that hides the
+	same name outside it has another one. Keyword parameters come last, in
+	the order of their names, and only have their slot, in `locals`.
+	
+	Nodes that are in the tree more than once, as in an interned tree, would
+	have to be resolved for each place, and raise a ValueError.
+	"""
+	scope = Scope()
+	# The function the walk is in, None at the top level
+	frames = [None]
+	seen = set()
+	values = _VALUES
+	
+	def lookup(name):
+		""" An Identifier for `name`, used where the walk is """
+		if type(name) is Identifier:
+			name = name.name
+		frame, index = scope[name] if name in scope else _GLOBAL
+		if frame is None:
+			return Identifier(name)
+		
+		depth = frames[-1].level - frame.level
+		if depth and name not in frames[-1].free:
+			frames[-1].free.append(name)
+		return Identifier(name, depth, index)
+	
+	def bind(name, declare = False):
+		""" An Identifier for `name`, bound where the walk is: a new local,
+		unless it's bound around the walk already and not `declare`d
+		"""
+		if type(name) is Identifier:
+			name = name.name
+		frame = frames[-1]
+		if declare or name not in scope:
+			if frame is None:
+				scope[name] = _GLOBAL
+			else:
+				scope.declare(name, (frame, len(frame.names)))
+				frame.names.append(name)
+		return lookup(name)
+	
+	def expression(value):
+		""" `value` with the names in it resolved, with its nodes pushed to
+		be resolved in turn
+		"""
+		kind = type(value)
+		if kind is unicode or kind is str or kind is Identifier:
+			return lookup(value)
+		if kind in values:
+			return value
+		if kind is tuple:
+			return tuple(expression(item) for item in value)
+		push(value)
+		return value
+	
+	stack = [tree]
+	pop, push = stack.pop, stack.append
+	while stack:
+		node = pop()
+		kind = type(node)
+		
+		if kind is tuple:
+			step = node[0]
+			if step == _BIND:
+				node[1].name = bind(node[1].name)
+			elif step == _SET:
+				node[1].name = lookup(node[1].name)
+			elif step == _POP:
+				scope.pop()
+			elif step == _ENTER:
+				args = node[1]
+				outer = frames[-1]
+				frames.append(_Frame(outer.level + 1 if outer is not None else 0))
+				scope.push()
+				for decl in args.positional:
+					decl.name = bind(decl.name, True)
+				if args.hash_arg is not None:
+					args.hash_arg.name = bind(args.hash_arg.name, True)
+				for decl in args.dot_args or ():
+					decl.name = bind(decl.name, True)
+				for key in sorted(args.kwargs):
+					bind(key, True)
+			else:
+				func = node[1]
+				frame = frames.pop()
+				scope.pop()
+				func.locals, func.free = tuple(frame.names), tuple(frame.free)
+			continue
+		
+		if kind is list:
+			for i, item in enumerate(node):
+				node[i] = expression(item)
+			continue
+		if kind is dict:
+			for key, item in node.items():
+				node[key] = expression(item)
+			continue
+		if id(node) in seen:
+			raise ValueError('{!r} is in the tree more than once, resolve a tree that isn\'t interned'.format(node))
+		seen.add(id(node))
+		
+		if kind is Node:
+			children = node.children
+			if node.node_type == 'UnaryOp':
+				# The operator, then the operand
+				node.children = type(children)([children[0]] + [expression(child) for child in children[1:]])
+			else:
+				node.children = expression(children)
+		elif kind is TranslationUnit:
+			stack.extend(reversed(node.declarations))
+		elif isinstance(node, Suite):
+			scope.push()
+			push((_POP,))
+			stack.extend(reversed(node.suite))
+		elif kind is VariableDecl:
+			push((_BIND, node))
+			node.initial = expression(node.initial)
+		elif kind is SetStmt:
+			push((_SET, node))
+			node.value = expression(node.value)
+		elif kind is FuncDef:
+			node.decl.name = bind(node.decl.name)
+			push((_LEAVE, node))
+			push(node.suite)
+			push((_ENTER, node.decl.args))
+			# The defaults are found outside the function
+			args = node.decl.args
+			for decl in reversed(args.positional):
+				decl.initial = expression(decl.initial)
+			for key, default in args.kwargs.items():
+				args.kwargs[key] = expression(default)
+		elif kind is IfStmt:
+			if node.false_suite is not None:
+				push(node.false_suite)
+			push(node.true_suite)
+			node.condition = expression(node.condition)
+		elif kind is WhileStmt:
+			push(node.suite)
+			node.condition = expression(node.condition)
+		elif kind is ForStmt:
+			push(node.suite)
+			node.expressions = expression(node.expressions)
+		elif kind is UseStmt or not isinstance(node, ASTNode):
+			# A UseStmt has the names of modules, not of values
+			continue
+		else:
+			for field in _fields(kind):
+				setattr(node, field, expression(getattr(node, field)))
+	return tree
+
+def _fields(cls):
+	""" The fields of `cls` that have expressions in them """
+	for base in cls.__mro__:
+		if base in _EXPRESSIONS:
+			fields = _EXPRESSIONS[cls] = _EXPRESSIONS[base]
+			return fields
+	_EXPRESSIONS[cls] = ()
+	return ()
@@ -0,0 +1,57 @@
+from __future__ import unicode_literals
+from bisect import bisect_right
+
+__all__ = ['SourceMap']
+
+class SourceMap(object):
+	""" Converts offsets into a source string to 1-based (line, column) pairs.
+	
+	The offsets of the line starts are found once, on the first lookup, after
+	which each lookup is a bisect over them.
+	"""
+	__slots__ = ('source', '_line_starts')
+	
+	def __init__(self, source):
+		self.source = source
+		self._line_starts = None
+	
+	@property
+	def line_starts(self):
+		if self._line_starts is None:
+			starts = [0]
+			find = self.source.find
+			pos = find('\n')
+			while pos != -1:
+				pos += 1
+				starts.append(pos)
+				pos = find('\n', pos)
+			self._line_starts = starts
+		return self._line_starts
+	
+	def line(self, offset):
+		return bisect_right(self.line_starts, offset)
+	
+	def location(self, offset):
+		starts = self.line_starts
+		line = bisect_right(starts, offset)
+		return (line, offset - starts[line - 1] + 1)
+	
+	def span(self, start, end):
+		""" (line, column) of both ends of the half open range [start, end) """
+		return (self.location(start), self.location(end))
+	
+	def offset(self, line, column):
+		""" Inverse of `location` """
+		starts = self.line_starts
+		if not 0 < line <= len(starts):
+			raise IndexError('Line {} out of range'.format(line))
+		return starts[line - 1] + column - 1
+	
+	def line_text(self, line):
+		starts = self.line_starts
+		start = starts[line - 1]
+		end = starts[line] - 1 if line < len(starts) else len(self.source)
+		return self.source[start:end]
+	
+	def __len__(self):
+		return len(self.line_starts)
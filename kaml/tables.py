@@ -0,0 +1,15 @@
+from __future__ import unicode_literals
+
+from kaml.lexer import Lexer
+from kaml.parser import Parser
+
+def write_tables():
+	""" Write kaml/lextab.py and kaml/parsetab.py, the tables that Lexer and
+	Parser load instead of building them. Run it with `make tables` after
+	changing the lexer rules or the grammar, and ship the files it writes.
+	"""
+	Lexer().write_lextab()
+	Parser().write_parsetab()
+
+if __name__ == '__main__':
+	write_tables()
@@ -0,0 +1,121 @@
+from __future__ import unicode_literals
+import mmap, os, shutil, struct, tempfile
+import unittest
+
+from .. import astio
+from ..astnodes import *
+from ..parser import Parser
+from .test_spans import spans
+from .utils import synthetic_template
+
+CODE = '''x = a:b + 1;
+-def f#id.cls[size=1](a, b=2.5) { -return a ? "h\u00e9llo" : !b; }
+y = 123456789012345678901234567890;
+'''
+
+class TestAstIO(unittest.TestCase):
+	
+	def setUp(self):
+		self.parser = Parser()
+	
+	def round_trip(self, tree):
+		return astio.load(astio.dumps(tree))
+	
+	def test_round_trip(self):
+		tree = self.parser.parse(CODE)
+		loaded = self.round_trip(tree)
+		self.assertEqual(tree, loaded)
+		self.assertEqual(spans(tree), spans(loaded))
+		self.assertEqual(tree.declarations[0].stmt.initial.ret_type, loaded.declarations[0].stmt.initial.ret_type)
+		self.assertEqual(123456789012345678901234567890, loaded.declarations[2].stmt.initial.number)
+		self.assertEqual(['size'], list(loaded.declarations[1].decl.args.kwargs))
+		
+		tree = self.parser.parse(synthetic_template(5))
+		self.assertEqual(tree, self.round_trip(tree))
+	
+	def test_values(self):
+		tree = Suite(Node('UnaryOp', ['-', 1.5], 'leaf'), StringLiteral(b'\xff'), (-1 << 40, True, None), int, str, Suite)
+		loaded = self.round_trip(tree)
+		self.assertEqual(tree, loaded)
+		self.assertEqual(b'\xff', loaded.suite[1].value)
+		self.assertIs(str, type(loaded.suite[1].value))
+		self.assertEqual('leaf', loaded.suite[0].leaf)
+		self.assertEqual((int, str, Suite), tuple(loaded.suite[3:]))
+		self.assertEqual(EmptyNode(), self.round_trip(EmptyNode()))
+		self.assertEqual([], self.round_trip([]))
+	
+	def test_unset_slots(self):
+		stmt = Stmt.__new__(Stmt)
+		stmt.start = 4
+		loaded = self.round_trip(stmt)
+		self.assertEqual(4, loaded.start)
+		self.assertRaises(AttributeError, getattr, loaded, 'stmt')
+	
+	def test_strings_once(self):
+		tree = self.parser.parse('x = aaaaaaaaaa; y = aaaaaaaaaa; z = aaaaaaaaaa;')
+		data = astio.dumps(tree)
+		self.assertEqual(1, data.count(b'aaaaaaaaaa'))
+		loaded = astio.load(data)
+		names = [stmt.stmt.initial for stmt in loaded.declarations]
+		self.assertIs(names[0], names[2])
+	
+	def test_lazy(self):
+		code = synthetic_template(3)
+		tree = self.round_trip(Parser(lazy = True).parse(code))
+		self.assertIs(LazySuite, type(tree.declarations[1].suite))
+		self.assertEqual(self.parser.parse(code), tree)
+	
+	def test_shared(self):
+		code = 'x = a:b + 1; y = a:b + 1; -def f(a) { -return a:b + 1; }'
+		tree = Parser(intern = True).parse(code)
+		data = astio.dumps(tree)
+		# Written once
+		self.assertLess(len(data), len(astio.dumps(Parser(spans = False).parse(code))))
+		loaded = astio.load(data)
+		self.assertEqual(tree, loaded)
+		x, y, f = loaded.declarations
+		self.assertIs(x.stmt.initial, y.stmt.initial)
+		self.assertIs(x.stmt.initial, f.suite.suite[0].expr)
+	
+	def test_buffers(self):
+		tree = self.parser.parse(CODE)
+		data = astio.dumps(tree)
+		self.assertEqual(tree, astio.load(memoryview(data)))
+		self.assertEqual(tree, astio.load(bytearray(data)))
+		
+		path = tempfile.mkdtemp()
+		try:
+			name = os.path.join(path, 'tree.kast')
+			with open(name, 'wb') as f:
+				astio.dump(tree, f)
+			with open(name, 'rb') as f:
+				self.assertEqual(tree, astio.load(f))
+			with open(name, 'rb') as f:
+				view = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+				try:
+					self.assertEqual(tree, astio.load(view))
+				finally:
+					view.close()
+		finally:
+			shutil.rmtree(path)
+	
+	def test_errors(self):
+		self.assertRaises(TypeError, astio.dumps, Suite(object()))
+		self.assertRaises(TypeError, astio.dumps, Suite(object))
+		
+		data = astio.dumps(self.parser.parse(CODE))
+		self.assertRaises(ValueError, astio.load, b'')
+		self.assertRaises(ValueError, astio.load, b'PK' + data[2:])
+		self.assertRaises(ValueError, astio.load, data[:-1])
+		self.assertRaises(ValueError, astio.load, data[:4] + struct.pack(str('<I'), 99) + data[8:])
+		
+		# A class whose slots have changed
+		changed = data.replace(b'"VariableDecl",["start","end","ret_type","name","initial"]',
+			b'"VariableDecl",["start","end","ret_type","nome","initial"]')
+		self.assertNotEqual(data, changed)
+		with self.assertRaises(ValueError) as raised:
+			astio.load(changed)
+		self.assertIn('VariableDecl', str(raised.exception))
+
+if __name__ == '__main__':
+	unittest.main()
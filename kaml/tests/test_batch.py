@@ -0,0 +1,134 @@
+from __future__ import unicode_literals
+import io, os, shutil, tempfile
+import unittest
+
+from ..batch import _init_chunks, _parse_chunk, find_files, parse_parallel, run_batch, split_points, summary
+from ..parser import Parser, ParseException
+from .test_spans import positions
+from .utils import synthetic_template
+
+FILES = {
+	'a.kaml' : '-def fn(a) { -return a + 1; }',
+	'b.kaml' : '-use lib;',
+	'sub/c.kaml' : '-def fn2() { x = "y"; }',
+	'sub/bad.kaml' : 'x = ;',
+	'sub/lexbad.kaml' : 'x = @;',
+	'sub/notes.txt' : 'not a template',
+}
+
+class TestBatch(unittest.TestCase):
+	
+	def setUp(self):
+		self.root = tempfile.mkdtemp()
+		for name, code in FILES.items():
+			path = os.path.join(self.root, name)
+			if not os.path.isdir(os.path.dirname(path)):
+				os.makedirs(os.path.dirname(path))
+			with io.open(path, 'w', encoding = 'utf-8') as fp:
+				fp.write(code)
+	
+	def tearDown(self):
+		shutil.rmtree(self.root)
+	
+	def path(self, name):
+		return os.path.join(self.root, name)
+	
+	def test_find_files(self):
+		self.assertEqual(
+			[self.path(n) for n in ('b.kaml', 'sub/bad.kaml', 'sub/c.kaml', 'sub/lexbad.kaml')],
+			find_files([self.path('b.kaml'), self.path('sub')])
+		)
+		# Files that are named explicitly are always included
+		self.assertEqual([self.path('sub/notes.txt')], find_files([self.path('sub/notes.txt')]))
+		self.assertEqual(5, len(find_files([self.root])))
+	
+	def check(self, jobs, lexer_only):
+		results = dict((os.path.relpath(r.path, self.root), r) for r in run_batch(find_files([self.root]), jobs, lexer_only))
+		failed = set(['sub/lexbad.kaml']) if lexer_only else set(['sub/bad.kaml', 'sub/lexbad.kaml'])
+		
+		self.assertEqual(set(n for n in FILES if n.endswith('.kaml')), set(results))
+		self.assertEqual(failed, set(n for n, r in results.items() if not r.ok))
+		self.assertTrue(all(r.seconds >= 0 for r in results.values()))
+		self.assertIn('LexError', results['sub/lexbad.kaml'].error)
+		if not lexer_only:
+			self.assertIn('ParseException', results['sub/bad.kaml'].error)
+		
+		text = summary(list(results.values()), 1.0)
+		self.assertIn('5 files, {} errors'.format(len(failed)), text)
+		self.assertIn('5.0 files/s', text)
+	
+	def test_in_process(self):
+		self.check(1, False)
+		self.check(1, True)
+	
+	def test_pool(self):
+		self.check(2, False)
+		self.check(2, True)
+	
+	def test_check(self):
+		for jobs in (1, 2):
+			results = dict((os.path.relpath(r.path, self.root), r) for r in run_batch(find_files([self.root]), jobs, check = True))
+			self.assertEqual(set(['sub/bad.kaml', 'sub/lexbad.kaml']), set(n for n, r in results.items() if not r.ok))
+			self.assertEqual([(1, 5)], [(d.line, d.column) for d in results['sub/bad.kaml'].diagnostics])
+			# The parser then sees `x = ;`
+			self.assertEqual(['lex', 'parse'], [d.kind for d in results['sub/lexbad.kaml'].diagnostics])
+			self.assertEqual((), results['a.kaml'].diagnostics)
+
+class TestParseParallel(unittest.TestCase):
+	
+	def assertParallel(self, code, parser = None, workers = 3):
+		parser = parser or Parser()
+		expected = parser.parse(code)
+		tree = parser.parse_parallel(code, workers)
+		self.assertEqual(expected, tree)
+		self.assertEqual(positions(expected), positions(tree))
+		return tree
+	
+	def test_same_tree(self):
+		code = synthetic_template(12)
+		self.assertGreater(len(split_points(code, 6)), 3)
+		self.assertParallel(code)
+		self.assertParallel(code, Parser(spans = False))
+		self.assertParallel(code, Parser(pratt = True))
+	
+	def test_lazy(self):
+		code = synthetic_template(12)
+		tree = Parser(lazy = True).parse_parallel(code, 3)
+		# Bodies keep the source, without it being sent back from each process
+		self.assertIs(code, tree.declarations[1].suite._body[3])
+		self.assertEqual(Parser().parse(code), tree)
+	
+	def test_split_points(self):
+		code = 'a = 1;\n-if (a) { b = 1; }\n-else { b = 2; }\ns = "x;\ny;" {{{ z; }}};\n/* c;\n*/ x = 2;\n'
+		self.assertEqual([code.index('-if'), code.index('s ='), code.index('x =')], split_points(code, 40))
+		self.assertEqual([code.index('s =')], split_points(code, 2))
+		self.assertEqual([], split_points('-def fn() { a = 1; b = 2; }', 4))
+		self.assertEqual([], split_points('a = 1;\nb = `;\nc = 2;\n', 4))
+	
+	def test_no_splits_in_strings_or_comments(self):
+		component = synthetic_template(1)
+		code = component * 3 + '/*\n' + 'a = 1;\n' * 50 + '*/\n' + component * 3
+		self.assertFalse(any(code.index('/*') < p < code.index('*/') for p in split_points(code, 6)))
+		self.assertParallel(code)
+		code = synthetic_template(20) + 's = "\nx = 1;\ny = 2;\nz = 3;\n";\n' + synthetic_template(20)
+		self.assertFalse(any(code.index('s =') < p < code.index('";') for p in split_points(code, 100)))
+		self.assertParallel(code, workers = 2)
+	
+	def test_chunks_that_dont_parse(self):
+		# A part that doesn't lex, starting in the string, is left to the parse of the whole
+		code = 'x = 1;\ns = "\nx = 1;\n";\n'
+		_init_chunks((Parser, {}), code)
+		self.assertIsNone(_parse_chunk((code.index('x = 1;\n";'), len(code))))
+		self.assertEqual(1, len(_parse_chunk((0, code.index('s =')))))
+		
+		component = synthetic_template(1)
+		with self.assertRaises(ParseException):
+			Parser().parse_parallel(component * 6 + 'x = ;\n' + component * 6, 3)
+	
+	def test_small(self):
+		self.assertParallel('x = 1;')
+		self.assertEqual([], Parser().parse_parallel(''))
+		self.assertEqual(Parser().parse('x = 1;\ny = 2;\n'), parse_parallel(Parser(), 'x = 1;\ny = 2;\n', 1))
+
+if __name__ == '__main__':
+	unittest.main()
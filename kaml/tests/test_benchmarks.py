@@ -0,0 +1,508 @@
+from __future__ import unicode_literals
+from collections import deque
+from functools import partial
+from types import MethodType
+import multiprocessing, os, shutil, subprocess, sys, tempfile
+import unittest
+
+try:
+	import cPickle as pickle
+except ImportError:
+	import pickle
+
+from ply import yacc
+
+from .. import astio, outline
+from ..batch import split_points
+from ..astnodes import ASTNode, FuncDef, IfStmt
+from ..lexer import Lexer
+from ..parsecache import ParseCache
+from ..parser import Parser
+from ..pool import ParserPool
+from ..resolver import resolve
+from ..visitor import NodeTransformer, NodeVisitor
+from .utils import R, best_time, report, run_threads, synthetic_template
+
+MB = 1 << 20
+
+def raw_block(size):
+	""" A `{{{ }}}` block of roughly `size` characters that splits into many STRING_LIT fragments """
+	line = 'Lorem ipsum dolor sit amet, costs $ 5 } consectetur adipiscing elit sed do\n'
+	return R(line * (size // len(line)))
+
+class TestLexerBenchmarks(unittest.TestCase):
+	
+	def _tokenize(self, code):
+		return list(Lexer().tokenize(code))
+	
+	def test_rawstr_coalescing_scales_linearly(self):
+		small = raw_block(MB)
+		large = raw_block(10 * MB)
+		
+		t_small = best_time(lambda: self._tokenize(small))
+		t_large = best_time(lambda: self._tokenize(large), repeat = 1)
+		
+		tokens = self._tokenize(large)
+		self.assertEqual(1, len([t for t in tokens if t]))
+		self.assertEqual(len(large) - 6, len(tokens[0].value))
+		
+		ratio = t_large / t_small
+		report('rawstr coalescing', small_s = t_small, large_s = t_large, ratio = ratio,
+			mb_per_s = 10 / t_large)
+		# 10x the input; a quadratic join would be ~100x
+		self.assertLess(ratio, 20)
+	
+	def test_tokens_per_second(self):
+		code = synthetic_template(500)
+		n_tokens = len(self._tokenize(code))
+		
+		lexer = Lexer()
+		# Consume without keeping the tokens, so the figure isn't dominated by gc
+		elapsed = best_time(lambda: deque(lexer.tokenize(code), maxlen = 0), repeat = 10)
+		report('tokens per second', tokens = n_tokens, tok_per_s = int(n_tokens / elapsed))
+	
+	def test_token_buffer_bytes_per_token(self):
+		code = synthetic_template(500)
+		tokens = [t for t in Lexer().tokenize(code) if t]
+		buf = Lexer().tokenize_buffer(code)
+		
+		seen = set()
+		def size(obj):
+			# Shared objects (interned names, small ints) are only counted once
+			if id(obj) in seen:
+				return 0
+			seen.add(id(obj))
+			return sys.getsizeof(obj)
+		
+		list_bytes = size(tokens) + sum(
+			size(t) + size(t.__dict__) + sum(size(v) for v in t.__dict__.values())
+			for t in tokens
+		)
+		
+		seen.clear()
+		buf_bytes = buf.nbytes() + size(buf.values) + size(buf._value_ids) + sum(
+			size(v) + size(k) for k, v in buf._value_ids.items()
+		) + sum(size(v) for v in buf.values)
+		
+		report('token memory', tokens = len(buf),
+			lextoken_bytes_per_token = list_bytes / float(len(tokens)),
+			buffer_bytes_per_token = buf_bytes / float(len(buf)))
+		self.assertLess(buf_bytes * 5, list_bytes)
+	
+	def test_relex_one_character(self):
+		code = synthetic_template(2000)
+		lexer = Lexer()
+		tokens = lexer.tokenize_checkpointed(code)
+		pos = code.index('x = title', len(code) // 2) + 1
+		
+		full = best_time(lambda: Lexer().tokenize_checkpointed(code), repeat = 1)
+		
+		def replace():
+			lexer.relex(tokens, pos, pos + 1, 'q')
+			lexer.relex(tokens, pos, pos + 1, 'x')
+		replaced = best_time(replace) / 2
+		
+		def insert():
+			lexer.relex(tokens, pos, pos, 'q')
+			lexer.relex(tokens, pos, pos + 1, '')
+		inserted = best_time(insert) / 2
+		
+		report('relex one character', tokens = len(tokens), full_ms = full * 1000,
+			replace_ms = replaced * 1000, insert_ms = inserted * 1000)
+		# An insertion also shifts the positions of every later token
+		self.assertLess(replaced * 50, full)
+		self.assertLess(inserted * 5, full)
+
+def statements(n):
+	""" A translation unit of `n` statements, half at the top level and half in a function body, ending with a long comma expression """
+	half = n // 2
+	return ''.join([
+		''.join('x{0} = {0};\n'.format(i) for i in range(half)),
+		'-def fn() {\n',
+		''.join('y{0} = {0};\n'.format(i) for i in range(n - half)),
+		'}\n',
+		', '.join('a{}'.format(i) for i in range(n // 10)), ';\n',
+	])
+
+LIBRARY_COMPONENT = """
+-def component{0}#id.cls[size=1](title, body=0) {{
+{1}	-return x + label;
+}}
+"""
+
+def library(n, statements = 20):
+	""" `n` components, each with a body of `statements` statements """
+	body = ''.join(
+		'\tx{0} = title + {0} * 2;\n\tlabel = \'Hello\' {{{{{{ raw }} }}}}}};\n\t{{ nested = x << 2 | 0x1f; }}\n'.format(i)
+		for i in range(statements // 3)
+	)
+	return ''.join(LIBRARY_COMPONENT.format(i, body) for i in range(n))
+
+def expressions(n):
+	""" `n` statements, each assigning an expression that goes through most of the precedence levels """
+	return ''.join(
+		'x{0} = a{0} + b * {0} - c[{0}] / 2 << 1 | d && e == f(g, {0}) || h < -i;\n'.format(i)
+		for i in range(n)
+	)
+
+def nested(depth):
+	""" A function with `depth` -if suites, one in another, each binding a name
+	and using the parameter and the name of the suite around it
+	"""
+	return ''.join([
+		'-def fn(a) {\n',
+		''.join('-if (a) {{ x{0} = a + x{1};\n'.format(i, max(i - 1, 0)) for i in range(depth)),
+		'-return a;', ' }' * depth, '\n}\n',
+	])
+
+def node_bytes(tree):
+	""" The number of ASTNodes in `tree`, and the bytes they take. Counts each
+	node once, however often it's in the tree, and its __dict__ and the bound
+	methods in it, but not the values that nodes share or that are in the
+	tree without them.
+	"""
+	nodes, total = 0, 0
+	seen = set()
+	stack = [tree]
+	while stack:
+		node = stack.pop()
+		if id(node) in seen:
+			continue
+		seen.add(id(node))
+		if isinstance(node, (list, tuple)):
+			stack.extend(node)
+		elif isinstance(node, dict):
+			stack.extend(node.values())
+		elif isinstance(node, ASTNode):
+			nodes += 1
+			total += sys.getsizeof(node)
+			state = getattr(node, '__dict__', None)
+			if state is not None:
+				total += sys.getsizeof(state) + sum(sys.getsizeof(v) for v in state.values() if isinstance(v, MethodType))
+			stack.extend(getattr(node, slot, None) for cls in type(node).__mro__
+				for slot in getattr(cls, '__slots__', ()) if slot not in ('start', 'end', 'ret_type', '__dict__'))
+	return nodes, total
+
+class TestParserBenchmarks(unittest.TestCase):
+	
+	def test_sequences_scale_linearly(self):
+		parser = Parser()
+		times = {}
+		for n in (1000, 10000, 100000):
+			code = statements(n)
+			times[n] = best_time(lambda: parser.parse(code), repeat = 3 if n < 100000 else 1)
+		
+		tree = parser.parse(statements(1000))
+		self.assertEqual(500 + 1 + 1, len(tree.declarations))
+		self.assertEqual(500, len(tree.declarations[500].suite.suite))
+		self.assertEqual(100, len(tree.declarations[-1].stmt))
+		
+		report('parse scaling', **{'{}k_s'.format(n // 1000) : t for n, t in times.items()})
+		# 100x the statements; copying the sequences on every append is ~10000x
+		self.assertLess(times[100000] / times[1000], 300)
+	
+	def test_expressions_per_second(self):
+		n = 2000
+		code = expressions(n)
+		lr = Parser()
+		pratt = Parser(pratt = True)
+		self.assertEqual(repr(lr.parse(expressions(10))), repr(pratt.parse(expressions(10))))
+		
+		# In turn, so a slow patch of the machine hits both
+		t_lr = t_pratt = float('inf')
+		for _ in range(10):
+			t_lr = min(t_lr, best_time(lambda: lr.parse(code), repeat = 1))
+			t_pratt = min(t_pratt, best_time(lambda: pratt.parse(code), repeat = 1))
+		
+		report('expressions per second', lr_expr_per_s = int(n / t_lr), pratt_expr_per_s = int(n / t_pratt),
+			speedup = t_lr / t_pratt)
+		# ~1.9x, so only a much slower Pratt parser fails this
+		self.assertLess(t_pratt, t_lr)
+	
+	def test_span_overhead(self):
+		code = synthetic_template(20)
+		parsers = {
+			'spans' : partial(Parser().parse, code),
+			'plain' : partial(Parser(spans = False).parse, code),
+			'tracking' : partial(Parser(spans = False).parse, code, tracking = 1),
+		}
+		# One parse of each in turn, so a slow patch of the machine hits all of them
+		best = dict.fromkeys(parsers, float('inf'))
+		for _ in range(100):
+			for name, parse in parsers.items():
+				best[name] = min(best[name], best_time(parse, repeat = 1))
+		
+		report('span overhead', overhead_pct = (best['spans'] / best['plain'] - 1) * 100,
+			**{'{}_ms'.format(name) : t * 1000 for name, t in best.items()})
+		self.assertLess(best['spans'], best['plain'] * 1.10)
+		self.assertLess(best['spans'], best['tracking'] * 1.1)
+	
+	def test_parse_cache(self):
+		# About the size of test.kaml
+		code = synthetic_template(7)
+		parse = best_time(lambda: Parser().parse(code), repeat = 5)
+		
+		cached = Parser(cache = ParseCache())
+		cached.parse(code)
+		memory = best_time(lambda: cached.parse(code), repeat = 5)
+		
+		path = tempfile.mkdtemp()
+		try:
+			Parser(cache = ParseCache(path = path)).parse(code)
+			disk = best_time(lambda: Parser(cache = ParseCache(path = path)).parse(code), repeat = 5)
+		finally:
+			shutil.rmtree(path)
+		
+		report('parse cache', chars = len(code), parse_ms = parse * 1000,
+			memory_hit_ms = memory * 1000, disk_hit_ms = disk * 1000)
+		self.assertLess(memory * 5, parse)
+		self.assertLess(disk * 2, parse)
+	
+	def test_lazy_bodies(self):
+		code = library(100)
+		eager = best_time(lambda: Parser().parse(code))
+		
+		lazy_parser = Parser(lazy = True)
+		def use(fraction):
+			tree = lazy_parser.parse(code)
+			bodies = [d.suite for d in tree.declarations if isinstance(d, FuncDef)]
+			for suite in bodies[:int(len(bodies) * fraction)]:
+				suite.suite
+		
+		figures = {'eager_ms' : eager * 1000}
+		for fraction in (0, 0.1, 0.5, 1):
+			figures['lazy_{}pct_ms'.format(int(fraction * 100))] = best_time(lambda: use(fraction)) * 1000
+		
+		report('lazy function bodies', **figures)
+		# Components are mostly body, using a tenth of them should cost well under half
+		self.assertLess(figures['lazy_10pct_ms'] * 2, figures['eager_ms'])
+		self.assertLess(figures['lazy_0pct_ms'], figures['lazy_50pct_ms'])
+	
+	def test_reparse_one_function(self):
+		parser = Parser()
+		code = library(300)
+		pos = code.index('x0 = title', code.index('-def component150'))
+		new = code[:pos] + 'x0 = title + 1;\n\t' + code[pos:]
+		full = best_time(lambda: parser.parse(new))
+		
+		trees = [parser.parse(code)]
+		def edit():
+			# Back and forth, each reparse takes the tree the last one made
+			trees[0] = parser.reparse(parser.reparse(trees[0], code, new), new, code)
+		reparse = best_time(edit) / 2
+		
+		report('reparse one function', chars = len(code), full_ms = full * 1000, reparse_ms = reparse * 1000)
+		self.assertEqual(parser.parse(code), trees[0])
+		self.assertLess(reparse * 10, full)
+	
+	def test_parse_parallel(self):
+		parser = Parser()
+		code = library(200)
+		sequential = best_time(lambda: parser.parse(code), repeat = 1)
+		workers = multiprocessing.cpu_count()
+		parallel = best_time(lambda: parser.parse_parallel(code, max(workers, 2)), repeat = 1)
+		# What this process does alone, however many cores there are: finding
+		# the splits, and loading the trees that the workers send back
+		split = best_time(lambda: split_points(code, workers * 2))
+		sent = pickle.dumps(parser.parse(code).declarations, pickle.HIGHEST_PROTOCOL)
+		receive = best_time(lambda: pickle.loads(sent))
+		
+		report('parse in parallel', chars = len(code), workers = workers, sequential_ms = sequential * 1000,
+			parallel_ms = parallel * 1000, speedup = sequential / parallel,
+			serial_ms = (split + receive) * 1000, max_speedup = sequential / (split + receive))
+		self.assertEqual(parser.parse(code), parser.parse_parallel(code, 2))
+		# Enough cores can make it at least 2x faster
+		self.assertLess((split + receive) * 2, sequential)
+		if workers >= 4:
+			self.assertLess(parallel * 2, sequential)
+	
+	def test_outline_scan(self):
+		code = library(100)
+		parse = best_time(lambda: Parser().parse(code))
+		scan = best_time(lambda: list(outline.scan(code)))
+		
+		report('outline scan', chars = len(code), parse_ms = parse * 1000, scan_ms = scan * 1000,
+			speedup = parse / scan)
+		self.assertEqual(200, len(list(outline.scan(code))))
+		self.assertLess(scan * 3, parse)
+	
+	def test_bytes_per_node(self):
+		# synthetic_template(7) is about the size of test.kaml
+		tree = Parser().parse(synthetic_template(7) * 1000)
+		nodes, total = node_bytes(tree)
+		
+		report('node memory', nodes = nodes, bytes_per_node = total / float(nodes))
+		# Slots only: no __dict__, or __repr__ bound to each node
+		self.assertLess(total / float(nodes), 100)
+	
+	def test_interning(self):
+		# Components as a site's library has them, that differ in little but names
+		code = library(50) + synthetic_template(50)
+		plain = Parser(spans = False)
+		tree, other = plain.parse(code), plain.parse(code)
+		parser = Parser(intern = True)
+		shared, again = parser.parse(code), parser.parse(code)
+		
+		nodes, total = node_bytes(tree)
+		shared_nodes, shared_total = node_bytes(shared)
+		parse = best_time(lambda: plain.parse(code))
+		intern = best_time(lambda: parser.parse(code))
+		compare = best_time(lambda: tree == other)
+		shared_compare = best_time(lambda: shared == again)
+		# Subtrees of one tree, that a plain parse has apart
+		f, g = tree.declarations[1].suite, tree.declarations[3].suite
+		item = best_time(lambda: f == g, repeat = 20)
+		shared_item = best_time(lambda: shared.declarations[1].suite == shared.declarations[3].suite, repeat = 20)
+		
+		report('interning', nodes = nodes, shared_nodes = shared_nodes, kb = total / 1024., shared_kb = shared_total / 1024.,
+			parse_ms = parse * 1000, intern_parse_ms = intern * 1000, compare_ms = compare * 1000,
+			shared_compare_us = shared_compare * 1e6, body_compare_us = item * 1e6, shared_body_compare_us = shared_item * 1e6)
+		self.assertEqual(tree, shared)
+		self.assertLess(shared_total * 5, total)
+		self.assertLess(shared_compare * 100, compare)
+	
+	def test_tree_equality(self):
+		code = synthetic_template(200)
+		parser = Parser()
+		tree, same = parser.parse(code), parser.parse(code)
+		first = parser.parse(code.replace('title + 0 * 2', 'title + 0 * 3'))
+		last = parser.parse(code.replace('total199 = component199 - 0.5', 'total199 = component199 - 1.5'))
+		equal = best_time(lambda: tree == same, repeat = 10)
+		early = best_time(lambda: tree == first, repeat = 10)
+		late = best_time(lambda: tree == last, repeat = 10)
+		# Far past the recursion limit
+		deep = 'x = {};'.format(' + '.join(['a'] * 20000))
+		deep, deep_same = parser.parse(deep), parser.parse(deep)
+		
+		report('tree equality', equal_ms = equal * 1000, first_item_ms = early * 1000, last_item_ms = late * 1000,
+			deep_ms = best_time(lambda: deep == deep_same) * 1000)
+		self.assertFalse(tree == first or tree == last)
+		# Stops at the first difference, the items are compared in order. One
+		# in the last item is found after about as much work as equal trees.
+		self.assertLess(early * 20, equal)
+	
+	def test_visitor_nodes_per_second(self):
+		tree = Parser().parse(synthetic_template(200))
+		
+		class Count(NodeVisitor):
+			nodes = 0
+			def generic_visit(self, node):
+				self.nodes += 1
+		
+		class Naive(object):
+			""" Recursion, and a getattr for each node's method """
+			nodes = 0
+			def visit(self, node):
+				if isinstance(node, (list, tuple)):
+					for item in node:
+						self.visit(item)
+				elif isinstance(node, dict):
+					self.visit(node.values())
+				elif isinstance(node, ASTNode):
+					getattr(self, 'visit_' + type(node).__name__, self.generic_visit)(node)
+					for field in node._fields:
+						self.visit(getattr(node, field))
+			def generic_visit(self, node):
+				self.nodes += 1
+		
+		counter, naive = Count(), Naive()
+		counter.visit(tree)
+		naive.visit(tree)
+		nodes = counter.nodes
+		visit = best_time(lambda: Count().visit(tree))
+		recursive = best_time(lambda: Naive().visit(tree))
+		transform = best_time(lambda: NodeTransformer().visit(tree))
+		
+		report('visitor', nodes = nodes, visitor_nodes_per_s = int(nodes / visit),
+			naive_nodes_per_s = int(nodes / recursive), transformer_nodes_per_s = int(nodes / transform))
+		self.assertEqual(naive.nodes, nodes)
+		self.assertLess(visit, recursive)
+	
+	def test_astio_load(self):
+		code = synthetic_template(200)
+		parser = Parser()
+		tree = parser.parse(code)
+		data = astio.dumps(tree)
+		pickled = pickle.dumps(tree, 2)
+		self.assertEqual(tree, astio.load(memoryview(data)))
+		
+		parse = best_time(lambda: parser.parse(code))
+		load = best_time(lambda: astio.load(data))
+		unpickle = best_time(lambda: pickle.loads(pickled))
+		
+		report('astio load', chars = len(code), kb = len(data) / 1024., pickle_kb = len(pickled) / 1024.,
+			parse_ms = parse * 1000, load_ms = load * 1000, unpickle_ms = unpickle * 1000, speedup = parse / load)
+		self.assertLess(load * 10, parse)
+	
+	def test_resolve_nested_suites(self):
+		parser = Parser()
+		times = {}
+		for depth in (250, 1000):
+			tree = parser.parse(nested(depth))
+			# Resolving a resolved tree again is the same work
+			times[depth] = best_time(lambda: resolve(tree))
+		
+		tree = resolve(parser.parse(nested(1000)))
+		innermost = tree.declarations[0].suite.suite[0]
+		while isinstance(innermost.true_suite.suite[-1], IfStmt):
+			innermost = innermost.true_suite.suite[-1]
+		decl = innermost.true_suite.suite[0].stmt
+		self.assertEqual(('x999', 0, 1000), (decl.name.name, decl.name.depth, decl.name.index))
+		self.assertEqual((0, 0), (decl.initial.lhs.depth, decl.initial.lhs.index))
+		self.assertEqual((0, 999), (decl.initial.rhs.depth, decl.initial.rhs.index))
+		
+		report('resolve nested suites', **dict(('depth{}_ms'.format(depth), t * 1000) for depth, t in times.items()))
+		# 4x the depth; walking a stack of dicts for each name is ~16x
+		self.assertLess(times[1000] / times[250], 8)
+	
+	def test_thread_throughput(self):
+		code = synthetic_template(20)
+		pool = ParserPool(size = 4)
+		parses = 32
+		
+		def work(threads):
+			def run(i):
+				for _ in range(parses // threads):
+					pool.parse(code)
+			run_threads(threads, run)
+		
+		figures = {}
+		for threads in (1, 2, 4):
+			figures['{}_threads_per_s'.format(threads)] = parses / best_time(lambda: work(threads))
+		
+		# Only reported. The parsers share nothing, but parsing is pure Python
+		# and holds the GIL, so under CPython throughput doesn't scale with
+		# threads: the figures stay about flat, whatever the number of cores.
+		# Use kaml.batch.parse_parallel, with processes, to parse on more cores.
+		report('parse throughput', **figures)
+
+STARTUP = """
+import timeit
+start = timeit.default_timer()
+import kaml
+kaml.get_parser().parse('-def fn(a) { -return a + 1; }')
+print(timeit.default_timer() - start)
+"""
+
+class TestStartupBenchmarks(unittest.TestCase):
+	
+	def test_import_and_first_parse(self):
+		root = os.path.join(os.path.dirname(__file__), '..', '..')
+		out = subprocess.check_output([sys.executable, '-c', STARTUP], cwd = root)
+		report('startup', import_and_first_parse_s = float(out.decode('ascii')))
+	
+	def test_parser_construction(self):
+		Parser()
+		cached = best_time(Parser, repeat = 5)
+		
+		def build():
+			# What every Parser() used to do when the tables weren't written
+			p = Parser()
+			yacc.yacc(module = p, debug = False, write_tables = False, tabmodule = 'kaml._no_such_tab')
+		uncached = best_time(build, repeat = 1)
+		
+		report('parser construction', cached_ms = cached * 1000, uncached_ms = uncached * 1000)
+		self.assertLess(cached * 10, uncached)
+
+if __name__ == '__main__':
+	unittest.main()
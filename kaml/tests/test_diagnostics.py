@@ -0,0 +1,72 @@
+from __future__ import unicode_literals
+import unittest
+
+from ..parser import Parser, ParseException
+
+CODE = """-def fn(a) {
+  x = ;
+  y = 1 +;
+  -return a;
+}
+-def g() { z = @1; }
+-use a b;
+"""
+
+class TestDiagnostics(unittest.TestCase):
+	
+	def setUp(self):
+		self.p = Parser()
+	
+	def test_every_error(self):
+		diagnostics = self.p.check(CODE)
+		
+		self.assertEqual(
+			[('parse', 2, 7), ('parse', 3, 10), ('lex', 6, 16), ('parse', 7, 8)],
+			[(d.kind, d.line, d.column) for d in diagnostics]
+		)
+		self.assertTrue(diagnostics[0].message.startswith('unexpected ; '))
+		self.assertTrue(diagnostics[2].message.startswith('Error: illegal character '))
+		self.assertEqual(CODE.index('@'), diagnostics[2].offset)
+		self.assertEqual('INITIAL', diagnostics[2].state)
+		self.assertEqual((':', ';', 'SCOPEDID'), diagnostics[3].expected)
+		self.assertIn('ID', diagnostics[0].expected)
+		self.assertEqual(
+			"<input>:7:8: unexpected ID {!r} (expected :, ;, SCOPEDID)".format('b'),
+			str(diagnostics[3])
+		)
+	
+	def test_end_of_input(self):
+		diagnostics = self.p.check('-def f() { x = 1')
+		self.assertEqual(1, len(diagnostics))
+		self.assertEqual('unexpected end of input', diagnostics[0].message)
+		self.assertEqual(len('-def f() { x = 1'), diagnostics[0].offset)
+	
+	def test_nested_blocks(self):
+		# The `}`s closing blocks that were open at the error aren't errors
+		code = '-def f() { -if (x) { y = ; } z = 1; }\n-def g() { w = +; }'
+		self.assertEqual([(1, 26), (2, 17)], [(d.line, d.column) for d in self.p.check(code)])
+	
+	def test_consecutive_errors(self):
+		# Each one reported, not only the first of the errors a few tokens apart
+		code = 'x = ;\ny = ;\nz = ;\nw = ;\n'
+		self.assertEqual([(1, 5), (2, 5), (3, 5), (4, 5)], [(d.line, d.column) for d in self.p.check(code)])
+		code = '-def f() { a = ; b = ; }\nc = +;\n'
+		self.assertEqual([(1, 16), (1, 22), (2, 6)], [(d.line, d.column) for d in self.p.check(code)])
+		self.assertEqual([(1, 16), (1, 22), (2, 6)], [(d.line, d.column) for d in Parser(spans = False).check(code)])
+	
+	def test_errors_in_actions(self):
+		# Ones the grammar accepts, that a p_ method turns down
+		diagnostics = self.p.check('-def f(){ -set a; }\nx = ;')
+		self.assertEqual([(1, 11), (2, 5)], [(d.line, d.column) for d in diagnostics])
+		self.assertTrue(diagnostics[0].message.startswith('-set needs a name and a value'))
+		self.assertRaises(ParseException, self.p.parse, '-def f(){ -set a; }')
+	
+	def test_valid(self):
+		self.assertEqual([], self.p.check('-def fn(a) { -return a + 1; }'))
+	
+	def test_parse_still_raises(self):
+		self.p.check(CODE)
+		self.assertRaises(ParseException, self.p.parse, 'x = ;')
+
+if __name__ == '__main__':
+	unittest.main()
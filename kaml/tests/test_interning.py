@@ -0,0 +1,110 @@
+from __future__ import unicode_literals
+import pickle
+import unittest
+
+from ..astnodes import LazySuite, structural_hash
+from ..interning import Interner
+from ..parser import Parser
+from .test_spans import spans
+from .utils import synthetic_template
+
+CODE = '''x = a:b + 1;
+y = a:b + 1;
+-def f(a) { -return a:b; }
+-def g(a) { -return a:b; }
+z = 1.0;
+'''
+
+class TestInterning(unittest.TestCase):
+	
+	def setUp(self):
+		self.parser = Parser(intern = True)
+	
+	def test_shared(self):
+		tree = self.parser.parse(CODE)
+		x, y, f, g, z = tree.declarations
+		self.assertIs(x.stmt.initial, y.stmt.initial)
+		self.assertIs(f.suite, g.suite)
+		self.assertIs(x.stmt.initial.lhs, f.suite.suite[0].expr)
+		self.assertIsNot(x.stmt.name, y.stmt.name)
+		# Equal, but not the same
+		self.assertIsNot(x.stmt.initial.rhs, z.stmt.initial)
+		self.assertEqual(Parser(spans = False).parse(CODE), tree)
+	
+	def test_across_trees(self):
+		tree = self.parser.parse(CODE)
+		self.assertIs(tree, self.parser.parse(CODE))
+		other = self.parser.parse('w = a:b + 1;')
+		self.assertIs(tree.declarations[0].stmt.initial, other.declarations[0].stmt.initial)
+		
+		# Parsers with the same Interner share too
+		parser = Parser(intern = self.parser.interner)
+		self.assertIs(tree, parser.parse(CODE))
+		self.assertIsNot(tree, Parser(intern = True).parse(CODE))
+		self.assertEqual(tree, Parser(intern = True).parse(CODE))
+	
+	def test_hash(self):
+		tree = self.parser.parse(CODE)
+		other = Parser(intern = True).parse(CODE)
+		plain = Parser().parse(CODE)
+		self.assertEqual(hash(other), hash(tree))
+		self.assertEqual(structural_hash(plain), tree._hash)
+		self.assertNotEqual(hash(tree.declarations[0]), hash(tree.declarations[1]))
+		
+		uses = {tree.declarations[2] : 'f'}
+		self.assertEqual('f', uses[other.declarations[2]])
+		self.assertNotIn(tree.declarations[3], uses)
+		
+		# Nodes that weren't interned can change, and are hashed by identity
+		uses = {plain.declarations[0] : 'x'}
+		plain.declarations[0].stmt.name = 'w'
+		self.assertEqual('x', uses[plain.declarations[0]])
+		self.assertNotIn(Parser().parse(CODE).declarations[0], uses)
+	
+	def test_lists(self):
+		tree = self.parser.parse('x = f(a); y = g(a); z = f(a);')
+		x, y, z = [decl.stmt.initial for decl in tree.declarations]
+		self.assertIs(x, z)
+		# Equal, but in nodes that aren't
+		self.assertEqual(x.params, y.params)
+		self.assertIsNot(x.params, y.params)
+		self.assertIs(x.params[0], y.params[0])
+	
+	def test_no_spans(self):
+		with self.assertRaises(ValueError):
+			Parser(intern = True, spans = True)
+		
+		tree = Parser().parse(CODE)
+		self.assertIs(tree, Interner().intern(tree))
+		self.assertEqual(set([None]), set(s for _, start, end in spans(tree) for s in (start, end)))
+	
+	def test_lazy(self):
+		parser = Parser(intern = True, lazy = True)
+		tree = parser.parse(CODE)
+		f, g = tree.declarations[2:4]
+		self.assertIsInstance(f.suite, LazySuite)
+		self.assertIsNot(f.suite, g.suite)
+		self.assertEqual(Parser().parse(CODE), tree)
+	
+	def test_idempotent(self):
+		interner = Interner()
+		tree = interner.intern(Parser().parse(synthetic_template(5)))
+		size = len(interner)
+		self.assertIs(tree, interner.intern(tree))
+		self.assertEqual(size, len(interner))
+		self.assertEqual(Parser().parse(synthetic_template(5)), tree)
+	
+	def test_pickle(self):
+		tree = self.parser.parse(CODE)
+		copy = pickle.loads(pickle.dumps(tree, pickle.HIGHEST_PROTOCOL))
+		self.assertEqual(tree, copy)
+		self.assertEqual(structural_hash(tree), structural_hash(copy))
+		self.assertIs(copy.declarations[0].stmt.initial, copy.declarations[1].stmt.initial)
+	
+	def test_parse_parallel(self):
+		code = synthetic_template(40)
+		tree = self.parser.parse_parallel(code, workers = 2)
+		self.assertIs(self.parser.parse(code), tree)
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,93 @@
+from __future__ import unicode_literals
+import pickle
+import unittest
+
+from ..astnodes import LazySuite, Suite
+from ..parser import Parser, ParseException, _body_parsers
+from .utils import synthetic_template
+
+BRACES = '''-def f(a) {
+	x = 'a' + "b";
+	y = {{{ raw } }} { }}};
+	// a } comment
+	/* and { another */
+	{ z = 1; }
+	-return x;
+}
+-def g() { -return 1; }
+w = 2;
+'''
+
+class TestLazyBodies(unittest.TestCase):
+	
+	def assertLazyEqual(self, code):
+		eager = Parser().parse(code)
+		lazy = Parser(lazy = True).parse(code)
+		self.assertEqual(eager, lazy)
+		return lazy
+	
+	def test_same_tree(self):
+		self.assertLazyEqual(synthetic_template(5))
+	
+	def test_braces_in_strings_raw_blocks_and_comments(self):
+		tree = self.assertLazyEqual(BRACES)
+		self.assertEqual(4, len(tree.declarations[0].suite.suite))
+	
+	def test_parsed_on_first_use(self):
+		tree = Parser(lazy = True).parse(BRACES)
+		f, g = tree.declarations[0].suite, tree.declarations[1].suite
+		self.assertIsInstance(f, LazySuite)
+		self.assertIsNotNone(f._body)
+		
+		self.assertEqual(1, len(g.suite))
+		self.assertIsNone(g._body)
+		self.assertIsNotNone(f._body)
+	
+	def test_positions(self):
+		tree = Parser(lazy = True).parse(BRACES)
+		self.assertEqual(BRACES.index('{'), tree.declarations[0].suite._body[4])
+		self.assertEqual(BRACES.index('{', BRACES.index('-def g')), tree.declarations[1].suite._body[4])
+	
+	def test_errors_on_first_use(self):
+		code = '-def f() { x = ; }\ny = 1;\n'
+		with self.assertRaises(ParseException):
+			Parser().parse(code)
+		
+		tree = Parser(lazy = True).parse(code)
+		with self.assertRaises(ParseException):
+			tree.declarations[0].suite.suite
+		
+		# The rest of the file is still checked
+		with self.assertRaises(ParseException):
+			Parser(lazy = True).parse('-def f() { x = 1; }\ny = ;\n')
+	
+	def test_unclosed_body(self):
+		# Reported at the end of input, as without lazy
+		self.assertIsNone(Parser(lazy = True).parse('-def f() { x = 1;\n'))
+	
+	def test_pickle_keeps_bodies_unparsed(self):
+		tree = Parser(lazy = True).parse(BRACES)
+		copy = pickle.loads(pickle.dumps(tree, pickle.HIGHEST_PROTOCOL))
+		self.assertIsNotNone(copy.declarations[0].suite._body)
+		self.assertEqual(Parser().parse(BRACES), copy)
+	
+	def test_parser_options(self):
+		# Bodies are parsed later as the parser that skipped them would have
+		code = '-def f(a){ x = 1; }\n'
+		tree = Parser(lazy = True, spans = False).parse(code)
+		self.assertEqual(Parser(spans = False).parse(code), tree)
+		self.assertIsNone(tree.declarations[0].suite.suite[0].start)
+		self.assertIsNotNone(Parser(lazy = True).parse(code).declarations[0].suite.suite[0].start)
+		
+		suite = Parser(lazy = True, pratt = True).parse(code).declarations[0].suite
+		key = suite._body[:3]
+		self.assertEqual(1, len(suite.suite))
+		self.assertTrue(_body_parsers[key].pratt)
+	
+	def test_set_suite(self):
+		suite = Parser(lazy = True).parse(BRACES).declarations[0].suite
+		suite.suite = []
+		self.assertEqual(Suite([]), suite)
+
+if __name__ == '__main__':
+	unittest.main()
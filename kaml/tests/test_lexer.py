@@ -1,14 +1,17 @@
 from __future__ import unicode_literals
+import io, mmap, random, tempfile
 import unittest
 
+from ply.lex import LexError
 
 from ..lexer import Lexer
-from .utils import R, S, I, T, N, K, F
+from .utils import R, S, I, T, N, K, F, synthetic_template
 
 class TestLexer(unittest.TestCase):
+	lexer_class = Lexer
 	
 	def setUp(self):
-		self.l = Lexer()
+		self.l = self.lexer_class()
 	
 	def assertTokens(self, code, tokens = [], msg = None):
 		lexer_tokens = [T(t.type, t.value) for t in list(self.l.tokenize(code)) if t]
@@ -20,7 +23,7 @@ class TestLexer(unittest.TestCase):
 			raise
 	
 	def assertTokenLists(self, expected_tokens, actual_tokens, msg = None):
-		self.l = Lexer() # Recreate in case a previous test leaves the lexer in a bad state
+		self.l = self.lexer_class() # Recreate in case a previous test leaves the lexer in a bad state
 		try:
 			self.assertEqual(len(expected_tokens), len(actual_tokens))
 		except AssertionError:
@@ -179,6 +182,95 @@ class TestLexer(unittest.TestCase):
 		self.assertTokens(R("${foo} Hello "), [S(''), I('foo'), S(' Hello ')])
 		self.assertTokens(R("${foo} Hello ${foo}"), [S(''), I('foo'), S(' Hello '), I('foo'), S('')])
 
+	def _token_tuples(self, tokens):
+		return [(t.type, t.value, t.lineno, t.lexpos) if t else t for t in tokens]
+	
+	def assertStreamTokens(self, code, msg = None):
+		expected = self._token_tuples(self.lexer_class().tokenize(code))
+		
+		for chunk_size in (1, 2, 3, 7, 64, 1 << 16):
+			fp = io.BytesIO(code.encode('utf-8'))
+			actual = self._token_tuples(self.lexer_class().tokenize_stream(fp, chunk_size = chunk_size))
+			self.assertEqual(expected, actual, msg or 'chunk_size={}'.format(chunk_size))
+	
+	def test_tokenize_stream(self):
+		self.assertStreamTokens("-def fn(arg1, arg2) { 'AB''CD' }")
+		self.assertStreamTokens("/* Hello \nWorld */ x = 0x1f;\n// comment\n y")
+		self.assertStreamTokens("0123 078 0.5 -simple-var simple_var2")
+		self.assertStreamTokens(" \n\n  x\n  y \n")
+		self.assertStreamTokens("'Hello {bar} World' \"Hello $bar World\" '${{'")
+		self.assertStreamTokens(R(" \n ${ \n Hello \n } \n "))
+		self.assertStreamTokens(R("Hello ${foo}" + "a}b$c{{d" * 40 + "${foo}"))
+		# A single token much larger than the chunk size
+		self.assertStreamTokens(R("Lorem ipsum\n" * 200))
+	
+	def test_tokenize_stream_mmap(self):
+		code = "-def fn(arg1) {{ {} }}".format(R("\u00e9t\u00e9 ${arg1} " * 100))
+		
+		with tempfile.TemporaryFile() as fp:
+			fp.write(code.encode('utf-8'))
+			fp.flush()
+			mm = mmap.mmap(fp.fileno(), 0, access = mmap.ACCESS_READ)
+			try:
+				actual = self._token_tuples(self.lexer_class().tokenize_stream(mm, chunk_size = 5))
+			finally:
+				mm.close()
+		
+		self.assertEqual(self._token_tuples(self.lexer_class().tokenize(code)), actual)
+	
+	def test_tokenize_buffer(self):
+		code = "-def fn(a, b) { x = a + 0x1f + 1 + 1.0 + -1; 'a ${b} c' {{{ raw }}} }\n-return a;"
+		expected = self._token_tuples(self.lexer_class().tokenize(code))
+		buf = self.lexer_class().tokenize_buffer(code)
+		
+		self.assertEqual(len([t for t in expected if t]), len(buf))
+		self.assertEqual([t for t in expected if t], self._token_tuples(buf))
+		self.assertEqual(expected[3], self._token_tuples([buf[3]])[0])
+		self.assertEqual(expected[-1], self._token_tuples([buf[-1]])[0])
+		self.assertEqual(('ID', 'a'), (buf.type(3), buf.value(3)))
+		
+		# Values are stored once, but 1 and 1.0 are kept apart
+		self.assertEqual(1, buf.values.count('a'))
+		self.assertEqual(1, len([v for v in buf.values if v == 1 and isinstance(v, float)]))
+		self.assertEqual(1, len([v for v in buf.values if v == 1 and isinstance(v, int)]))
+	
+	def test_relex(self):
+		rand = random.Random(1)
+		snippets = ['x', ' ', '\n', '1', '0x1', '.5', '-def', "'", '"', '{{{', '}}}', '${', '{', '}', '/*', '*/', ';', 'a = "b ${c} d";']
+		lexer = self.lexer_class()
+		lexer.checkpoint_interval = 4
+		code = synthetic_template(3)
+		tokens = lexer.tokenize_checkpointed(code)
+		
+		for _ in range(300):
+			start = rand.randint(0, len(code))
+			end = min(start + rand.choice([0, 0, 1, 3]), len(code))
+			text = rand.choice(snippets)
+			new_code = code[:start] + text + code[end:]
+			try:
+				expected = self._token_tuples(self.lexer_class().tokenize_checkpointed(new_code))
+			except LexError:
+				continue
+			
+			lexer.relex(tokens, start, end, text)
+			self.assertEqual(expected, self._token_tuples(tokens), repr((start, end, text)))
+			code = new_code
+	
+	def test_relex_resyncs(self):
+		lexer = self.lexer_class()
+		code = synthetic_template(50)
+		tokens = lexer.tokenize_checkpointed(code)
+		n = len(tokens)
+		pos = code.index('x = title') + 1
+		
+		lexer.relex(tokens, pos, pos, 'yz')
+		self.assertEqual(n, len(tokens))
+		self.assertLess(len(lexer.checkpoints), n)
+		self.assertEqual(
+			self._token_tuples(tokens),
+			self._token_tuples(self.lexer_class().tokenize_checkpointed(code[:pos] + 'yz' + code[pos:]))
+		)
+
 if __name__ == '__main__':
 	unittest.main()
 
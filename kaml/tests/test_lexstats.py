@@ -0,0 +1,65 @@
+from __future__ import unicode_literals
+import unittest
+
+from ..lexer import Lexer
+
+CODE = 'x = "a ${b + {}} c";\n{{{ raw ${y} }}} /* comment */ 1 <= 2'
+
+def token_tuples(tokens):
+	return [(t.type, t.value, t.lineno, t.lexpos) if t else t for t in tokens]
+
+class TestLexerStats(unittest.TestCase):
+	
+	def test_same_tokens(self):
+		self.assertEqual(
+			token_tuples(Lexer().tokenize(CODE)),
+			token_tuples(Lexer(stats = True).tokenize(CODE))
+		)
+	
+	def test_counts(self):
+		l = Lexer(stats = True)
+		list(l.tokenize(CODE))
+		stats = l.stats
+		
+		self.assertEqual(3, stats.rules['t_INITIAL_variablestring_ID'][0])
+		self.assertEqual(1, stats.rules['t_INITIAL_variablestring_LTE'][0])
+		self.assertEqual(1, stats.rules['t_INITIAL_variablestring_NL'][0])
+		self.assertEqual(2, stats.rules['t_INITIAL_variablestring_INT_LIT'][0])
+		self.assertEqual(3, stats.rules['literals'][0]) # = + ;
+		self.assertTrue(all(seconds >= 0 for _, seconds in stats.rules.values()))
+		
+		self.assertEqual({
+			('INITIAL', 'stringdbl') : 1,
+			('stringdbl', 'variablestring') : 1,
+			('variablestring', 'stringdbl') : 1,
+			('stringdbl', 'INITIAL') : 1,
+			('INITIAL', 'rawstr') : 1,
+			('rawstr', 'variablestring') : 1,
+			('variablestring', 'rawstr') : 1,
+			('rawstr', 'INITIAL') : 1,
+			('INITIAL', 'comment') : 1,
+			('comment', 'INITIAL') : 1,
+		}, stats.transitions)
+		self.assertEqual(2, stats.max_nesting)
+		self.assertEqual(2, stats.max_depth)
+		
+		report = stats.report()
+		self.assertIn('t_rawstr_INNER', report)
+		self.assertIn('stringdbl -> variablestring', report)
+	
+	def test_trace(self):
+		messages = []
+		class Log(object):
+			def debug(self, msg):
+				messages.append(msg)
+		
+		l = Lexer(trace = True)
+		l.log = Log()
+		list(l.tokenize('"${a}"'))
+		self.assertEqual([
+			'Starting stringdbl', '-Starting variablestring',
+			'-Ending variablestring. Continuing stringdbl', 'Ending stringdbl. Continuing INITIAL'
+		], messages)
+
+if __name__ == '__main__':
+	unittest.main()
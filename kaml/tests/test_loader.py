@@ -0,0 +1,185 @@
+from __future__ import unicode_literals
+import io, os, shutil, tempfile
+import unittest
+
+from ..loader import ImportCycle, Loader, LoaderError, ModuleNotFound, import_path
+from ..parser import Parser
+
+FILES = {
+	'pages/home.kaml' : '-use lib:widgets;\n-use lib:layout:*;\nx = 1;',
+	'pages/about.kaml' : '-use lib:widgets:button;\ny = 2;',
+	'lib/widgets.kaml' : '-use lib:base;\n-def button() { -return 1; }',
+	'lib/layout.kaml' : '-use lib:base;\n-def grid() { -return 2; }',
+	'lib/base.kaml' : '-def id(a) { -return a; }',
+}
+
+class TestLoader(unittest.TestCase):
+	
+	def setUp(self):
+		self.root = tempfile.mkdtemp()
+		for name, code in FILES.items():
+			self.write(name, code)
+	
+	def tearDown(self):
+		shutil.rmtree(self.root)
+	
+	def path(self, name):
+		return os.path.join(self.root, name)
+	
+	def write(self, name, code):
+		path = self.path(name)
+		if not os.path.isdir(os.path.dirname(path)):
+			os.makedirs(os.path.dirname(path))
+		with io.open(path, 'w', encoding = 'utf-8') as fp:
+			fp.write(code)
+	
+	def test_import_path(self):
+		parser = Parser()
+		uses = parser.parse('-use a;\n-use a:b:c;\n-use a:b:*;').declarations
+		self.assertEqual([(('a',), False), (('a', 'b', 'c'), False), (('a', 'b'), True)], [import_path(use) for use in uses])
+	
+	def test_find(self):
+		loader = Loader([self.root])
+		self.assertEqual(('lib:widgets', self.path('lib/widgets.kaml')), loader.find(('lib', 'widgets')))
+		# A name in a module
+		self.assertEqual(('lib:widgets', self.path('lib/widgets.kaml')), loader.find(('lib', 'widgets', 'button')))
+		self.assertIsNone(loader.find(('lib', 'missing')))
+		self.assertEqual('pages:home', loader.name(self.path('pages/home.kaml')))
+		
+		# The first root that has it
+		other = tempfile.mkdtemp()
+		try:
+			os.makedirs(os.path.join(other, 'lib'))
+			io.open(os.path.join(other, 'lib', 'base.kaml'), 'w').close()
+			loader = Loader([other, self.root])
+			self.assertEqual(os.path.join(other, 'lib', 'base.kaml'), loader.find(('lib', 'base'))[1])
+			self.assertEqual(self.path('lib/widgets.kaml'), loader.find(('lib', 'widgets'))[1])
+		finally:
+			shutil.rmtree(other)
+	
+	def test_graph(self):
+		loader = Loader([self.root])
+		home = loader.load(self.path('pages/home.kaml'))
+		self.assertEqual(('lib:widgets', 'lib:layout'), home.uses)
+		self.assertEqual({
+			'pages:home' : ('lib:widgets', 'lib:layout'),
+			'lib:widgets' : ('lib:base',),
+			'lib:layout' : ('lib:base',),
+			'lib:base' : (),
+		}, loader.graph())
+		self.assertEqual(['lib:base', 'lib:widgets', 'lib:layout', 'pages:home'], [m.name for m in loader.order('pages:home')])
+		self.assertEqual(Parser().parse(FILES['lib/base.kaml']), loader.modules['lib:base'].tree)
+	
+	def test_shared_once(self):
+		loader = Loader([self.root])
+		loader.load(self.path('pages/home.kaml'))
+		base = loader.modules['lib:base']
+		widgets = loader.modules['lib:widgets']
+		self.assertEqual(4, loader.parses)
+		
+		# Only the new page is parsed
+		about = loader.load(self.path('pages/about.kaml'))
+		self.assertEqual(5, loader.parses)
+		self.assertEqual(('lib:widgets',), about.uses)
+		self.assertIs(widgets, loader.modules['lib:widgets'])
+		self.assertIs(base, loader.modules['lib:base'])
+		self.assertIs(widgets, loader.load_module('lib:widgets'))
+	
+	def test_changes(self):
+		loader = Loader([self.root])
+		loader.load(self.path('pages/home.kaml'))
+		base = loader.modules['lib:base']
+		
+		# A new mtime, the same contents
+		stat = os.stat(self.path('lib/base.kaml'))
+		os.utime(self.path('lib/base.kaml'), (stat.st_atime, stat.st_mtime + 10))
+		loader.load(self.path('pages/home.kaml'))
+		self.assertEqual(4, loader.parses)
+		self.assertIs(base, loader.modules['lib:base'])
+		
+		self.write('lib/base.kaml', '-def id(b) { -return b; }')
+		os.utime(self.path('lib/base.kaml'), (stat.st_atime, stat.st_mtime + 20))
+		loader.load(self.path('pages/home.kaml'))
+		self.assertEqual(5, loader.parses)
+		self.assertEqual(Parser().parse('-def id(b) { -return b; }'), loader.modules['lib:base'].tree)
+		
+		# A module that's used again
+		self.write('lib/layout.kaml', '-use lib:extra;')
+		self.write('lib/extra.kaml', 'z = 3;')
+		os.utime(self.path('lib/layout.kaml'), (stat.st_atime, stat.st_mtime + 30))
+		loader.load(self.path('pages/home.kaml'))
+		self.assertEqual(('lib:extra',), loader.modules['lib:layout'].uses)
+		self.assertIn('lib:extra', loader.modules)
+	
+	def test_errors(self):
+		loader = Loader([self.root])
+		self.write('pages/missing.kaml', '-use lib:nothing;')
+		with self.assertRaises(ModuleNotFound) as cm:
+			loader.load(self.path('pages/missing.kaml'))
+		self.assertEqual('lib:nothing', cm.exception.name)
+		self.assertEqual('pages:missing', cm.exception.importer)
+		with self.assertRaises(ModuleNotFound):
+			loader.load_module('nothing')
+		
+		# The modules loaded before the error are used again
+		self.write('lib/broken.kaml', '-use lib:nothing;')
+		self.write('pages/later.kaml', '-use lib:widgets;\n-use lib:broken;')
+		with self.assertRaises(ModuleNotFound):
+			loader.load(self.path('pages/later.kaml'))
+		self.assertNotIn('lib:base', loader.modules)
+		loader.load(self.path('pages/about.kaml'))
+		self.assertIn('lib:base', loader.modules)
+		
+		self.write('lib/bad.kaml', 'x = ;')
+		self.write('pages/bad.kaml', '-use lib:bad;')
+		with self.assertRaises(LoaderError) as cm:
+			loader.load(self.path('pages/bad.kaml'))
+		self.assertIn(self.path('lib/bad.kaml'), str(cm.exception))
+		self.assertIn('ParseException', str(cm.exception))
+	
+	def test_deleted(self):
+		loader = Loader([self.root])
+		loader.load(self.path('pages/home.kaml'))
+		os.remove(self.path('lib/base.kaml'))
+		with self.assertRaises(ModuleNotFound) as cm:
+			loader.load(self.path('pages/home.kaml'))
+		self.assertEqual(('lib:base', 'lib:widgets'), (cm.exception.name, cm.exception.importer))
+		
+		# A template that isn't there to read
+		os.remove(self.path('pages/about.kaml'))
+		with self.assertRaises(ModuleNotFound) as cm:
+			loader.load(self.path('pages/about.kaml'))
+		self.assertEqual(('pages:about', None), (cm.exception.name, cm.exception.importer))
+	
+	def test_cycle(self):
+		self.write('lib/a.kaml', '-use lib:b;')
+		self.write('lib/b.kaml', '-use lib:c;\n-use lib:base;')
+		self.write('lib/c.kaml', '-use lib:a;')
+		loader = Loader([self.root])
+		with self.assertRaises(ImportCycle) as cm:
+			loader.load_module('lib:a')
+		self.assertEqual(['lib:a', 'lib:b', 'lib:c', 'lib:a'], cm.exception.cycle)
+		self.assertIn('lib:a -> lib:b -> lib:c -> lib:a', str(cm.exception))
+		
+		self.write('lib/self.kaml', '-use lib:self;')
+		with self.assertRaises(ImportCycle):
+			loader.load_module('lib:self')
+	
+	def test_jobs(self):
+		loader = Loader([self.root], jobs = 2)
+		loader.load(self.path('pages/home.kaml'))
+		expected = Loader([self.root])
+		expected.load(self.path('pages/home.kaml'))
+		self.assertEqual(4, loader.parses)
+		for name, module in expected.modules.items():
+			self.assertEqual(module, loader.modules[name])
+	
+	def test_outside_roots(self):
+		loader = Loader([self.path('lib')])
+		self.write('pages/solo.kaml', '-use base;')
+		page = loader.load(self.path('pages/solo.kaml'))
+		self.assertEqual(self.path('pages/solo.kaml'), page.name)
+		self.assertEqual(('base',), page.uses)
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,69 @@
+from __future__ import unicode_literals
+import unittest
+
+import kaml
+from ..astnodes import FuncDef, UseStmt
+from ..lexer import Lexer
+from ..outline import Event, Signature, scan
+from ..parser import Parser
+from .test_lazy import BRACES
+from .utils import synthetic_template
+
+CODE = '''-use lib;
+-use pkg:*;
+-def card#id.cls[size = f(1), color = 'red'](title, body = {{{ } }}}) {
+	x = inner(title);
+}
+x = card#main.wide[size = 2](g(1), 'b');
+y = obj:method(1)[0];
+'''
+
+class TestOutline(unittest.TestCase):
+	
+	def test_events(self):
+		self.assertEqual([
+			Event('use', 'lib', 0, None),
+			Event('use', 'pkg:*', CODE.index('-use pkg'), None),
+			Event('def_start', 'card', CODE.index('-def'), Signature('id', ('cls',), ('size', 'color'), ('title', 'body'))),
+			Event('def_end', 'card', CODE.index('}\nx') + 1, None),
+			# Found at its `(`, after the calls before that
+			Event('call', 'card', CODE.index('card#main'), None),
+			Event('call', 'g', CODE.index('g(1)'), None),
+			Event('call', 'obj:method', CODE.index('obj'), None),
+		], list(kaml.scan(CODE)))
+	
+	def test_matches_parse(self):
+		code = synthetic_template(5)
+		events = list(scan(code))
+		tree = Parser().parse(code)
+		
+		uses = [d for d in tree.declarations if isinstance(d, UseStmt)]
+		self.assertEqual([u.root for u in uses], [e.name for e in events if e.kind == 'use'])
+		
+		defs = [d for d in tree.declarations if isinstance(d, FuncDef)]
+		starts = [e for e in events if e.kind == 'def_start']
+		self.assertEqual([(d.start, d.decl.name) for d in defs], [(e.offset, e.name) for e in starts])
+		self.assertEqual([d.end for d in defs], [e.offset for e in events if e.kind == 'def_end'])
+		for d, e in zip(defs, starts):
+			args = d.decl.args
+			self.assertEqual(args.hash_arg.name, e.signature.hash_arg)
+			self.assertEqual([a.name for a in args.dot_args], list(e.signature.dot_args))
+			self.assertEqual(set(args.kwargs), set(e.signature.kwargs))
+			self.assertEqual([a.name for a in args.positional], list(e.signature.positional))
+	
+	def test_bodies_skipped(self):
+		events = list(scan(BRACES))
+		self.assertEqual(['def_start', 'def_end', 'def_start', 'def_end'], [e.kind for e in events])
+		self.assertEqual(BRACES.index('-def g') - 1, events[1].offset)
+	
+	def test_lexers(self):
+		code = CODE + synthetic_template(3) + BRACES
+		self.assertEqual(list(scan(code, Lexer)), list(scan(code)))
+	
+	def test_unfinished(self):
+		self.assertEqual(['def_start'], [e.kind for e in scan('-def fn(a) { x = 1;')])
+		self.assertEqual([Signature(None, (), ('a',), ())], [e.signature for e in scan('-def fn[a = 1')])
+		self.assertEqual([], list(scan('-def')))
+
+if __name__ == '__main__':
+	unittest.main()
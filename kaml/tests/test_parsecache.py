@@ -0,0 +1,115 @@
+from __future__ import unicode_literals
+import os, pickle, shutil, tempfile
+import unittest
+
+from .. import get_parser
+from ..astnodes import LazySuite, Suite
+from ..parsecache import ParseCache
+from ..parser import Parser
+from .utils import synthetic_template
+
+CODE = '-def fn(a) { -return a + 1; }\nx = y * 3;\n'
+
+class TestParseCache(unittest.TestCase):
+	
+	def setUp(self):
+		self.dir = tempfile.mkdtemp()
+	
+	def tearDown(self):
+		shutil.rmtree(self.dir)
+	
+	def test_trees_pickle(self):
+		tree = Parser().parse(synthetic_template(3))
+		for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+			copy = pickle.loads(pickle.dumps(tree, protocol))
+			self.assertEqual(tree, copy)
+	
+	def test_hit_and_miss(self):
+		cache = ParseCache()
+		p = Parser(cache = cache)
+		
+		tree = p.parse(CODE)
+		self.assertEqual((0, 1), (cache.hits, cache.misses))
+		
+		self.assertEqual(tree, p.parse(CODE))
+		self.assertEqual((1, 1), (cache.hits, cache.misses))
+		
+		# Every hit is a copy
+		self.assertIsNot(p.parse(CODE), p.parse(CODE))
+		
+		p.parse(CODE + ' ')
+		self.assertEqual((3, 2), (cache.hits, cache.misses))
+		self.assertEqual(2, len(cache))
+	
+	def test_uncached_parses(self):
+		cache = ParseCache()
+		p = get_parser(cache = cache)
+		self.assertEqual([], p.parse(''))
+		p.check(CODE)
+		self.assertEqual(0, cache.misses)
+	
+	def test_key(self):
+		cache = ParseCache()
+		signature = Parser().signature()
+		self.assertEqual(cache.key(CODE, signature), cache.key(CODE.encode('utf-8'), signature))
+		self.assertNotEqual(cache.key(CODE, signature), cache.key(CODE + ' ', signature))
+		self.assertNotEqual(cache.key(CODE, signature), cache.key(CODE, signature + '0'))
+	
+	def test_options(self):
+		# One cache shared by parsers that make different trees of CODE
+		cache = ParseCache()
+		parsers = [Parser(cache = cache), Parser(cache = cache, spans = False),
+			Parser(cache = cache, lazy = True), Parser(cache = cache, intern = True)]
+		for p in parsers:
+			p.parse(CODE)
+		self.assertEqual((0, 4), (cache.hits, cache.misses))
+		for p in parsers:
+			self.assertEqual(type(p.parse(CODE).declarations[0].suite), LazySuite if p.lazy else Suite)
+		self.assertEqual((4, 4), (cache.hits, cache.misses))
+	
+	def test_size_eviction(self):
+		cache = ParseCache()
+		sources = ['x{0} = {0};'.format(i) for i in range(10)]
+		p = Parser(cache = cache)
+		for source in sources:
+			p.parse(source)
+		
+		size = cache.nbytes // len(sources)
+		cache = ParseCache(max_bytes = size * 5)
+		p = Parser(cache = cache)
+		for source in sources:
+			p.parse(source)
+		
+		self.assertLessEqual(cache.nbytes, cache.max_bytes)
+		self.assertEqual(5, len(cache))
+		self.assertEqual(5, cache.evictions)
+		
+		# The oldest ones went
+		p.parse(sources[-1])
+		p.parse(sources[0])
+		self.assertEqual(1, cache.hits)
+		self.assertEqual(11, cache.misses)
+	
+	def test_disk(self):
+		tree = Parser(cache = ParseCache(path = self.dir)).parse(CODE)
+		self.assertEqual(1, len([n for n in os.listdir(self.dir) if n.endswith(ParseCache.suffix)]))
+		
+		cache = ParseCache(path = self.dir)
+		self.assertEqual(tree, Parser(cache = cache).parse(CODE))
+		self.assertEqual((1, 1, 0), (cache.hits, cache.disk_hits, cache.misses))
+		self.assertEqual(1, len(cache))
+	
+	def test_broken_file(self):
+		p = Parser(cache = ParseCache(path = self.dir))
+		tree = p.parse(CODE)
+		key = p.cache.key(CODE, p.signature())
+		with open(os.path.join(self.dir, key + ParseCache.suffix), 'wb') as fp:
+			fp.write(b'\x80\x02garbage')
+		
+		cache = ParseCache(path = self.dir)
+		self.assertEqual(tree, Parser(cache = cache).parse(CODE))
+		self.assertEqual((0, 1), (cache.hits, cache.misses))
+		self.assertEqual(tree, Parser(cache = ParseCache(path = self.dir)).parse(CODE))
+
+if __name__ == '__main__':
+	unittest.main()
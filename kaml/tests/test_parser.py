@@ -10,7 +10,7 @@ else:
 from ..astnodes import (
 	TranslationUnit, FuncDef, FuncDecl, Suite, ReturnStmt, UseStmt,
 	VariableDecl, NumberLiteral, StringLiteral, ParamSeq, HashDecl, DotDecl,
-	KWArgDecl,
+	KWArgDecl, SetStmt, BinaryOp, Node, FuncCall, TagCall,
 )
 from ..parser import Parser, ParseException
 
@@ -271,7 +271,43 @@ class TestParser(unittest.TestCase):
 			)
 		)
 		
-		
+	def test_set(self):
+		self.assertTree('-def fn(){ -set a = 1; -set b += a; }', TranslationUnit(
+			FuncDef(
+				FuncDecl('fn', ParamSeq()),
+				Suite(SetStmt('a', NumberLiteral(1)), SetStmt('b', BinaryOp('b', '+', 'a')))
+			)
+		))
+		self.assertNotParses('-def fn(){ -set a; }')
+		self.assertNotParses('-def fn(){ -set a:b = 1; }')
+	
+	def test_conditional(self):
+		self.assertTree('-def fn(){ -return a ? b : c + 1; }', TranslationUnit(
+			FuncDef(
+				FuncDecl('fn', ParamSeq()),
+				Suite(ReturnStmt(Node('ternary', ('a', 'b', BinaryOp('c', '+', NumberLiteral(1))))))
+			)
+		))
+	
+	def test_tag_call(self):
+		self.assertTree('-def fn(){ -return div#main.wide.dark[size=2](1); }', TranslationUnit(
+			FuncDef(
+				FuncDecl('fn', ParamSeq()),
+				Suite(ReturnStmt(TagCall('div', [NumberLiteral(1)], 'main', ('wide', 'dark'), {'size' : NumberLiteral(2)})))
+			)
+		))
+		tree = self.p.parse('x = f.cls(); y = f();')
+		self.assertEqual(TagCall('f', [], None, ('cls',), {}), tree.declarations[0].stmt.initial)
+		self.assertEqual(FuncCall('f', []), tree.declarations[1].stmt.initial)
+		self.assertNotEqual(FuncCall('f', []), tree.declarations[0].stmt.initial)
+	
+	def test_suite_add(self):
+		a = Suite(NumberLiteral(1))
+		b = a + NumberLiteral(2)
+		self.assertEqual([NumberLiteral(1)], a.suite)
+		self.assertEqual([NumberLiteral(1), NumberLiteral(2)], b.suite)
+		a += NumberLiteral(3)
+		self.assertEqual([NumberLiteral(1), NumberLiteral(3)], a.suite)
 
 if __name__ == '__main__':
 	unittest.main()
@@ -0,0 +1,111 @@
+from __future__ import unicode_literals
+import itertools
+import random
+import unittest
+
+from ..parser import Parser, ParseException
+from ..pratt import ExpressionParser, expression_entries
+from .utils import synthetic_template
+
+OPERATORS = ['||', '&&', '|', '^', '&', '==', '!=', '<', '>', '<=', '>=', '<<', '>>', '+', '-', '*', '/', '%']
+
+OPERANDS = ['a', 'b1', '42', '0x1f', '1.5', '"s"', "'t' 'u'", 'true', 'false',
+	'!c', '~d', '+e', '(f)', 'g[1]', 'h[i, 2]', 'k:attr', 'f()', 'f(1)', 'f(x, y = 2)', 'm[0](n)[1]']
+
+def random_expression(rnd, depth = 3):
+	if depth == 0 or rnd.random() < 0.3:
+		return rnd.choice(OPERANDS)
+	kind = rnd.random()
+	if kind < 0.6:
+		return '{} {} {}'.format(random_expression(rnd, depth - 1), rnd.choice(OPERATORS), random_expression(rnd, depth - 1))
+	if kind < 0.75:
+		return '({})'.format(random_expression(rnd, depth - 1))
+	if kind < 0.85:
+		return '{} ? {} : {}'.format(random_expression(rnd, depth - 1), random_expression(rnd, depth - 1), random_expression(rnd, depth - 1))
+	if kind < 0.95:
+		return '{}[{}]'.format(rnd.choice(['a', 'b']), random_expression(rnd, depth - 1))
+	return 'f({}, {})'.format(random_expression(rnd, depth - 1), random_expression(rnd, depth - 1))
+
+STATEMENTS = [
+	'x = {};',
+	'x += {};',
+	'{};',
+	'a, {};',
+	'-return {};',
+	'-if ({}) {{ y = 1; }} -else {{ y = 2; }}',
+	'-def fn(a, b = {}) {{ -return {}; }}',
+	'x = f({}, z = {});',
+]
+
+class TestPrattParser(unittest.TestCase):
+	
+	def setUp(self):
+		self.lr = Parser()
+		self.pratt = Parser(pratt = True)
+	
+	def parse(self, parser, code):
+		try:
+			return repr(parser.parse(code))
+		except ParseException as e:
+			return str(e)
+		except Exception as e:
+			# From the grammar actions, with a YaccProduction's address in the message
+			return type(e).__name__
+	
+	def assertSameTree(self, code):
+		# Reprs, so that the errors compare too
+		self.assertEqual(self.parse(self.lr, code), self.parse(self.pratt, code), code)
+	
+	def test_entries(self):
+		entries = expression_entries(self.pratt.tables)
+		self.assertTrue(entries)
+		self.assertIn(True, entries.values())
+		self.assertIn(False, entries.values())
+	
+	def test_precedence(self):
+		for left, right in itertools.product(OPERATORS, repeat = 2):
+			self.assertSameTree('x = a {} b {} c;'.format(left, right))
+			self.assertSameTree('x = a {} (b {} c);'.format(left, right))
+	
+	def test_assignments(self):
+		for code in ['x = y = z;', 'x += y -= z;', 'x = a ? b : c;', 'x = a ? b, c : d = e;',
+				'a = 1, b = 2;', 'x = (a = b);']:
+			self.assertSameTree(code)
+	
+	def test_postfix(self):
+		for operand in OPERANDS:
+			self.assertSameTree('x = {};'.format(operand))
+			self.assertSameTree('x = a + {};'.format(operand))
+	
+	def test_random_expressions(self):
+		rnd = random.Random(15)
+		for _ in range(300):
+			expressions = [random_expression(rnd) for _ in range(2)]
+			statement = rnd.choice(STATEMENTS)
+			self.assertSameTree(statement.format(*expressions[:statement.count('{}')]))
+	
+	def test_templates(self):
+		code = synthetic_template(5)
+		self.assertEqual(self.lr.parse(code), self.pratt.parse(code))
+	
+	def test_left_to_lr_parser(self):
+		# Calls with #id or .class, and errors, go back to the LR parser
+		for code in ['x = f#id();', 'x = a + f.cls(1);', 'x = ;', 'x = (a;', 'x = a +;',
+				'x = a[1;', 'x = f(1, ;', 'x = a ? b;', 'x = a', '-return (a', 'x = a b;']:
+			self.assertSameTree(code)
+	
+	def test_check(self):
+		code = 'x = 1 + ;\ny = a[;\n-def fn() { z = (1; }\nw = 2 * 3;\n'
+		self.assertEqual(self.lr.check(code), self.pratt.check(code))
+	
+	def test_binding_powers(self):
+		expressions = ExpressionParser(Parser.precedence)
+		self.assertLess(expressions.binary['OR'][0], expressions.binary['AND'][0])
+		self.assertEqual(expressions.binary['EQ'][0], expressions.binary['NE'][0])
+		self.assertLess(expressions.binary['+'][0], expressions.binary['*'][0])
+		self.assertTrue(expressions.binary['OR'][1])
+		self.assertFalse(expressions.binary['+'][1])
+		self.assertIn('=', expressions.assign_ops)
+
+if __name__ == '__main__':
+	unittest.main()
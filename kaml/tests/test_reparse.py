@@ -0,0 +1,155 @@
+from __future__ import unicode_literals
+import random
+import unittest
+
+from ..astnodes import ASTNode, LazySuite, Node
+from ..parser import Parser, ParseException
+from .test_spans import positions
+from .utils import synthetic_template
+
+CODE = '''x = 1;
+-def f(a) {
+	-return a + 1;
+}
+-if (x) { y = 2; }
+z = 's' "t";
+'''
+
+def structure(node):
+	""" The whole tree as tuples, spans and all, that __eq__ leaves out """
+	if isinstance(node, ASTNode):
+		return (type(node).__name__, node.start, node.end) + tuple(structure(getattr(node, slot, None)) for slot in node._fields)
+	if isinstance(node, Node):
+		return (node.node_type, structure(node.children))
+	if isinstance(node, (list, tuple)):
+		return [structure(item) for item in node]
+	return node
+
+# Text that random edits put in
+EDITS = ['', 'x', '1', ';', '}', '{', ' ', '\n', 'y = 2;\n', '-else { z = 1; }', '/*', '*/', '//', '"', "'",
+	'-def g() { -return 1; }\n', '-if (a) { b = 1; }']
+
+class TestReparse(unittest.TestCase):
+	
+	def setUp(self):
+		self.parser = Parser()
+	
+	def reparse(self, old, new, parser = None):
+		""" Reparse `new` after `old`, checking it's the tree a full parse gives """
+		parser = parser or self.parser
+		tree = parser.parse(old)
+		items = list(tree.declarations)
+		result = parser.reparse(tree, old, new)
+		
+		expected = parser.parse(new)
+		self.assertEqual(expected, result)
+		self.assertEqual(positions(expected), positions(result))
+		self.assertEqual((expected.start, expected.end), (result.start, result.end))
+		return items, result
+	
+	def reused(self, items, result):
+		""" Which of the items of the new tree are the old ones """
+		return [any(item is old for old in items) for item in result.declarations]
+	
+	def test_edit_in_function(self):
+		new = CODE.replace('a + 1', 'a + 100')
+		items, result = self.reparse(CODE, new)
+		# The item before the edit is parsed again too, an -if can take an -else
+		self.assertEqual([False, False, True, True], self.reused(items, result))
+	
+	def test_first_and_last_items(self):
+		items, result = self.reparse(CODE, CODE.replace('x = 1', 'x = 10'))
+		self.assertEqual([False, True, True, True], self.reused(items, result))
+		
+		items, result = self.reparse(CODE, CODE.replace('"t"', '"tu"'))
+		self.assertEqual([True, True, False, False], self.reused(items, result))
+	
+	def test_insert_and_delete_items(self):
+		new = CODE.replace('-if', 'w = 3;\nv = 4;\n-if')
+		items, result = self.reparse(CODE, new)
+		self.assertEqual(6, len(result.declarations))
+		self.assertEqual(3, sum(self.reused(items, result)))
+		
+		self.reparse(new, CODE)
+		self.reparse(CODE, CODE.replace('x = 1;\n', ''))
+		self.reparse(CODE, CODE + 'end = 1;\n')
+		self.reparse(CODE, '\n\n' + CODE)
+	
+	def test_else(self):
+		# The item before the edit can take what comes after it
+		items, result = self.reparse(CODE, CODE.replace('y = 2; }', 'y = 2; } -else { y = 3; }'))
+		self.assertEqual(4, len(result.declarations))
+	
+	def test_comments_and_strings(self):
+		# Ones that run on past the edit get a full parse
+		self.reparse(CODE, CODE.replace('-def f', '/* -def f').replace('z =', '*/ z ='))
+		self.reparse(CODE, CODE.replace('x = 1;', 'x = 1; // comment'))
+		self.reparse(CODE, CODE.replace('x = 1;', 'x = 1; w = "a; b";'))
+		
+		code = CODE.replace('-if', '// a */\n-if')
+		self.reparse(code, code.replace('x = 1;', 'x = 1; /*'))
+		
+		tree = self.parser.parse(CODE)
+		with self.assertRaises(ParseException):
+			self.parser.reparse(tree, CODE, CODE.replace('x = 1;', 'x = 1; "'))
+	
+	def test_errors(self):
+		tree = self.parser.parse(CODE)
+		with self.assertRaises(ParseException):
+			self.parser.reparse(tree, CODE, CODE.replace('a + 1', 'a +'))
+		# An item that the edit leaves unfinished takes in the next one
+		self.reparse('a = 1;\nb = 2;\nc + 3;\n', 'a = 1;\nb = 2 -\nc + 3;\n')
+	
+	def test_same_and_empty(self):
+		tree = self.parser.parse(CODE)
+		self.assertIs(tree, self.parser.reparse(tree, CODE, CODE))
+		self.assertEqual([], self.parser.reparse(tree, CODE, ''))
+		self.reparse('x = 1;', '  \n')
+	
+	def test_random_edits(self):
+		rnd = random.Random(17)
+		code = synthetic_template(4)
+		for _ in range(200):
+			start = rnd.randrange(len(code))
+			end = min(start + rnd.choice([0, 0, 1, 5, 40]), len(code))
+			new = code[:start] + rnd.choice(EDITS) + code[end:]
+			
+			tree = self.parser.parse(code)
+			self.assertEqual(self.outcome(lambda: self.parser.parse(new)),
+				self.outcome(lambda: self.parser.reparse(tree, code, new)), new)
+	
+	def outcome(self, parse):
+		try:
+			tree = parse()
+		except ParseException as e:
+			# Where the error is, the token's line number is the lexer's count
+			return str(e).split(':')[:2]
+		except Exception as e:
+			# From the lexer, or the grammar actions
+			return type(e).__name__
+		return structure(tree)
+	
+	def test_lazy(self):
+		parser = Parser(lazy = True)
+		new = CODE.replace('x = 1;', 'x = 1;\nw = 2;')
+		result = parser.reparse(parser.parse(CODE), CODE, new)
+		suite = result.declarations[2].suite
+		self.assertIsInstance(suite, LazySuite)
+		# Moved along with the code, and parsed from the new source
+		self.assertEqual(new.index('{'), suite._body[4])
+		self.assertEqual(Parser().parse(new), result)
+		self.assertEqual(positions(Parser().parse(new)), positions(result))
+	
+	def test_pratt(self):
+		code = synthetic_template(5)
+		new = code.replace('x = title + 2 * 2;', 'x = title + 2 * (2 - 1);')
+		self.reparse(code, new, Parser(pratt = True))
+	
+	def test_without_spans(self):
+		parser = Parser(spans = False)
+		tree = parser.parse(CODE)
+		new = CODE.replace('a + 1', 'a + 2')
+		self.assertEqual(parser.parse(new), parser.reparse(tree, CODE, new))
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,136 @@
+from __future__ import unicode_literals
+import unittest
+
+from .. import astio
+from ..astnodes import *
+from ..astnodes import Scope
+from ..parser import Parser
+from ..resolver import resolve
+from ..visitor import NodeVisitor
+
+CODE = '''x = 1;
+-def f#id.cls[size=1](a, b=x) {
+	y = a + b;
+	-if (y) { z = y; a = z; } -else { y = q; z = 2; }
+	-set x += z;
+	-return g(y, id, size);
+}
+'''
+
+class Names(NodeVisitor):
+	""" (name, depth, index) of each Identifier, the names bound marked with = """
+	
+	def __init__(self):
+		self.names = []
+	
+	def visit_Identifier(self, node):
+		self.names.append((node.name, node.depth, node.index))
+	
+	def bound(self, node):
+		name = node.name
+		self.names.append(('=' + name.name, name.depth, name.index))
+		# Not again as a use
+		for field in node._fields[1:]:
+			self.visit(getattr(node, field))
+		return False
+	
+	visit_VariableDecl = visit_SetStmt = visit_FuncDecl = visit_HashDecl = visit_DotDecl = bound
+
+def names(tree):
+	visitor = Names()
+	visitor.visit(tree)
+	return visitor.names
+
+class TestScope(unittest.TestCase):
+	
+	def test_levels(self):
+		scope = Scope()
+		scope['a'] = 1
+		scope.push()
+		scope['a'] = 2
+		scope.declare('b', 3)
+		scope.declare('a', 4)
+		self.assertEqual(4, scope['a'])
+		scope.pop()
+		# Set in the inner level, over the outer binding
+		self.assertEqual(2, scope['a'])
+		self.assertNotIn('b', scope)
+		self.assertRaises(KeyError, scope.__getitem__, 'b')
+	
+	def test_shadowed(self):
+		scope = Scope()
+		scope.declare('a', 1)
+		for value in (2, 3):
+			scope.push()
+			scope.declare('a', value)
+		scope.pop()
+		self.assertEqual(2, scope['a'])
+		scope.pop()
+		self.assertEqual(1, scope['a'])
+
+class TestResolver(unittest.TestCase):
+	
+	def setUp(self):
+		self.parser = Parser()
+	
+	def test_resolve(self):
+		tree = self.parser.parse(CODE)
+		self.assertIs(tree, resolve(tree))
+		self.assertEqual([
+			('=x', None, None), ('=f', None, None),
+			('=a', 0, 0), ('=b', 0, 1), ('x', None, None), ('=id', 0, 2), ('=cls', 0, 3),
+			('=y', 0, 5), ('a', 0, 0), ('b', 0, 1),
+			('y', 0, 5), ('=z', 0, 6), ('y', 0, 5), ('=a', 0, 0), ('z', 0, 6),
+			('=y', 0, 5), ('q', None, None), ('=z', 0, 7),
+			('=x', None, None), ('x', None, None), ('z', None, None),
+			('g', None, None), ('y', 0, 5), ('id', 0, 2), ('size', 0, 4),
+		], names(tree))
+		func = tree.declarations[1]
+		self.assertEqual(('a', 'b', 'id', 'cls', 'size', 'y', 'z', 'z'), func.locals)
+		self.assertEqual((), func.free)
+		self.assertEqual(resolve(self.parser.parse(CODE.replace('-set x += z', '-set x = x + z'))), tree)
+		self.assertEqual(Identifier('q'), tree.declarations[1].suite.suite[1].false_suite.suite[0].stmt.initial)
+	
+	def test_expressions(self):
+		tree = resolve(self.parser.parse('-def f(a) { -return !a && a[a]:b || a(a, -(a)) ? a : c; }'))
+		found = names(tree)
+		self.assertEqual(7, found.count(('a', 0, 0)))
+		# Operators aren't names
+		self.assertNotIn('!', [name for name, depth, index in found])
+	
+	def test_free(self):
+		# The grammar has no functions in functions yet
+		inner = FuncDef(FuncDecl('g', ParamSeq(VariableDecl('b', []))), Suite(
+			ReturnStmt(BinaryOp('a', '+', BinaryOp('b', '*', 'c')))))
+		outer = FuncDef(FuncDecl('f', ParamSeq(VariableDecl('a', []))), Suite(
+			Stmt(VariableDecl('c', NumberLiteral(1))), inner, ReturnStmt('g')))
+		resolve(TranslationUnit(outer))
+		self.assertEqual([
+			('=f', None, None), ('=a', 0, 0), ('=c', 0, 1), ('=g', 0, 2), ('=b', 0, 0),
+			('a', 1, 0), ('b', 0, 0), ('c', 1, 1), ('g', 0, 2),
+		], names(outer))
+		self.assertEqual(('a', 'c', 'g'), outer.locals)
+		self.assertEqual(('b',), inner.locals)
+		self.assertEqual(('a', 'c'), inner.free)
+	
+	def test_again(self):
+		tree = resolve(self.parser.parse(CODE))
+		before = names(tree)
+		self.assertEqual(before, names(resolve(tree)))
+		self.assertEqual(before, names(resolve(astio.load(astio.dumps(tree)))))
+	
+	def test_lazy(self):
+		tree = resolve(Parser(lazy = True).parse(CODE))
+		self.assertEqual(names(resolve(self.parser.parse(CODE))), names(tree))
+	
+	def test_deep(self):
+		code = '-def f(a) {{ -return {}; }}'.format(' + '.join(['a'] * 20000))
+		found = names(resolve(self.parser.parse(code)))
+		self.assertEqual(20000, found.count(('a', 0, 0)))
+	
+	def test_shared(self):
+		tree = Parser(intern = True).parse('x = a:b + 1; y = a:b + 1;')
+		self.assertRaises(ValueError, resolve, tree)
+
+if __name__ == '__main__':
+	unittest.main()
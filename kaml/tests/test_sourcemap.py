@@ -0,0 +1,48 @@
+from __future__ import unicode_literals
+import unittest
+
+from ..lexer import Lexer
+from ..parser import Parser, ParseException
+from ..sourcemap import SourceMap
+
+class TestSourceMap(unittest.TestCase):
+	
+	def test_location(self):
+		sm = SourceMap('ab\ncd\n\nef')
+		
+		self.assertEqual((1, 1), sm.location(0))
+		self.assertEqual((1, 3), sm.location(2))
+		self.assertEqual((2, 1), sm.location(3))
+		self.assertEqual((3, 1), sm.location(6))
+		self.assertEqual((4, 2), sm.location(8))
+		self.assertEqual(4, len(sm))
+		self.assertEqual(((1, 2), (2, 2)), sm.span(1, 4))
+	
+	def test_offset(self):
+		source = 'ab\ncd\n\nef'
+		sm = SourceMap(source)
+		
+		for offset in range(len(source)):
+			self.assertEqual(offset, sm.offset(*sm.location(offset)))
+		
+		self.assertEqual('cd', sm.line_text(2))
+		self.assertEqual('', sm.line_text(3))
+		self.assertEqual('ef', sm.line_text(4))
+		self.assertRaises(IndexError, sm.offset, 5, 1)
+	
+	def test_token_locations(self):
+		l = Lexer()
+		tokens = [t for t in l.tokenize('-def fn {\n\tx = 1;\n  }') if t]
+		
+		self.assertEqual((1, 1), l._make_tok_location(tokens[0]))
+		self.assertEqual((2, 2), l._make_tok_location(tokens[3]))
+		self.assertEqual(3, l.find_tok_column(tokens[-1]))
+	
+	def test_parser_error_location(self):
+		with self.assertRaises(ParseException) as cm:
+			Parser().parse('-def fn {\n  x = 1;\n  = }')
+		
+		self.assertIn('[3:3]', str(cm.exception))
+
+if __name__ == '__main__':
+	unittest.main()
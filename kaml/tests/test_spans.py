@@ -0,0 +1,133 @@
+from __future__ import unicode_literals
+import pickle
+import unittest
+
+import ply
+
+from ..astnodes import *
+from ..astnodes import ASTNode
+from ..parser import Parser, ParseContext, ParseException, _PLY_VERSIONS
+from ..sourcemap import SourceMap
+from .utils import synthetic_template
+
+CODE = '''x = 1 + foo(2, 3);
+-def f(a, b = 2) {
+	-return a[1] + (b);
+}
+y = 's' "t";
+'''
+
+def spans(node):
+	""" (class name, start, end) of every ASTNode in the tree, depth first """
+	found = []
+	def walk(node):
+		if isinstance(node, ASTNode):
+			found.append((type(node).__name__, node.start, node.end))
+			for slot in node._fields:
+				walk(getattr(node, slot))
+		elif isinstance(node, (list, tuple)):
+			for item in node:
+				walk(item)
+	walk(node)
+	return found
+
+def positions(node):
+	# A LazySuite is a Suite once parsed
+	return [span[1:] for span in spans(node)]
+
+class TestSpans(unittest.TestCase):
+	
+	def text(self, node, code = CODE):
+		return code[node.start:node.end]
+	
+	def test_nodes(self):
+		tree = Parser().parse(CODE)
+		self.assertEqual((0, len(CODE) - 1), (tree.start, tree.end))
+		
+		x, f, y = tree.declarations
+		self.assertEqual('x = 1 + foo(2, 3);', self.text(x))
+		self.assertEqual('1 + foo(2, 3)', self.text(x.stmt.initial))
+		self.assertEqual('foo(2, 3)', self.text(x.stmt.initial.rhs))
+		self.assertEqual('3', self.text(x.stmt.initial.rhs.params[1]))
+		
+		self.assertEqual('-def f(a, b = 2)', self.text(f.decl))
+		self.assertEqual('a, b = 2', self.text(f.decl.args))
+		self.assertEqual('b = 2', self.text(f.decl.args.positional[1]))
+		self.assertEqual('{\n\t-return a[1] + (b);\n}', self.text(f.suite))
+		ret = f.suite.suite[0]
+		self.assertEqual('-return a[1] + (b);', self.text(ret))
+		# Parentheses aren't part of what's in them
+		self.assertEqual('a[1] + (b)', self.text(ret.expr))
+		self.assertEqual('a[1]', self.text(ret.expr.lhs))
+		
+		self.assertEqual('\'s\' "t"', self.text(y.stmt.initial))
+	
+	def test_every_node(self):
+		code = synthetic_template(3)
+		for name, start, end in spans(Parser().parse(code)):
+			self.assertIsNotNone(start, name)
+			self.assertLess(start, end)
+			self.assertFalse(code[start].isspace() or code[end - 1].isspace())
+	
+	def test_line_index(self):
+		tree = Parser().parse(CODE)
+		ret = tree.declarations[1].suite.suite[0]
+		self.assertEqual((3, 2), SourceMap(CODE).location(ret.start))
+	
+	def test_not_compared(self):
+		self.assertEqual(Parser().parse('x = 1;'), Parser().parse('\n\n  x = 1;'))
+	
+	def test_without_spans(self):
+		parser = Parser(spans = False)
+		tree = parser.parse(CODE)
+		self.assertEqual(Parser().parse(CODE), tree)
+		self.assertEqual(set([None]), set(s for _, start, end in spans(tree) for s in (start, end)))
+	
+	def test_parsers(self):
+		expected = spans(Parser().parse(CODE))
+		self.assertEqual(expected, spans(Parser(pratt = True).parse(CODE)))
+		
+		code = synthetic_template(3)
+		self.assertEqual(spans(Parser().parse(code)), spans(Parser(pratt = True).parse(code)))
+	
+	def test_ply_version(self):
+		# _parse_spans follows yacc's parser of these versions, with others
+		# the spans come from yacc's parser and the _spans actions
+		self.assertIn(ply.__version__, _PLY_VERSIONS)
+		expected = spans(Parser().parse(CODE))
+		ParseContext.spans_loop = False
+		try:
+			self.assertEqual(expected, spans(Parser().parse(CODE)))
+		finally:
+			ParseContext.spans_loop = True
+	
+	def test_syntax_error_in_action(self):
+		class StrictParser(Parser):
+			def p_use_statement(self, p):
+				raise SyntaxError
+			p_use_statement.__doc__ = Parser.p_use_statement.__doc__
+		
+		parser = StrictParser()
+		self.assertRaises(ParseException, parser.parse, 'x = 1;\n-use a;\ny = 2;\n')
+		self.assertIsNone(parser.parse('-use a;'))
+		self.assertEqual(Parser().parse('x = 1;'), parser.parse('x = 1;'))
+	
+	def test_lazy_bodies(self):
+		tree = Parser(lazy = True).parse(CODE)
+		suite = tree.declarations[1].suite
+		self.assertIsInstance(suite, LazySuite)
+		self.assertEqual('{\n\t-return a[1] + (b);\n}', self.text(suite))
+		# Bodies parsed later have offsets into the whole source
+		self.assertEqual(positions(Parser().parse(CODE)), positions(tree))
+	
+	def test_pickle(self):
+		tree = Parser().parse(CODE)
+		copy = pickle.loads(pickle.dumps(tree, pickle.HIGHEST_PROTOCOL))
+		self.assertEqual(spans(tree), spans(copy))
+		
+		lazy = Parser(lazy = True).parse(CODE)
+		copy = pickle.loads(pickle.dumps(lazy, pickle.HIGHEST_PROTOCOL))
+		self.assertEqual(positions(tree), positions(copy))
+
+if __name__ == '__main__':
+	unittest.main()
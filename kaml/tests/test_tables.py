@@ -0,0 +1,75 @@
+from __future__ import unicode_literals
+import os, shutil, tempfile
+import unittest
+
+from ply import yacc
+
+from .. import get_parser, lextab, parsetab
+from ..lexer import Lexer
+from ..parser import Parser
+
+class TestTables(unittest.TestCase):
+	""" The shipped tables have to be regenerated whenever the grammar changes """
+	
+	def test_lextab_current(self):
+		self.assertEqual(Lexer().signature(), lextab._lexsignature)
+	
+	def test_parsetab_current(self):
+		p = Parser()
+		pinfo = yacc.ParserReflect({k : getattr(p, k) for k in dir(p)})
+		pinfo.get_all()
+		self.assertEqual(pinfo.signature(), parsetab._lr_signature)
+	
+	def test_stale_tables_not_written(self):
+		class Changed(Lexer):
+			lextab = 'kaml.changedtab'
+			t_INITIAL_variablestring_SHL = r'<<(?!<)'
+		
+		# Built in memory, nothing is written into the package
+		tokens = Changed().tokenize('x = a << b;')
+		self.assertEqual(['ID', '=', 'ID', 'SHL', 'ID', ';'], [t.type for t in tokens if t])
+		self.assertFalse(os.path.exists(os.path.join(os.path.dirname(lextab.__file__), 'changedtab.py')))
+		
+		outputdir = tempfile.mkdtemp()
+		try:
+			Changed().write_lextab(outputdir)
+			with open(os.path.join(outputdir, 'changedtab.py')) as fp:
+				self.assertIn(Changed().signature(), fp.read())
+		finally:
+			shutil.rmtree(outputdir)
+		
+		class Inherited(Lexer):
+			pass
+		with self.assertRaises(ValueError):
+			Inherited().write_lextab()
+	
+	def test_lexers_are_independent(self):
+		a = Lexer()
+		b = Lexer()
+		self.assertIsNot(a.lexer.lexstatestack, b.lexer.lexstatestack)
+		
+		tokens_a = a.tokenize('x = "a ${b} c";')
+		tokens_b = b.tokenize('{{{ raw } }}}')
+		self.assertEqual(
+			[(t.type, t.value) for t in tokens_a if t],
+			[(t.type, t.value) for t in Lexer().tokenize('x = "a ${b} c";') if t]
+		)
+		self.assertEqual([('STRING_LIT', ' raw } ')], [(t.type, t.value) for t in tokens_b if t])
+		self.assertEqual('INITIAL', b.lexer.lexstate)
+	
+	def test_parsers_share_tables(self):
+		a = Parser()
+		b = get_parser()
+		self.assertIs(a.parser.action, b.parser.action)
+		self.assertIsNot(a.parser.productions, b.parser.productions)
+		self.assertIs(b, b.parser.productions[1].callable.action.__self__)
+		
+		code = '-def fn(a) { -return a + 1; }'
+		self.assertEqual(a.parse(code), b.parse(code))
+		
+		class OtherLexer(Lexer):
+			pass
+		self.assertEqual(a.parse(code), get_parser(OtherLexer).parse(code))
+
+if __name__ == '__main__':
+	unittest.main()
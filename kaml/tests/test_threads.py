@@ -0,0 +1,63 @@
+from __future__ import unicode_literals
+import unittest
+
+from ..parser import Parser, ParseException
+from ..pool import ParserPool
+from .utils import run_threads, synthetic_template
+
+SOURCES = [synthetic_template(n) for n in range(1, 9)]
+
+class TestThreads(unittest.TestCase):
+	
+	def setUp(self):
+		self.expected = [Parser().parse(source) for source in SOURCES]
+	
+	def test_shared_parser(self):
+		parser = Parser()
+		
+		def parse_all(i):
+			# Each thread in a different order, so different sources are in flight
+			order = SOURCES[i:] + SOURCES[:i]
+			return [parser.parse(source) for _ in range(5) for source in order][:len(SOURCES)]
+		
+		for i, trees in enumerate(run_threads(len(SOURCES), parse_all)):
+			self.assertEqual(self.expected[i:] + self.expected[:i], trees)
+	
+	def test_pool(self):
+		pool = ParserPool(size = 3)
+		
+		def parse_all(i):
+			return [pool.parse(source) for source in SOURCES]
+		
+		for trees in run_threads(8, parse_all):
+			self.assertEqual(self.expected, trees)
+		self.assertEqual(3, pool._idle.qsize())
+	
+	def test_check_in_threads(self):
+		parser = Parser()
+		bad = 'x = 1;\ny = ;\n-def fn() { z = ; }\n'
+		expected = parser.check(bad)
+		self.assertEqual(2, len(expected))
+		
+		def check(i):
+			return parser.check(bad if i % 2 else SOURCES[i])
+		
+		for i, diagnostics in enumerate(run_threads(8, check)):
+			self.assertEqual(expected if i % 2 else [], diagnostics)
+	
+	def test_reentrant(self):
+		parser = Parser()
+		with parser.context() as outer:
+			# A parse while another one has the first context
+			self.assertEqual(self.expected[0], parser.parse(SOURCES[0]))
+			self.assertIsNot(outer.lexer, parser._contexts[0].lexer)
+		self.assertEqual(2, len(parser._contexts))
+	
+	def test_failed_parse_resets(self):
+		parser = Parser()
+		with self.assertRaises(ParseException):
+			parser.parse('-def fn() { x = ( ; }')
+		self.assertEqual(self.expected[0], parser.parse(SOURCES[0]))
+
+if __name__ == '__main__':
+	unittest.main()
@@ -0,0 +1,109 @@
+from __future__ import unicode_literals
+import sys
+import unittest
+from StringIO import StringIO
+
+from .. import astdiff
+from ..astnodes import *
+from ..astnodes import structural_hash
+from ..parser import Parser
+from ..treediff import Difference, format_path
+from .utils import synthetic_template
+
+CODE = '''x = a + 1;
+-def f#id[size=1](a, b) { -return !a; }
+y = c ? d : e;
+'''
+
+class TestEquality(unittest.TestCase):
+	
+	def setUp(self):
+		self.parser = Parser()
+		self.stdout = sys.stdout
+		sys.stdout = StringIO()
+	
+	def tearDown(self):
+		output = sys.stdout.getvalue()
+		sys.stdout = self.stdout
+		self.assertEqual('', output)
+	
+	def test_equal(self):
+		self.assertEqual(self.parser.parse(CODE), self.parser.parse(CODE))
+		self.assertNotEqual(self.parser.parse(CODE), self.parser.parse(CODE.replace('1', '2')))
+		self.assertNotEqual(self.parser.parse('x = 1;'), self.parser.parse('x = 1.0; y = 2;'))
+		# Node is compared by what's in it too
+		self.assertEqual(Node('UnaryOp', ['-', 'a']), Node('UnaryOp', ['-', 'a']))
+		self.assertNotEqual(Node('UnaryOp', ['-', 'a']), Node('UnaryOp', ['!', 'a']))
+	
+	def test_rules(self):
+		self.assertNotEqual(BinaryOp('a', '=', 'b'), Assign('a', '=', 'b'))
+		self.assertNotEqual(Assign('a', '=', 'b'), BinaryOp('a', '=', 'b'))
+		# The lists of a node are compared by their items
+		suite = Suite()
+		suite.suite = ('a', 'b')
+		self.assertEqual(Suite('a', 'b'), suite)
+		self.assertNotEqual(StringLiteral(['a']), StringLiteral(('a',)))
+		self.assertNotEqual(StringLiteral('a'), 'a')
+		self.assertNotEqual('a', StringLiteral('a'))
+	
+	def test_deep(self):
+		code = 'x = {};'.format(' + '.join(['a'] * 5000))
+		tree, other = self.parser.parse(code), self.parser.parse(code)
+		self.assertEqual(tree, other)
+		self.assertEqual(structural_hash(tree), structural_hash(other))
+		self.assertNotEqual(tree, self.parser.parse(code.replace('a;', 'b;')))
+		self.assertEqual([], astdiff(tree, other))
+
+class TestAstDiff(unittest.TestCase):
+	
+	def setUp(self):
+		self.parser = Parser()
+	
+	def diff(self, old, new):
+		return astdiff(self.parser.parse(old), self.parser.parse(new))
+	
+	def test_same(self):
+		self.assertEqual([], self.diff(CODE, CODE))
+		self.assertEqual([], self.diff(synthetic_template(3), synthetic_template(3)))
+	
+	def test_values(self):
+		diff = self.diff(CODE, CODE.replace('a + 1', 'a + 2').replace('!a', '~a'))
+		self.assertEqual([
+			(('declarations', 0, 'stmt', 'initial', 'rhs', 'number'), 'value', 1, 2),
+			(('declarations', 1, 'suite', 'suite', 0, 'expr', 'children', 0), 'value', '!', '~'),
+		], diff)
+		self.assertEqual('declarations[0].stmt.initial.rhs.number: value 1 -> 2', str(diff[0]))
+	
+	def test_types_and_items(self):
+		diff = self.diff(CODE, CODE.replace('a + 1', 'a + "1"').replace('(a, b)', '(a)').replace('size=1', 'color=1'))
+		self.assertEqual(['type', 'removed', 'added', 'removed'], [d.kind for d in diff])
+		self.assertIsInstance(diff[0].old, NumberLiteral)
+		self.assertIsInstance(diff[0].new, StringLiteral)
+		self.assertEqual(('declarations', 1, 'decl', 'args', 'kwargs', ('color',)), diff[2].path)
+		self.assertEqual("declarations[1].decl.args.kwargs[{!r}]".format('size'), format_path(diff[3].path))
+		self.assertEqual(('declarations', 1, 'decl', 'args', 'positional', 1), diff[1].path)
+		self.assertIsNone(diff[1].new)
+		
+		diff = self.diff('x = 1;', 'x = 1; y = 2;')
+		self.assertEqual([Difference(('declarations', 1), 'added', None, self.parser.parse('y = 2;')[0])], diff)
+		self.assertEqual('<root>', format_path(()))
+	
+	def test_agrees_with_eq(self):
+		old = self.parser.parse(CODE)
+		for new in [CODE, CODE.replace('c ?', 'c2 ?'), 'x = a + 1;', CODE.replace('-return', 'z = 1; -return')]:
+			new = self.parser.parse(new)
+			self.assertEqual(old == new, not astdiff(old, new))
+	
+	def test_debug_eq(self):
+		stdout, sys.stdout = sys.stdout, StringIO()
+		try:
+			tree = self.parser.parse(CODE)
+			self.assertFalse(tree.debug__eq__(self.parser.parse(CODE.replace('a + 1', 'a + 2'))))
+			self.assertTrue(tree.debug__eq__(self.parser.parse(CODE)))
+			output = sys.stdout.getvalue()
+		finally:
+			sys.stdout = stdout
+		self.assertEqual('declarations[0].stmt.initial.rhs.number: value 1 -> 2\n', output)
+
+if __name__ == '__main__':
+	unittest.main()
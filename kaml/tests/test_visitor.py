@@ -0,0 +1,139 @@
+from __future__ import unicode_literals
+import unittest
+
+from ..astnodes import *
+from ..parser import Parser
+from ..visitor import NodeTransformer, NodeVisitor
+
+CODE = '''x = a + 1;
+-def f(b) { y = !b; -return b ? 2 : 3; }
+'''
+
+class Recorder(NodeVisitor):
+	
+	def __init__(self):
+		self.seen = []
+	
+	def generic_visit(self, node):
+		self.seen.append(type(node).__name__)
+	
+	def visit_Node(self, node):
+		self.seen.append(node.node_type)
+
+class Expressions(Recorder):
+	
+	def visit_Expr(self, node):
+		self.seen.append('expr')
+	
+	def visit_UnaryOp(self, node):
+		self.seen.append('unary')
+	
+	def visit_FuncDecl(self, node):
+		self.seen.append('decl')
+		return False
+	
+	def leave_FuncDef(self, node):
+		self.seen.append('end')
+
+class Fold(NodeTransformer):
+	""" Folds + and * of numbers """
+	
+	def visit_BinaryOp(self, node):
+		if isinstance(node.lhs, NumberLiteral) and isinstance(node.rhs, NumberLiteral) and node.op in '+*':
+			value = node.lhs.number + node.rhs.number if node.op == '+' else node.lhs.number * node.rhs.number
+			return NumberLiteral(value)
+		return node
+
+class TestNodeVisitor(unittest.TestCase):
+	
+	def setUp(self):
+		self.parser = Parser()
+	
+	def test_order(self):
+		visitor = Recorder()
+		self.parser.parse(CODE).accepts(visitor)
+		self.assertEqual(['TranslationUnit', 'Stmt', 'VariableDecl', 'BinaryOp', 'NumberLiteral',
+			'FuncDef', 'FuncDecl', 'ParamSeq', 'VariableDecl', 'Suite', 'Stmt', 'VariableDecl', 'UnaryOp',
+			'ReturnStmt', 'ternary', 'NumberLiteral', 'NumberLiteral'], visitor.seen)
+	
+	def test_dispatch(self):
+		visitor = Expressions()
+		visitor.visit(self.parser.parse(CODE))
+		self.assertEqual(['TranslationUnit', 'Stmt', 'VariableDecl', 'expr', 'NumberLiteral',
+			'FuncDef', 'decl', 'Suite', 'Stmt', 'VariableDecl', 'unary', 'ReturnStmt', 'ternary',
+			'NumberLiteral', 'NumberLiteral', 'end'], visitor.seen)
+		
+		# Each visitor class has its own table
+		self.assertEqual(Expressions.visit_Expr.__func__, Expressions._handler_table[BinaryOp][0])
+		self.assertEqual(Recorder.generic_visit.__func__, Recorder._handler_table[BinaryOp][0])
+		self.assertNotIn('_handler_table', NodeVisitor.__dict__)
+	
+	def test_deep(self):
+		code = 'x = {};'.format(' + '.join(['a'] * 20000))
+		visitor = Recorder()
+		visitor.visit(self.parser.parse(code))
+		self.assertEqual(19999, visitor.seen.count('BinaryOp'))
+	
+	def test_lazy(self):
+		visitor = Recorder()
+		visitor.visit(Parser(lazy = True).parse(CODE))
+		self.assertEqual(17, len(visitor.seen))
+
+class TestNodeTransformer(unittest.TestCase):
+	
+	def setUp(self):
+		self.parser = Parser()
+	
+	def test_fold(self):
+		tree = self.parser.parse('x = 1 + 2 * 3 + a; -def f() { -return 2 * 2; }')
+		self.assertIs(tree, tree.accepts(Fold()))
+		self.assertEqual(self.parser.parse('x = 7 + a; -def f() { -return 4; }'), tree)
+	
+	def test_lists(self):
+		class Unroll(NodeTransformer):
+			def visit_Stmt(self, node):
+				name = getattr(node.stmt, 'name', None)
+				if name == 'y':
+					return None
+				if name == 'z':
+					return [node, Stmt(VariableDecl('w', node.stmt.initial))]
+				return node
+		
+		tree = Unroll().visit(self.parser.parse('x = 1; y = 2; -def f() { y = 3; z = 4; }'))
+		self.assertEqual(self.parser.parse('x = 1; -def f() { z = 4; w = 4; }'), tree)
+	
+	def test_nodes(self):
+		class Negate(NodeTransformer):
+			def visit_UnaryOp(self, node):
+				return NumberLiteral(-node.children[1].number)
+			
+			def visit_ternary(self, node):
+				return node.children[1]
+		
+		tree = Negate().visit(self.parser.parse('x = -(1); y = a ? 2 : 3;'))
+		self.assertEqual(self.parser.parse('x = -1; y = 2;'), tree)
+	
+	def test_shared(self):
+		class Count(NodeTransformer):
+			def __init__(self):
+				self.count = 0
+			
+			def visit_GetAttr(self, node):
+				self.count += 1
+				return node.base_expr
+		
+		tree = self.parser.parse('x = a:b; y = c; -def f() { -return d; }')
+		x, y, f = tree.declarations
+		y.stmt.initial = f.suite.suite[0].expr = x.stmt.initial
+		transformer = Count()
+		transformer.visit(tree)
+		self.assertEqual(1, transformer.count)
+		self.assertEqual(self.parser.parse('x = a; y = a; -def f() { -return a; }'), tree)
+		
+		# Interned nodes are shared with other trees too
+		tree = Parser(intern = True).parse('x = a:b; y = a:b;')
+		self.assertRaises(ValueError, Count().visit, tree)
+		self.assertEqual(Parser(spans = False).parse('x = a:b; y = a:b;'), tree)
+
+if __name__ == '__main__':
+	unittest.main()
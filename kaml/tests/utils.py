@@ -1,4 +1,5 @@
 from __future__ import unicode_literals
+import sys, threading, timeit
 
 from ply.lex import LexToken
 
@@ -77,3 +78,56 @@ def K(kw):
 def L(_l):
 	return (_l, _l)
 # -------------------------------
+
+# ------ Benchmark helpers ---------
+def best_time(fn, repeat = 3):
+	""" Best wall clock time of `repeat` calls to fn, with gc disabled as timeit does """
+	return min(timeit.repeat(fn, number = 1, repeat = repeat))
+
+COMPONENT = """
+-use lib%(i)d;
+-def component%(i)d#id.cls[size=1, color='red'](title, body=0) {
+	x = title + %(i)d * 2;
+	label = 'Hello ' "world" {{{ raw
+	  text } }}};
+	{ nested = x << 2 | 0x1f; }
+	-return x + label;
+}
+total%(i)d = component%(i)d - 0.5;
+"""
+
+def synthetic_template(n):
+	""" A parseable template of `n` components, roughly `n` * 200 characters """
+	return ''.join(COMPONENT % {'i' : i} for i in range(n))
+
+def report(name, **figures):
+	""" Print benchmark figures, visible with `nosetests -s` or `pytest -s` """
+	sys.stdout.write('\n[bench] {}: {}\n'.format(name, ', '.join(
+		'{}={:.4g}'.format(k, v) if isinstance(v, float) else '{}={}'.format(k, v)
+		for k, v in sorted(figures.items())
+	)))
+
+def run_threads(n, target):
+	""" Run `target(i)` in `n` threads, and return what each one returned """
+	results = [None] * n
+	errors = []
+	start = threading.Event()
+	
+	def run(i):
+		start.wait()
+		try:
+			results[i] = target(i)
+		except Exception as e:
+			errors.append(e)
+	
+	threads = [threading.Thread(target = run, args = (i,)) for i in range(n)]
+	for t in threads:
+		t.start()
+	start.set()
+	for t in threads:
+		t.join()
+	
+	if errors:
+		raise errors[0]
+	return results
+# -------------------------------
@@ -0,0 +1,97 @@
+from __future__ import unicode_literals
+from array import array
+
+try:
+	from itertools import izip as zip
+except ImportError:
+	pass
+
+from ply.lex import LexToken
+
+__all__ = ['TokenBuffer']
+
+class TokenBuffer(object):
+	""" A token stream stored by column instead of as LexToken objects.
+	
+	Types are small ints into `type_names`, positions and line numbers are
+	machine ints, and values are indexes into a table where each distinct
+	value is stored once. LexTokens are only created when the buffer is
+	indexed or iterated. The None markers that tokenize() can produce are not
+	stored.
+	"""
+	__slots__ = ('types', 'lexpos', 'lineno', 'value_ids', 'type_names', 'values', '_type_ids', '_value_ids')
+	
+	def __init__(self, tokens = ()):
+		self.types = array(str('B'))
+		self.lexpos = array(str('l'))
+		self.lineno = array(str('l'))
+		self.value_ids = array(str('i'))
+		self.type_names = []
+		self.values = []
+		self._type_ids = {}
+		self._value_ids = {}
+		self.extend(tokens)
+	
+	def append(self, tok):
+		self.extend((tok,))
+	
+	def extend(self, tokens):
+		types, lexpos, lineno, value_ids = self.types, self.lexpos, self.lineno, self.value_ids
+		type_ids, value_table = self._type_ids, self._value_ids
+		
+		for tok in tokens:
+			if tok is None:
+				continue
+			
+			type_id = type_ids.get(tok.type)
+			if type_id is None:
+				type_id = type_ids[tok.type] = len(self.type_names)
+				self.type_names.append(tok.type)
+			
+			value = tok.value
+			# Keyed on the class too, 1, 1.0 and True are different values
+			key = (value.__class__, value)
+			value_id = value_table.get(key)
+			if value_id is None:
+				value_id = value_table[key] = len(self.values)
+				self.values.append(value)
+			
+			types.append(type_id)
+			lexpos.append(tok.lexpos)
+			lineno.append(tok.lineno)
+			value_ids.append(value_id)
+	
+	def type(self, i):
+		return self.type_names[self.types[i]]
+	
+	def value(self, i):
+		return self.values[self.value_ids[i]]
+	
+	def nbytes(self):
+		""" Size of the columns, not counting the type and value tables """
+		return sum(a.itemsize * len(a) for a in (self.types, self.lexpos, self.lineno, self.value_ids))
+	
+	def __len__(self):
+		return len(self.types)
+	
+	def __getitem__(self, i):
+		tok = LexToken()
+		tok.__dict__ = {
+			'type' : self.type_names[self.types[i]],
+			'value' : self.values[self.value_ids[i]],
+			'lineno' : self.lineno[i],
+			'lexpos' : self.lexpos[i],
+		}
+		return tok
+	
+	def __iter__(self):
+		type_names, values = self.type_names, self.values
+		for type_id, value_id, lineno, lexpos in zip(self.types, self.value_ids, self.lineno, self.lexpos):
+			tok = LexToken()
+			tok.__dict__ = {
+				'type' : type_names[type_id],
+				'value' : values[value_id],
+				'lineno' : lineno,
+				'lexpos' : lexpos,
+			}
+			yield tok
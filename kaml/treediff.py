@@ -0,0 +1,91 @@
+from __future__ import unicode_literals
+from collections import namedtuple
+
+from kaml.astnodes import AcceptsList, ASTNode, Node
+
+__all__ = ['Difference', 'astdiff']
+
+class Difference(namedtuple('Difference', 'path kind old new')):
+	""" A place where two trees differ, from kaml.astdiff.
+	
+	`path` leads there from the root: field names, list indexes, and dict
+	keys as 1-tuples, so they aren't taken for fields. `kind` is 'type' for
+	different kinds of node or value, 'value' for different values, and
+	'removed' or 'added' for what only the first or the second tree has in
+	a list or dict. `old` and `new` are what each tree has there, None for
+	the one that has nothing.
+	"""
+	__slots__ = ()
+	
+	def __str__(self):
+		return '{}: {} {!r} -> {!r}'.format(format_path(self.path), self.kind, self.old, self.new)
+
+def format_path(path):
+	""" `path` as Python would write it, like declarations[1].decl.args.kwargs['size'] """
+	text = []
+	for step in path:
+		if isinstance(step, tuple):
+			text.append('[{!r}]'.format(step[0]))
+		elif isinstance(step, int):
+			text.append('[{}]'.format(step))
+		else:
+			text.append('.{}'.format(step) if text else step)
+	return ''.join(text) or '<root>'
+
+# Where one of two lists or dicts has nothing
+_missing = object()
+
+def astdiff(a, b):
+	""" The Differences between the trees `a` and `b`, in the order of the
+	trees, none when `a == b`. It goes through the trees one part at a time,
+	as __eq__ does, but on past the first difference, and without printing.
+	"""
+	differences = []
+	add = differences.append
+	stack = [((), a, b)]
+	pop, push = stack.pop, stack.append
+	while stack:
+		path, a, b = pop()
+		if a is b:
+			continue
+		if b is _missing:
+			add(Difference(path, 'removed', a, None))
+		elif a is _missing:
+			add(Difference(path, 'added', None, b))
+		
+		elif isinstance(a, AcceptsList):
+			if not isinstance(b, AcceptsList):
+				add(Difference(path, 'type', a, b))
+			else:
+				_items(push, path + (a._fields[0],), a._get_thing(), b._get_thing())
+		elif isinstance(a, ASTNode):
+			if not isinstance(b, a.__class__) or a._fields != b._fields:
+				add(Difference(path, 'type', a, b))
+			else:
+				for field in reversed(a._fields):
+					push((path + (field,), getattr(a, field), getattr(b, field)))
+		elif isinstance(a, Node):
+			if not isinstance(b, Node) or a.node_type != b.node_type:
+				add(Difference(path, 'type', a, b))
+			else:
+				push((path + ('children',), a.children, b.children))
+				push((path + ('leaf',), a.leaf, b.leaf))
+		elif isinstance(b, (ASTNode, Node)):
+			add(Difference(path, 'type', a, b))
+		
+		elif isinstance(a, (list, tuple, dict)) or isinstance(b, (list, tuple, dict)):
+			if type(a) is not type(b):
+				add(Difference(path, 'type', a, b))
+			elif isinstance(a, dict):
+				for key in sorted(set(a) | set(b), reverse = True):
+					push((path + ((key,),), a.get(key, _missing), b.get(key, _missing)))
+			else:
+				_items(push, path, a, b)
+		elif a != b:
+			add(Difference(path, 'value', a, b))
+	return differences
+
+def _items(push, path, a, b):
+	""" Push the items of the sequences `a` and `b`, pairs in order """
+	for i in reversed(xrange(max(len(a), len(b)))):
+		push((path + (i,), a[i] if i < len(a) else _missing, b[i] if i < len(b) else _missing))
@@ -0,0 +1,208 @@
+from __future__ import unicode_literals
+
+from kaml.astnodes import ASTNode, Node, _VALUES
+
+__all__ = ['NodeTransformer', 'NodeVisitor']
+
+class NodeVisitor(object):
+	""" Walks a tree, calling a method of its own for each node in it.
+	
+	For a node of class C that's visit_C(node), or the visit_ method of the
+	nearest base class of C that has one, or generic_visit. Node is
+	dispatched on its node_type, visit_ternary or visit_UnaryOp, and then
+	visit_Node. Parents are visited before their children, in the order of
+	their fields, and a visit_ method that returns False skips the children.
+	leave_C(node), looked up the same way, is called after the children.
+	
+	The methods for each class of node are looked up the first time it's
+	seen, and kept for the visitor class. Children are found through the
+	fields of each node class, and the walk keeps its own stack, so deep
+	trees don't hit the recursion limit. Lazy bodies are parsed as they're
+	walked into.
+	"""
+	
+	def visit(self, tree):
+		""" Visit `tree`, and all the nodes in it """
+		table = _table(type(self))
+		values = _VALUES
+		stack = [tree]
+		pop, push = stack.pop, stack.append
+		while stack:
+			node = pop()
+			kind = type(node)
+			handlers = table.get(kind)
+			if handlers is None:
+				if kind is list or kind is tuple:
+					for part in reversed(node):
+						if type(part) not in values:
+							push(part)
+					continue
+				if kind is _Leave:
+					node.leave(self, node.node)
+					continue
+				if kind is Node:
+					handlers = table.get(node.node_type) or _handlers(type(self), node.node_type)
+				elif isinstance(node, ASTNode):
+					handlers = _handlers(type(self), kind)
+				else:
+					# A dict of parts, or what a field has that isn't a node
+					if kind is dict:
+						push(node.values())
+					continue
+			
+			visit, leave, fields = handlers
+			if leave is not None:
+				push(_Leave(leave, node))
+			if visit(self, node) is not False:
+				for field in fields:
+					part = getattr(node, field)
+					if type(part) not in values:
+						push(part)
+	
+	def generic_visit(self, node):
+		""" For the nodes that no visit_ method is for """
+
+class NodeTransformer(NodeVisitor):
+	""" A NodeVisitor that replaces the nodes it visits with what its visit_
+	methods return.
+	
+	Children are transformed before their parents, so visit_C(node) gets
+	the node with its children already replaced, in place, and returns what
+	takes its place: the node, another one, None to remove it from the list
+	it's in, or a list of nodes to put in that list instead. generic_visit
+	keeps the node. There's no leave_C, the one visit_ call comes after the
+	children, and nothing is skipped.
+	
+	A node or list that's in the tree more than once is transformed once,
+	and its parents all get the same result. Nodes are changed in place, and
+	the ones an Interner shares with other trees raise a ValueError.
+	"""
+	
+	def visit(self, tree):
+		""" `tree`, transformed """
+		table = _table(type(self))
+		values = _VALUES
+		# The result of each node done, by id, with the node so that its id
+		# isn't reused while this runs
+		done = {}
+		# The results of the parts of the nodes and lists on the stack
+		results = []
+		stack = [(tree, None)]
+		pop, push, extend = stack.pop, stack.append, stack.extend
+		while stack:
+			value, parts = pop()
+			kind = type(value)
+			if parts is None:
+				if kind in values:
+					results.append(value)
+					continue
+				if id(value) in done:
+					results.append(done[id(value)][1])
+					continue
+				
+				if kind is Node:
+					parts = (value.children,)
+				elif isinstance(value, ASTNode):
+					if hasattr(value, '_hash'):
+						raise ValueError('{!r} is interned, transform a tree that isn\'t'.format(value))
+					parts = [getattr(value, field) for field in kind._fields]
+				elif kind is dict:
+					parts = value.values()
+				elif isinstance(value, (list, tuple)):
+					parts = value
+				else:
+					results.append(value)
+					continue
+				push((value, parts))
+				extend((part, None) for part in reversed(parts))
+				continue
+			
+			# The parts are done, their results are the last ones
+			count = len(parts)
+			new = results[len(results) - count:]
+			del results[len(results) - count:]
+			
+			if kind is Node:
+				value.children = new[0]
+				key = value.node_type
+			elif isinstance(value, ASTNode):
+				for field, part in zip(kind._fields, new):
+					setattr(value, field, part)
+				key = kind
+			elif kind is dict:
+				for k, original, part in zip(value.keys(), parts, new):
+					if part is None and _is_node(original):
+						del value[k]
+					else:
+						value[k] = part
+				done[id(value)] = (value, value)
+				results.append(value)
+				continue
+			else:
+				items = []
+				for original, part in zip(parts, new):
+					if _is_node(original):
+						if part is None:
+							continue
+						if isinstance(part, list):
+							items.extend(part)
+							continue
+					items.append(part)
+				if kind is list:
+					value[:] = items
+					result = value
+				else:
+					result = kind(items)
+				done[id(value)] = (value, result)
+				results.append(result)
+				continue
+			
+			handlers = table.get(key) or _handlers(type(self), key)
+			result = handlers[0](self, value)
+			done[id(value)] = (value, result)
+			results.append(result)
+		return results[0]
+	
+	def generic_visit(self, node):
+		return node
+
+class _Leave(object):
+	""" On the stack of a walk, for the leave_ method of a node """
+	__slots__ = ('leave', 'node')
+	
+	def __init__(self, leave, node):
+		self.leave, self.node = leave, node
+
+def _is_node(value):
+	return isinstance(value, (ASTNode, Node))
+
+def _table(visitor_class):
+	""" The visit_ and leave_ methods of `visitor_class`, by node class or node_type """
+	table = visitor_class.__dict__.get('_handler_table')
+	if table is None:
+		table = {}
+		# Its own, not one it inherits
+		visitor_class._handler_table = table
+	return table
+
+def _handlers(visitor_class, key):
+	""" Find and keep the visit_ and leave_ methods of `visitor_class` for
+	nodes of `key`, with the fields to walk
+	"""
+	if isinstance(key, type):
+		names = [cls.__name__ for cls in key.__mro__ if cls is not object]
+	else:
+		names = [key, 'Node']
+	
+	def find(prefix):
+		for name in names:
+			method = getattr(visitor_class, prefix + name, None)
+			if method is not None:
+				return getattr(method, '__func__', method)
+		return None
+	
+	# The fields last to first, to go on the stack
+	fields = tuple(reversed(key._fields)) if isinstance(key, type) else ('children',)
+	handlers = (find('visit_') or visitor_class.generic_visit.__func__, find('leave_'), fields)
+	_table(visitor_class)[key] = handlers
+	return handlers
@@ -1,27 +1,58 @@
 import argparse
 from pprint import pprint
-import sys
+import os, sys, timeit
 
+from kaml.batch import find_files, run_batch, summary
 from kaml.parser import Parser
 from kaml.lexer import Lexer
 
 parser = argparse.ArgumentParser()
 parser.add_argument('-t', '--trace', action = 'store_true')
-parser.add_argument('input_file', metavar = 'INPUT_FILE', type = str)
+parser.add_argument('input_file', metavar = 'INPUT_FILE', type = str, nargs = '+',
+	help = 'A file, or several files and directories of .kaml files to check in batch mode')
+parser.add_argument('-c', '--check', action = 'store_true', help = 'Report every error in the inputs, instead of stopping at the first')
+parser.add_argument('-j', '--jobs', type = int, help = 'Check the inputs in batch mode with JOBS processes')
 parser.add_argument('-l', '--lexeronly', action = 'store_true')
+parser.add_argument('--lex-stats', action = 'store_true', help = 'Print per rule lexer statistics instead of the tokens')
 
 if __name__ == '__main__':
 	argv = sys.argv
 	if len(argv) >= 2:
 		args = parser.parse_args(argv[1:])
 		
-		with open(args.input_file) as fp:
-			if args.lexeronly:
+		if args.check:
+			# Just the errors, in a form editors and pre-commit hooks understand
+			results = list(run_batch(find_files(args.input_file), args.jobs or 1, check = True))
+			for r in sorted(results):
+				for d in r.diagnostics:
+					print(d.format(r.path))
+				if not r.diagnostics and not r.ok:
+					print('{}: {}'.format(r.path, r.error))
+			sys.exit(0 if all(r.ok for r in results) else 1)
+		
+		if args.jobs or len(args.input_file) > 1 or os.path.isdir(args.input_file[0]):
+			start = timeit.default_timer()
+			results = []
+			for r in run_batch(find_files(args.input_file), args.jobs or 1, args.lexeronly):
+				print('{} {:8.4f}s {}{}'.format('ok   ' if r.ok else 'error', r.seconds, r.path, '' if r.ok else ': ' + r.error))
+				results.append(r)
+			print(summary(results, timeit.default_timer() - start))
+			sys.exit(0 if all(r.ok for r in results) else 1)
+		
+		with open(args.input_file[0]) as fp:
+			if args.lex_stats:
+				l = Lexer(stats = True)
+				try:
+					for t in l.tokenize(unicode(fp.read())):
+						pass
+				finally:
+					print(l.stats.report())
+			elif args.lexeronly:
 				l = Lexer(trace = args.trace)
 				for t in l.tokenize(unicode(fp.read())):
 					print t
 			else:
-				p = Parser(debug = True, write_tables = 0)
+				p = Parser()
 				
 				ast = p.parse(fp.read(), debug = args.trace)
 				